@@ -33,6 +33,8 @@ SDK_PATH = (Path(__file__).parent / "../src/client/python").resolve()
 sys.path.insert(0, str(SDK_PATH))
 from FormalAiSdk.core.litellm_executor import LiteLLMExecutor
 from FormalAiSdk.core.openai_executor import OpenAIExecutor
+from FormalAiSdk.core.cascade_executor import CascadeExecutor, CascadeTier
+from FormalAiSdk.exceptions import ModelError
 from FormalAiSdk.sdk.session import ModelSession
 from FormalAiSdk.models.llm_models import LlmModels
 
@@ -153,34 +155,46 @@ Conflict Resolution:
 
 # --- END KNOWLEDGE BASES ---
 
-def call_llm_model(model_type, model_name, system_prompt, instruction, log_stages, stage_prefix):
-    stage_log(f"before_llm_{stage_prefix}", f"Preparing system prompt for {stage_prefix} model:\n{system_prompt}", log_stages)
-    if model_type == "openai":
-        llm_model = LlmModels.FromOpenAi()
-        executor = OpenAIExecutor()
-    else:
-        llm_model = LlmModels.From()
-        executor = LiteLLMExecutor(llm_model)
-    session = ModelSession("user", executor)
-    session.add_response("system", system_prompt)
-    session.add_response("user", instruction)
-    stage_log(f"after_llm_{stage_prefix}", f"Prompt sent to {stage_prefix} model. Awaiting response...", log_stages)
-    fork = session.Fork("git_cmd_fork", "user", instruction)
-    fork.Answer(session)
-    for msg in reversed(session.messages):
-        if msg.actor == "git_cmd_fork":
-            lines = msg.content.strip().splitlines()
-            for line in lines:
-                line = line.strip()
-                if line and "git " in line:
-                    line = line.lstrip("0123456789. )-")
-                    line = line.split(";")[0].strip()
-                    stage_log(f"after_llm_{stage_prefix}", f"{stage_prefix.capitalize()} model returned: {line}", log_stages)
-                    return line
-            stage_log(f"after_llm_{stage_prefix}", f"{stage_prefix.capitalize()} model returned: {msg.content.strip()}", log_stages)
-            return msg.content.strip()
+SMALL_PROMPT = (
+    BASIC_GIT_KB
+    + "\n\nYou are a CLI assistant. Given an English instruction, output the corresponding git command only. "
+    "Do not explain. Do not add extra text. Output only the git command. Do not number your response. Do not repeat the command."
+)
+
+SMART_PROMPT = (
+    FULL_GIT_KB
+    + "\n\nYou are a CLI assistant and a git expert. Given an English instruction, output the corresponding git command only. "
+    "Do not explain. Do not add extra text. Output only the git command. Do not number your response. Do not repeat the command."
+)
+
+def extract_git_command(content):
+    """Return the first line that looks like a git command, cleaned of numbering and trailing commands."""
+    for line in content.strip().splitlines():
+        line = line.strip()
+        if line and "git " in line:
+            line = line.lstrip("0123456789. )-")
+            return line.split(";")[0].strip()
     return None
 
+def build_cascade(smart_mode=False, no_local=False, log_stages=False):
+    """
+    Build the model cascade for the requested mode.
+
+    The local tier gets the short knowledge base, the smart tier the full one.
+    A tier only wins if its answer contains a git command.
+    """
+    tiers = []
+    if not no_local:
+        tiers.append(CascadeTier(LiteLLMExecutor(LlmModels.From()), name="small", system_prompt=SMALL_PROMPT))
+    if smart_mode or no_local:
+        try:
+            tiers.append(CascadeTier(OpenAIExecutor(), name="smart", system_prompt=SMART_PROMPT))
+        except ValueError as e:
+            if no_local:
+                raise
+            stage_log("cascade", f"Smart model unavailable: {e}", log_stages)
+    return CascadeExecutor(tiers, validator=lambda message: extract_git_command(message.content) is not None)
+
 def get_git_command_from_llm(english_instruction, smart_mode=False, log_stages=False, no_local=False):
     """
     Returns the git command string mapped from the English instruction using the LLM.
@@ -188,37 +202,22 @@ def get_git_command_from_llm(english_instruction, smart_mode=False, log_stages=F
     If --smart is set (without --no-local), local is tried first, then smart as fallback.
     Otherwise, only the local model is called.
     """
-    if no_local:
-        # Only call the smart model
-        system_prompt_smart = (
-            FULL_GIT_KB
-            + "\n\nYou are a CLI assistant and a git expert. Given an English instruction, output the corresponding git command only. "
-            "Do not explain. Do not add extra text. Output only the git command. Do not number your response. Do not repeat the command."
-        )
-        return call_llm_model("openai", "gpt-4.1-nano", system_prompt_smart, english_instruction, log_stages, "smart")
-    if smart_mode:
-        # Try local, then smart if local fails
-        system_prompt_small = (
-            BASIC_GIT_KB
-            + "\n\nYou are a CLI assistant. Given an English instruction, output the corresponding git command only. "
-            "Do not explain. Do not add extra text. Output only the git command. Do not number your response. Do not repeat the command."
-        )
-        result = call_llm_model("ollama", os.environ.get("OPENAI_MODEL", "phi3"), system_prompt_small, english_instruction, log_stages, "small")
-        if result:
-            return result
-        system_prompt_smart = (
-            FULL_GIT_KB
-            + "\n\nYou are a CLI assistant and a git expert. Given an English instruction, output the corresponding git command only. "
-            "Do not explain. Do not add extra text. Output only the git command. Do not number your response. Do not repeat the command."
-        )
-        return call_llm_model("openai", "gpt-4.1-nano", system_prompt_smart, english_instruction, log_stages, "smart")
-    # Only local model
-    system_prompt_small = (
-        BASIC_GIT_KB
-        + "\n\nYou are a CLI assistant. Given an English instruction, output the corresponding git command only. "
-        "Do not explain. Do not add extra text. Output only the git command. Do not number your response. Do not repeat the command."
-    )
-    return call_llm_model("ollama", os.environ.get("OPENAI_MODEL", "phi3"), system_prompt_small, english_instruction, log_stages, "small")
+    executor = build_cascade(smart_mode, no_local, log_stages)
+    session = ModelSession("user", executor=executor)
+    session.add_response("system", SMART_PROMPT if no_local else SMALL_PROMPT)
+    session.add_response("user", english_instruction)
+    stage_log("before_llm", f"Sending instruction to tiers: {[tier.name for tier in executor.tiers]}", log_stages)
+    fork = session.Fork("git_cmd_fork", "user", english_instruction)
+    try:
+        fork.Answer(session)
+    except ModelError as e:
+        stage_log("after_llm", str(e), log_stages)
+        return None
+    msg = session.messages[-1]
+    stage_log("after_llm", f"{msg.metadata.get('cascade_name')} model returned: {msg.content.strip()}", log_stages)
+    for tier in executor.tier_stats():
+        stage_log("cascade", f"{tier.name}: {tier.successes}/{tier.attempts} succeeded", log_stages)
+    return extract_git_command(msg.content)
 
 def main():
     parser = argparse.ArgumentParser(description="LLM-powered English-to-git CLI agent")
@@ -191,11 +191,9 @@ class TodoHarvester:
 
     def _get_embeddings(self, issues: List[Dict]) -> List[List[float]]:
         """Get embeddings for each issue using the model."""
-        embeddings = []
-        
-        for issue in issues:
-            # Create embedding fork
-            embed_fork = self.session.Fork(
+        # Embedding forks are independent, so run them as one concurrent batch
+        embed_forks = [
+            self.session.Fork(
                 "embedder",
                 "user",
                 f"""Create an embedding representation of this issue:
@@ -203,12 +201,16 @@ class TodoHarvester:
                 Description: {issue['description']}
                 Return only the embedding vector as a list of floats."""
             )
-            embed_fork.Answer(self.session)
-            
+            for issue in issues
+        ]
+        results = self.session.run_forks(embed_forks, max_concurrency=8)
+
+        embeddings = []
+        for issue, result in zip(issues, results):
             # Parse embedding response
             try:
                 import json
-                embedding = json.loads(self.session.messages[-1].content)
+                embedding = json.loads(result.content)
                 if isinstance(embedding, list) and all(isinstance(x, (int, float)) for x in embedding):
                     embeddings.append(embedding)
                 else:
@@ -0,0 +1,6 @@
+"""
+Benchmarks for FormalAiSdk hot paths.
+Each module can be run directly, e.g. `python -m FormalAiSdk.benchmarks.conversation_history`.
+The suite module runs all hot-path benchmarks, writes JSON results and compares
+them against a baseline: `python -m FormalAiSdk.benchmarks.suite run --output results.json`.
+"""
@@ -0,0 +1,67 @@
+"""
+Benchmark: building long conversation histories.
+
+Compares the persistent Conversation against the previous copy-on-append
+implementation for add_message chains, and times
+ModelSession.get_conversation_history on a long session.
+
+Usage:
+    python -m FormalAiSdk.benchmarks.conversation_history [--messages 10000] [--repeat 3]
+"""
+
+import argparse
+import time
+from dataclasses import dataclass, field
+from typing import List
+
+from ..core.types import Conversation, Message, Role
+from ..sdk.session import ModelSession
+
+@dataclass(frozen=True)
+class CopyingConversation:
+    """The copy-on-append Conversation used before PersistentList, kept for comparison."""
+    messages: List[Message] = field(default_factory=list)
+
+    def __post_init__(self):
+        object.__setattr__(self, 'messages', list(self.messages))
+
+    def add_message(self, role: Role, content: str) -> 'CopyingConversation':
+        new_messages = list(self.messages)
+        new_messages.append(Message(role=role, content=content))
+        return CopyingConversation(messages=new_messages)
+
+def build_chain(conversation_type, count: int):
+    conversation = conversation_type()
+    for i in range(count):
+        conversation = conversation.add_message(Role.CLIENT if i % 2 else Role.AGENT, f"message {i}")
+    return conversation
+
+def best_of(repeat: int, func, *args) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Conversation history benchmark")
+    parser.add_argument("--messages", type=int, default=10000, help="Number of messages in the history")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (best is reported)")
+    args = parser.parse_args(argv)
+
+    persistent = best_of(args.repeat, build_chain, Conversation, args.messages)
+    copying = best_of(args.repeat, build_chain, CopyingConversation, args.messages)
+
+    session = ModelSession("user")
+    for i in range(args.messages):
+        session.add_response("user" if i % 2 else "assistant", f"message {i}")
+    history = best_of(args.repeat, session.get_conversation_history)
+
+    print(f"add_message chain, {args.messages} messages:")
+    print(f"  persistent : {persistent * 1000:10.2f} ms")
+    print(f"  copying    : {copying * 1000:10.2f} ms  ({copying / persistent:.1f}x slower)")
+    print(f"get_conversation_history, {args.messages} messages: {history * 1000:.2f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Benchmark: resident memory per core Message.
+
+Compares the slots-based Message against the previous frozen dataclass that
+eagerly copied its metadata dict. Content strings are shared between all
+messages so only per-message overhead is measured.
+
+Usage:
+    python -m FormalAiSdk.benchmarks.message_memory [--messages 1000000]
+"""
+
+import argparse
+import gc
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Dict
+
+from ..core.types import Message, Role
+
+@dataclass(frozen=True)
+class DataclassMessage:
+    """The frozen dataclass Message used before __slots__, kept for comparison."""
+    role: Role
+    content: str
+    metadata: Dict = field(default_factory=dict)
+
+    def __post_init__(self):
+        object.__setattr__(self, 'metadata', dict(self.metadata))
+
+def bytes_per_message(message_type, count: int, content: str) -> float:
+    gc.collect()
+    tracemalloc.start()
+    messages = [message_type(Role.CLIENT, content) for _ in range(count)]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del messages
+    # Discount the list holding the messages
+    return (current - 8 * count) / count
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Message memory benchmark")
+    parser.add_argument("--messages", type=int, default=1_000_000, help="Number of messages to allocate")
+    args = parser.parse_args(argv)
+
+    content = "shared message content"
+    before = bytes_per_message(DataclassMessage, args.messages, content)
+    after = bytes_per_message(Message, args.messages, content)
+
+    print(f"Bytes per message at {args.messages:,} messages:")
+    print(f"  dataclass : {before:8.1f}")
+    print(f"  slots     : {after:8.1f}  ({before / after:.1f}x smaller)")
+
+if __name__ == "__main__":
+    main()
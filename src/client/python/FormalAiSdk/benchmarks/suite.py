@@ -0,0 +1,299 @@
+"""
+Benchmark suite for the FormalAiSdk hot paths, with JSON results and comparison.
+
+Covers Conversation.add_message chains and ModelSession.get_conversation_history
+at 10, 1k and 100k messages, executor message conversion, executor and
+wrapper overhead against a no-op backend, and fork fan-out.
+
+Every benchmark is calibrated so a round takes at least --min-time seconds,
+then run for --rounds rounds; the median time per call is what compare uses.
+
+Usage:
+    python -m FormalAiSdk.benchmarks.suite run --output baseline.json
+    python -m FormalAiSdk.benchmarks.suite run --output current.json --filter history
+    python -m FormalAiSdk.benchmarks.suite compare baseline.json current.json [--threshold 0.1]
+
+compare exits with status 1 if any benchmark's median got slower by more
+than the threshold (a fraction, 0.1 = 10%).
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from ..core.executor import ModelExecutor
+from ..core.types import Conversation, Message, Role
+
+RESULTS_VERSION = 1
+SIZES = (10, 1_000, 100_000)
+
+# name -> factory(size) returning the callable to time; size None for unparameterized benchmarks
+_BENCHMARKS: List[Tuple[str, Optional[int], Callable]] = []
+
+def benchmark(name: str, sizes: Sequence[int] = (None,)):
+    """Register a benchmark factory, once per size. The factory does setup and returns the timed callable."""
+    def register(factory):
+        for size in sizes:
+            _BENCHMARKS.append((name, size, factory))
+        return factory
+    return register
+
+def benchmark_id(name: str, size: Optional[int]) -> str:
+    return name if size is None else f"{name}[{size}]"
+
+class NoOpExecutor(ModelExecutor):
+    """Backend that answers instantly, so only SDK overhead is measured."""
+    def __init__(self):
+        self._response = Message(role=Role.AGENT, content="ok")
+
+    def execute(self, conversation: Conversation) -> Message:
+        return self._response
+
+def make_conversation(size: int) -> Conversation:
+    conversation = Conversation()
+    for i in range(size):
+        conversation = conversation.add_message(Role.CLIENT if i % 2 else Role.AGENT, f"message {i}")
+    return conversation
+
+def make_session(size: int, executor: ModelExecutor = None):
+    from ..sdk.session import ModelSession
+    session = ModelSession("user", executor=executor)
+    for i in range(size):
+        session.add_response("user" if i % 2 else "assistant", f"message {i}")
+    return session
+
+# --- Benchmarks ---
+
+@benchmark("conversation.add_message_chain", SIZES)
+def bench_add_message_chain(size):
+    return lambda: make_conversation(size)
+
+@benchmark("session.get_conversation_history", SIZES)
+def bench_history(size):
+    session = make_session(size)
+    return session.get_conversation_history
+
+@benchmark("session.get_history_window", SIZES)
+def bench_history_window(size):
+    session = make_session(size)
+    return lambda: session.get_history_window(max_tokens=2000)
+
+@benchmark("session.turn", SIZES)
+def bench_turn(size):
+    session = make_session(size)
+    # One turn's bookkeeping: append a message, then build the next prompt from the history
+    def turn():
+        branch = session.branch()
+        branch.add_response("user", "question")
+        branch.get_conversation_history(include_last_n=20)
+    return turn
+
+@benchmark("litellm._convert_messages", SIZES[:2])
+def bench_litellm_convert(size):
+    from ..core.litellm_executor import LiteLLMExecutor
+    executor = LiteLLMExecutor({"provider": "openai", "model": "gpt-4.1"})
+    conversation = make_conversation(size)
+    return lambda: executor._convert_messages(conversation)
+
+@benchmark("ollama._convert_messages", SIZES[:2])
+def bench_ollama_convert(size):
+    from ..core.ollama_executor import OllamaExecutor
+    executor = OllamaExecutor({"model": "llama3.1"})
+    conversation = make_conversation(size)
+    return lambda: executor._convert_messages(conversation)
+
+@benchmark("executor.noop")
+def bench_noop(size):
+    executor = NoOpExecutor()
+    conversation = make_conversation(10)
+    return lambda: executor.execute(conversation)
+
+@benchmark("executor.pooled")
+def bench_pooled(size):
+    from ..core.pool import ExecutorPool, PoolLimits
+    pool = ExecutorPool(PoolLimits(max_concurrency=4))
+    executor = pool.executor({"provider": "noop", "model": "noop"}, executor=NoOpExecutor())
+    conversation = make_conversation(10)
+    return lambda: executor.execute(conversation)
+
+@benchmark("executor.caching_hit")
+def bench_caching_hit(size):
+    from ..core.caching_executor import CachingExecutor
+    executor = CachingExecutor(NoOpExecutor())
+    conversation = make_conversation(10)
+    executor.execute(conversation)
+    return lambda: executor.execute(conversation)
+
+@benchmark("executor.coalescing")
+def bench_coalescing(size):
+    from ..core.coalescing_executor import CoalescingExecutor
+    executor = CoalescingExecutor(NoOpExecutor())
+    conversation = make_conversation(10)
+    return lambda: executor.execute(conversation)
+
+@benchmark("fork.answer", (10, 1_000))
+def bench_fork_answer(size):
+    session = make_session(size, NoOpExecutor())
+    # Answer on a fresh branch so the history size stays fixed across calls
+    def answer():
+        branch = session.branch()
+        branch.Fork("bench", "user", "question").Answer(branch)
+    return answer
+
+@benchmark("fork.fan_out", (10, 100))
+def bench_fan_out(size):
+    session = make_session(100, NoOpExecutor())
+    def fan_out():
+        branch = session.branch()
+        branch.run_forks([branch.Fork(f"fork{i}", "user", f"question {i}") for i in range(size)])
+    return fan_out
+
+@benchmark("session.branch", (10, 100))
+def bench_branch(size):
+    session = make_session(1_000, NoOpExecutor())
+    def branch_out():
+        for i in range(size):
+            session.branch().add_response("assistant", f"idea {i}")
+    return branch_out
+
+# --- Runner ---
+
+def measure(func: Callable, rounds: int, min_time: float) -> Dict[str, float]:
+    """Time func, calibrating calls per round so each round lasts at least min_time."""
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        number *= 10 if elapsed < min_time / 10 else 2
+    timings = [elapsed / number]
+    for _ in range(rounds - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        timings.append((time.perf_counter() - start) / number)
+    return {
+        "median": statistics.median(timings),
+        "min": min(timings),
+        "mean": statistics.mean(timings),
+        "stdev": statistics.stdev(timings) if len(timings) > 1 else 0.0,
+        "rounds": rounds,
+        "number": number,
+    }
+
+def run(name_filter: str = None, rounds: int = 5, min_time: float = 0.05, max_size: int = None, log=print) -> Dict:
+    """
+    Run the registered benchmarks.
+
+    Args:
+        name_filter: Only run benchmarks whose id contains this string
+        rounds: Timed rounds per benchmark
+        min_time: Minimum seconds per round
+        max_size: Skip sizes above this (for quick runs)
+        log: Progress callback taking a line of text
+
+    Returns:
+        dict: Results document, as written by the run command
+    """
+    results = {}
+    skipped = {}
+    for name, size, factory in _BENCHMARKS:
+        bench_id = benchmark_id(name, size)
+        if name_filter and name_filter not in bench_id:
+            continue
+        if max_size is not None and size is not None and size > max_size:
+            continue
+        try:
+            func = factory(size)
+        except ImportError as e:
+            skipped[bench_id] = f"missing dependency: {e.name or e}"
+            log(f"{bench_id:45} skipped ({skipped[bench_id]})")
+            continue
+        results[bench_id] = measure(func, rounds, min_time)
+        log(f"{bench_id:45} {format_time(results[bench_id]['median'])}")
+    return {
+        "version": RESULTS_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "benchmarks": results,
+        "skipped": skipped,
+    }
+
+def format_time(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:9.2f} {unit}"
+    return f"{seconds / 1e-9:9.2f} ns"
+
+def compare(baseline: Dict, current: Dict, threshold: float = 0.1) -> Tuple[List[str], List[str]]:
+    """
+    Compare two results documents by median time per call.
+
+    Returns:
+        (report lines, ids of benchmarks slower than baseline by more than threshold)
+    """
+    lines = []
+    regressions = []
+    ids = list(baseline["benchmarks"]) + [bench_id for bench_id in current["benchmarks"] if bench_id not in baseline["benchmarks"]]
+    for bench_id in ids:
+        old = baseline["benchmarks"].get(bench_id)
+        new = current["benchmarks"].get(bench_id)
+        if old is None or new is None:
+            lines.append(f"{bench_id:45} {'only in current' if old is None else 'only in baseline'}")
+            continue
+        change = new["median"] / old["median"] - 1
+        marker = ""
+        if change > threshold:
+            marker = "  REGRESSION"
+            regressions.append(bench_id)
+        elif change < -threshold:
+            marker = "  improved"
+        lines.append(f"{bench_id:45} {format_time(old['median'])} -> {format_time(new['median'])}  {change:+7.1%}{marker}")
+    return lines, regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="FormalAiSdk benchmark suite")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run the benchmarks")
+    run_parser.add_argument("--output", help="Write results JSON to this file")
+    run_parser.add_argument("--filter", help="Only run benchmarks whose id contains this string")
+    run_parser.add_argument("--rounds", type=int, default=5, help="Timed rounds per benchmark")
+    run_parser.add_argument("--min-time", type=float, default=0.05, help="Minimum seconds per round")
+    run_parser.add_argument("--quick", action="store_true", help="Skip the 100k-message sizes")
+
+    compare_parser = commands.add_parser("compare", help="Compare two results files")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.1, help="Allowed slowdown as a fraction")
+
+    args = parser.parse_args(argv)
+    if args.command == "run":
+        results = run(args.filter, args.rounds, args.min_time, 1_000 if args.quick else None)
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump(results, f, indent=2)
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(args.current, encoding="utf-8") as f:
+        current = json.load(f)
+    lines, regressions = compare(baseline, current, args.threshold)
+    print("\n".join(lines))
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) above {args.threshold:.0%}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,278 @@
+"""
+Two-tier response cache for any ModelExecutor.
+
+CachingExecutor sits in front of another executor and answers repeated
+requests from an in-memory LRU tier or, optionally, a SQLite on-disk tier
+that survives restarts. Requests are matched by request_key(), so two calls
+hit the same entry only if the executor identity and the normalized
+conversation are the same.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from typing import Callable, Iterator, Optional, Tuple
+
+from .executor import ModelExecutor
+from .request_key import request_key
+from .types import Conversation, Message, Role
+
+@dataclass
+class CacheStats:
+    """
+    Hit, miss and eviction counters for a CachingExecutor.
+
+    Attributes:
+        memory_hits: Requests answered from the in-memory tier
+        disk_hits: Requests answered from the on-disk tier
+        misses: Requests forwarded to the wrapped executor
+        memory_evictions: Entries dropped from memory by the size limit
+        disk_evictions: Entries dropped from disk by the size limit
+        expired: Entries dropped from either tier because their TTL passed
+    """
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    memory_evictions: int = 0
+    disk_evictions: int = 0
+    expired: int = 0
+
+    @property
+    def hits(self) -> int:
+        return self.memory_hits + self.disk_hits
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+def _encode(message: Message) -> str:
+    return json.dumps(
+        {"role": message.role.name, "content": message.content, "metadata": message.metadata},
+        default=str,
+    )
+
+def _decode(payload: str) -> Message:
+    data = json.loads(payload)
+    return Message(role=Role[data["role"]], content=data["content"], metadata=data["metadata"])
+
+class _MemoryTier:
+    """Thread-safe LRU of responses with an optional TTL."""
+    def __init__(self, max_entries: int, ttl: Optional[float], clock: Callable[[], float]):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[float, Message]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, count: Callable[..., None]) -> Optional[Message]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            created, message = entry
+            if self.ttl is not None and self._clock() - created > self.ttl:
+                del self._entries[key]
+                count("expired")
+                return None
+            self._entries.move_to_end(key)
+            return message
+
+    def put(self, key: str, message: Message, count: Callable[..., None]) -> None:
+        with self._lock:
+            self._entries[key] = (self._clock(), message)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                count("memory_evictions")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+class _DiskTier:
+    """SQLite table of encoded responses, evicted least-recently-used by total size."""
+    def __init__(self, path: str, max_bytes: Optional[int], ttl: Optional[float], clock: Callable[[], float]):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, payload TEXT NOT NULL, size INTEGER NOT NULL, "
+            "created REAL NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+        self._db.commit()
+
+    def get(self, key: str, count: Callable[..., None]) -> Optional[Message]:
+        with self._lock:
+            row = self._db.execute("SELECT payload, created FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            payload, created = row
+            now = self._clock()
+            if self.ttl is not None and now - created > self.ttl:
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._db.commit()
+                count("expired")
+                return None
+            self._db.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+            self._db.commit()
+        return _decode(payload)
+
+    def put(self, key: str, message: Message, count: Callable[..., None]) -> None:
+        payload = _encode(message)
+        size = len(payload.encode("utf-8"))
+        with self._lock:
+            now = self._clock()
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, payload, size, created, accessed) VALUES (?, ?, ?, ?, ?)",
+                (key, payload, size, now, now),
+            )
+            if self.max_bytes is not None:
+                total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+                if total > self.max_bytes:
+                    doomed = []
+                    for old_key, old_size in self._db.execute("SELECT key, size FROM responses ORDER BY accessed, rowid"):
+                        if total <= self.max_bytes:
+                            break
+                        doomed.append((old_key,))
+                        total -= old_size
+                    self._db.executemany("DELETE FROM responses WHERE key = ?", doomed)
+                    count("disk_evictions", len(doomed))
+            self._db.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM responses")
+            self._db.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+class CachingExecutor(ModelExecutor):
+    """
+    ModelExecutor that caches another executor's responses.
+
+    Cache hits return a copy of the stored response with metadata["cache"] set
+    to "memory" or "disk". Streaming requests are cached once the stream
+    completes; a hit is replayed as a single delta.
+
+    Example:
+        executor = CachingExecutor(LiteLLMExecutor(config), path="responses.sqlite", ttl=24 * 3600)
+        session = ModelSession("user", executor=executor)
+        print(executor.stats.hit_rate)
+    """
+    def __init__(
+        self,
+        executor: ModelExecutor,
+        max_entries: int = 1024,
+        ttl: Optional[float] = None,
+        path: Optional[str] = None,
+        max_disk_bytes: Optional[int] = None,
+        disk_ttl: Optional[float] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Args:
+            executor: The executor whose responses are cached
+            max_entries: Maximum entries in the in-memory tier
+            ttl: Seconds an in-memory entry stays valid (None for no expiry)
+            path: SQLite database file for the on-disk tier (None disables it)
+            max_disk_bytes: Maximum total payload bytes in the on-disk tier
+            disk_ttl: Seconds an on-disk entry stays valid (defaults to ttl)
+            clock: Time source in seconds, wall-clock so disk TTLs survive restarts
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.executor = executor
+        self.stats = CacheStats()
+        self._stats_lock = threading.Lock()
+        self._memory = _MemoryTier(max_entries, ttl, clock)
+        self._disk = _DiskTier(path, max_disk_bytes, disk_ttl if disk_ttl is not None else ttl, clock) if path else None
+
+    def identity(self):
+        """Caching does not change responses, so report the wrapped executor's identity."""
+        return self.executor.identity()
+
+    def _count(self, counter: str, amount: int = 1) -> None:
+        with self._stats_lock:
+            setattr(self.stats, counter, getattr(self.stats, counter) + amount)
+
+    def _lookup(self, key: str) -> Optional[Message]:
+        message = self._memory.get(key, self._count)
+        if message is not None:
+            self._count("memory_hits")
+            return Message(message.role, message.content, {**message.metadata, "cache": "memory"})
+        if self._disk is not None:
+            message = self._disk.get(key, self._count)
+            if message is not None:
+                self._count("disk_hits")
+                self._memory.put(key, message, self._count)
+                return Message(message.role, message.content, {**message.metadata, "cache": "disk"})
+        self._count("misses")
+        return None
+
+    def _store(self, key: str, message: Message) -> None:
+        # Keep a private copy so callers mutating the returned metadata can't alter the cache
+        self._memory.put(key, Message(message.role, message.content, message.metadata), self._count)
+        if self._disk is not None:
+            self._disk.put(key, message, self._count)
+
+    def execute(self, conversation: Conversation) -> Message:
+        """Return a cached response, or execute the wrapped executor and cache its response."""
+        key = request_key(self.executor, conversation)
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+        response = self.executor.execute(conversation)
+        self._store(key, response)
+        return response
+
+    async def aexecute(self, conversation: Conversation) -> Message:
+        """Async variant of execute(); misses await the wrapped executor."""
+        key = request_key(self.executor, conversation)
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+        response = await self.executor.aexecute(conversation)
+        self._store(key, response)
+        return response
+
+    def stream(self, conversation: Conversation) -> Iterator[str]:
+        """Replay a cached response as one delta, or stream and cache the full response."""
+        key = request_key(self.executor, conversation)
+        cached = self._lookup(key)
+        if cached is not None:
+            yield cached.content
+            return
+        parts = []
+        for delta in self.executor.stream(conversation):
+            parts.append(delta)
+            yield delta
+        self._store(key, Message(role=Role.AGENT, content="".join(parts)))
+
+    def stats_snapshot(self) -> CacheStats:
+        """Return a copy of the current counters."""
+        with self._stats_lock:
+            return replace(self.stats)
+
+    def clear(self) -> None:
+        """Drop all cached responses from both tiers."""
+        self._memory.clear()
+        if self._disk is not None:
+            self._disk.clear()
+
+    def close(self) -> None:
+        """Close the on-disk tier."""
+        if self._disk is not None:
+            self._disk.close()
@@ -0,0 +1,324 @@
+"""
+Cascading fallback across an ordered list of models.
+
+A CascadeExecutor tries its tiers in order, typically a cheap local model
+first and a smarter cloud model last, and returns the first response that
+passes validation. Every tier has a circuit breaker: after a number of
+consecutive failures, timeouts or invalid answers the tier is skipped until
+a cool-down has passed, so a tier that keeps failing stops adding its
+latency to every request.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, replace
+from typing import Callable, Dict, List, Optional, Sequence, Union
+
+from .executor import ModelExecutor
+from .types import Conversation, Message, Role
+from ..exceptions import ModelError
+
+Validator = Callable[[Message], bool]
+
+@dataclass
+class CascadeTier:
+    """
+    One tier of a CascadeExecutor.
+
+    Attributes:
+        executor: The tier's ModelExecutor, or a model config for LlmModels.Executor
+        name: Name used in stats and metadata (defaults to the executor's model)
+        system_prompt: Optional system prompt replacing the conversation's system
+            messages for this tier (e.g. a shorter prompt for a small model)
+        timeout: Optional seconds after which the tier's call counts as failed
+        validator: Optional validator used instead of the executor-wide one
+    """
+    executor: Union[ModelExecutor, dict]
+    name: Optional[str] = None
+    system_prompt: Optional[str] = None
+    timeout: Optional[float] = None
+    validator: Optional[Validator] = None
+
+@dataclass
+class TierStats:
+    """
+    Outcome counters for one cascade tier.
+
+    Attributes:
+        name: The tier name
+        attempts: Calls made to the tier
+        successes: Calls that returned a valid response
+        failures: Calls that raised an error
+        timeouts: Calls that exceeded the tier timeout
+        invalid: Calls whose response failed validation
+        skipped: Requests that skipped the tier because its breaker was open
+    """
+    name: str
+    attempts: int = 0
+    successes: int = 0
+    failures: int = 0
+    timeouts: int = 0
+    invalid: int = 0
+    skipped: int = 0
+
+    @property
+    def success_rate(self) -> float:
+        """Fraction of attempts that produced a valid response."""
+        return self.successes / self.attempts if self.attempts else 0.0
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    Closed: calls are allowed. After failure_threshold consecutive failures
+    the breaker opens and calls are refused for reset_timeout seconds. Then a
+    single trial call is allowed (half-open); its success closes the breaker,
+    its failure opens it again, and release() lets another trial through.
+    """
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 30.0, clock: Callable[[], float] = time.monotonic):
+        if failure_threshold < 1:
+            raise ValueError("failure_threshold must be at least 1")
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial = False
+
+    @property
+    def state(self) -> str:
+        """The breaker state: "closed", "open" or "half-open"."""
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if self._trial or self._clock() - self._opened_at >= self.reset_timeout:
+                return "half-open"
+            return "open"
+
+    def allow(self) -> bool:
+        """Whether a call may be made now. In half-open state only one trial call is allowed."""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._trial or self._clock() - self._opened_at < self.reset_timeout:
+                return False
+            self._trial = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._trial or self._failures >= self.failure_threshold:
+                self._opened_at = self._clock()
+                self._trial = False
+
+    def release(self) -> None:
+        """End an allowed call without an outcome (e.g. cancelled), freeing the half-open trial."""
+        with self._lock:
+            self._trial = False
+
+class CascadeExecutor(ModelExecutor):
+    """
+    ModelExecutor that falls back through tiers until one gives a valid answer.
+
+    The winning response's metadata records cascade_tier (index) and
+    cascade_name. If every tier fails or is skipped, ModelError is raised.
+
+    Example:
+        executor = CascadeExecutor(
+            [
+                CascadeTier(LlmModels.From({"provider": "ollama", "model": "ollama/phi3"}), timeout=10),
+                CascadeTier(LlmModels.FromOpenAi()),
+            ],
+            validator=lambda message: "git " in message.content,
+        )
+        session = ModelSession("user", executor=executor)
+        print([tier.success_rate for tier in executor.tier_stats()])
+    """
+    def __init__(
+        self,
+        tiers: Sequence[Union[CascadeTier, ModelExecutor, dict]],
+        validator: Optional[Validator] = None,
+        failure_threshold: int = 3,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            tiers: Tiers in the order they are tried; executors and configs
+                are wrapped in a default CascadeTier
+            validator: Check a response must pass, unless its tier has its own
+            failure_threshold: Consecutive failures that open a tier's breaker
+            reset_timeout: Seconds an open breaker waits before a trial call
+            clock: Time source for the breakers
+
+        Raises:
+            ValueError: If there are no tiers
+        """
+        if not tiers:
+            raise ValueError("CascadeExecutor needs at least one tier")
+        from ..models.llm_models import LlmModels
+        self.tiers: List[CascadeTier] = []
+        for tier in tiers:
+            if not isinstance(tier, CascadeTier):
+                tier = CascadeTier(tier)
+            executor = tier.executor
+            if not isinstance(executor, ModelExecutor):
+                executor = LlmModels.Executor(executor)
+            name = tier.name or executor.identity().get("model") or type(executor).__name__
+            self.tiers.append(replace(tier, executor=executor, name=name))
+        self.validator = validator
+        self.breakers = [CircuitBreaker(failure_threshold, reset_timeout, clock) for _ in self.tiers]
+        self._stats = [TierStats(tier.name) for tier in self.tiers]
+        self._lock = threading.Lock()
+
+    def identity(self) -> Dict:
+        """Any tier may answer, so the identity covers all of them."""
+        return {
+            "executor": type(self).__name__,
+            "tiers": [
+                {"name": tier.name, "system_prompt": tier.system_prompt, **tier.executor.identity()}
+                for tier in self.tiers
+            ],
+        }
+
+    def _count(self, index: int, counter: str) -> None:
+        with self._lock:
+            stats = self._stats[index]
+            setattr(stats, counter, getattr(stats, counter) + 1)
+
+    def _prepare(self, tier: CascadeTier, conversation: Conversation) -> Conversation:
+        """Apply the tier's system prompt, replacing any system messages."""
+        if tier.system_prompt is None:
+            return conversation
+        messages = [Message(Role.SYSTEM, tier.system_prompt)]
+        messages.extend(msg for msg in conversation.messages if msg.role != Role.SYSTEM)
+        return Conversation(messages)
+
+    def _accept(self, index: int, response: Message) -> Optional[Message]:
+        """Validate a tier's response and update its stats and breaker. A validator that raises rejects the response."""
+        tier = self.tiers[index]
+        validator = tier.validator or self.validator
+        try:
+            valid = validator is None or validator(response)
+        except Exception:
+            valid = False
+        if not valid:
+            self._count(index, "invalid")
+            self.breakers[index].record_failure()
+            return None
+        self._count(index, "successes")
+        self.breakers[index].record_success()
+        metadata = dict(response.metadata)
+        metadata["cascade_tier"] = index
+        metadata["cascade_name"] = tier.name
+        return Message(response.role, response.content, metadata)
+
+    def _reject(self, index: int, counter: str) -> None:
+        self._count(index, counter)
+        self.breakers[index].record_failure()
+
+    @staticmethod
+    def _execute_timed(tier: CascadeTier, conversation: Conversation) -> Message:
+        """Run a tier call on its own thread and wait at most the tier timeout for it."""
+        future = Future()
+
+        def run():
+            future.set_running_or_notify_cancel()
+            try:
+                future.set_result(tier.executor.execute(conversation))
+            except BaseException as e:
+                future.set_exception(e)
+
+        threading.Thread(target=run, name=f"cascade-{tier.name}", daemon=True).start()
+        return future.result(tier.timeout)
+
+    def execute(self, conversation: Conversation) -> Message:
+        """
+        Try each tier in order and return the first valid response.
+
+        A tier with a timeout is called on a thread of its own. A call that
+        times out is abandoned, not stopped: its thread and its request to the
+        model run until the executor returns, and the result is ignored. The
+        tier's breaker bounds how many such calls pile up while it stays slow.
+
+        Raises:
+            ModelError: If every tier failed, timed out, answered invalidly or was skipped
+        """
+        errors = []
+        for index, tier in enumerate(self.tiers):
+            if not self.breakers[index].allow():
+                self._count(index, "skipped")
+                continue
+            self._count(index, "attempts")
+            prepared = self._prepare(tier, conversation)
+            try:
+                if tier.timeout is None:
+                    response = tier.executor.execute(prepared)
+                else:
+                    response = self._execute_timed(tier, prepared)
+                accepted = self._accept(index, response)
+            except FutureTimeoutError:
+                self._reject(index, "timeouts")
+                errors.append(f"{tier.name}: timed out after {tier.timeout}s")
+                continue
+            except Exception as e:
+                self._reject(index, "failures")
+                errors.append(f"{tier.name}: {e}")
+                continue
+            except BaseException:
+                # Cancelled or interrupted: there is no outcome to record
+                self.breakers[index].release()
+                raise
+            if accepted is not None:
+                return accepted
+            errors.append(f"{tier.name}: invalid response")
+        raise ModelError("All cascade tiers failed: " + ("; ".join(errors) or "every tier is open"))
+
+    async def aexecute(self, conversation: Conversation) -> Message:
+        """
+        Async variant of execute(); timed-out tier calls are cancelled.
+
+        Raises:
+            ModelError: If every tier failed, timed out, answered invalidly or was skipped
+        """
+        errors = []
+        for index, tier in enumerate(self.tiers):
+            if not self.breakers[index].allow():
+                self._count(index, "skipped")
+                continue
+            self._count(index, "attempts")
+            prepared = self._prepare(tier, conversation)
+            try:
+                response = await asyncio.wait_for(tier.executor.aexecute(prepared), tier.timeout)
+                accepted = self._accept(index, response)
+            except asyncio.TimeoutError:
+                self._reject(index, "timeouts")
+                errors.append(f"{tier.name}: timed out after {tier.timeout}s")
+                continue
+            except Exception as e:
+                self._reject(index, "failures")
+                errors.append(f"{tier.name}: {e}")
+                continue
+            except BaseException:
+                # Cancelled or interrupted: there is no outcome to record
+                self.breakers[index].release()
+                raise
+            if accepted is not None:
+                return accepted
+            errors.append(f"{tier.name}: invalid response")
+        raise ModelError("All cascade tiers failed: " + ("; ".join(errors) or "every tier is open"))
+
+    def tier_stats(self) -> List[TierStats]:
+        """Return copies of the per-tier counters, in tier order."""
+        with self._lock:
+            return [replace(stats) for stats in self._stats]
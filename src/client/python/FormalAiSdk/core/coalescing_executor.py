@@ -0,0 +1,129 @@
+"""
+Single-flight request coalescing for any ModelExecutor.
+
+When identical requests (same request_key()) are issued concurrently, only
+the first one reaches the wrapped executor. The others wait for it and all of
+them receive the same Message, or the same error. Nothing is cached: once the
+upstream call finishes, the next identical request goes upstream again.
+Streams are passed through uncoalesced, since their deltas cannot be shared.
+"""
+
+import asyncio
+import threading
+from dataclasses import dataclass, replace
+from typing import Dict, Iterator, Optional, Tuple
+
+from .executor import ModelExecutor
+from .request_key import request_key
+from .types import Conversation, Message
+
+@dataclass
+class CoalescingStats:
+    """
+    Counters for a CoalescingExecutor.
+
+    Attributes:
+        upstream: Requests forwarded to the wrapped executor
+        coalesced: Requests that shared an in-flight upstream call
+    """
+    upstream: int = 0
+    coalesced: int = 0
+
+class _Flight:
+    """An in-flight synchronous upstream call and its outcome."""
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Optional[Message] = None
+        self.error: Optional[BaseException] = None
+
+class CoalescingExecutor(ModelExecutor):
+    """
+    ModelExecutor that deduplicates identical concurrent requests.
+
+    Synchronous calls coalesce across threads; asynchronous calls coalesce per
+    event loop. A caller cancelling its aexecute() does not cancel the shared
+    upstream call for the others.
+
+    Example:
+        executor = CoalescingExecutor(LiteLLMExecutor(config))
+        # Many sessions evaluating the same condition at once share one call
+        print(executor.stats.coalesced)
+    """
+    def __init__(self, executor: ModelExecutor):
+        """
+        Args:
+            executor: The executor whose calls are coalesced
+        """
+        self.executor = executor
+        self.stats = CoalescingStats()
+        self._lock = threading.Lock()
+        self._flights: Dict[str, _Flight] = {}
+        self._tasks: Dict[Tuple[int, str], "asyncio.Task"] = {}
+
+    def identity(self):
+        """Coalescing does not change responses, so report the wrapped executor's identity."""
+        return self.executor.identity()
+
+    def execute(self, conversation: Conversation) -> Message:
+        """Execute the wrapped executor, or wait for an identical call already in flight."""
+        key = request_key(self.executor, conversation)
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self.stats.upstream += 1
+            else:
+                self.stats.coalesced += 1
+
+        if leader:
+            try:
+                flight.result = self.executor.execute(conversation)
+            except BaseException as e:
+                flight.error = e
+            finally:
+                with self._lock:
+                    del self._flights[key]
+                flight.done.set()
+        else:
+            flight.done.wait()
+
+        if flight.error is not None:
+            raise flight.error
+        return flight.result
+
+    async def aexecute(self, conversation: Conversation) -> Message:
+        """Await the wrapped executor, or an identical call already in flight on this loop."""
+        key = request_key(self.executor, conversation)
+        loop = asyncio.get_running_loop()
+        task_key = (id(loop), key)
+        with self._lock:
+            task = self._tasks.get(task_key)
+            if task is None:
+                task = loop.create_task(self.executor.aexecute(conversation))
+                self._tasks[task_key] = task
+                task.add_done_callback(lambda done: self._forget(task_key, done))
+                self.stats.upstream += 1
+            else:
+                self.stats.coalesced += 1
+        return await asyncio.shield(task)
+
+    def stream(self, conversation: Conversation) -> Iterator[str]:
+        """Stream from the wrapped executor; streams are not coalesced."""
+        with self._lock:
+            self.stats.upstream += 1
+        yield from self.executor.stream(conversation)
+
+    def _forget(self, task_key: Tuple[int, str], task: "asyncio.Task") -> None:
+        with self._lock:
+            self._tasks.pop(task_key, None)
+        # Mark the error as retrieved in case every awaiting caller was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    def stats_snapshot(self) -> CoalescingStats:
+        """Return a copy of the current counters."""
+        with self._lock:
+            return replace(self.stats)
@@ -2,7 +2,9 @@
 Base model executor interface for FormalAI SDK.
 """
 
+import asyncio
 from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterator
 from .types import Conversation, Message
 
 class ModelExecutor(ABC):
@@ -39,3 +41,66 @@ class ModelExecutor(ABC):
             response = executor.execute(convo)
         """
         raise NotImplementedError
+
+    async def aexecute(self, conversation: Conversation) -> Message:
+        """
+        Asynchronously execute model with given conversation history.
+
+        The default implementation runs execute() on the event loop's default
+        thread pool so every executor is awaitable. Implementations backed by
+        an async client should override this to avoid tying up a thread per call.
+
+        Args:
+            conversation: The conversation history to process
+
+        Returns:
+            Message: The model's response as a Message object
+
+        Raises:
+            ExecutionError: Base class for execution-related errors
+            ModelError: For model-specific execution issues
+            InvalidConversationError: If conversation structure is invalid
+
+        Example:
+            response = await executor.aexecute(convo)
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.execute, conversation)
+
+    def stream(self, conversation: Conversation) -> Iterator[str]:
+        """
+        Execute model with given conversation history, yielding content deltas.
+
+        The default implementation yields the whole execute() result as a
+        single delta. Implementations backed by a streaming API should
+        override this to yield content as it is generated.
+
+        Args:
+            conversation: The conversation history to process
+
+        Yields:
+            str: Successive pieces of the response content
+
+        Raises:
+            ExecutionError: Base class for execution-related errors
+            ModelError: For model-specific execution issues
+            InvalidConversationError: If conversation structure is invalid
+
+        Example:
+            for delta in executor.stream(convo):
+                print(delta, end="", flush=True)
+        """
+        yield self.execute(conversation).content
+
+    def identity(self) -> Dict[str, Any]:
+        """
+        Describe what, besides the conversation, determines this executor's responses.
+
+        Used to build request keys for caching and deduplication. Implementations
+        should include the model and any request options, and must not include
+        secrets such as API keys (use a fingerprint instead).
+
+        Returns:
+            dict: JSON-serializable description of the executor
+        """
+        return {"executor": type(self).__name__}
@@ -0,0 +1,284 @@
+"""
+Hedged requests across several models.
+
+A HedgedExecutor sends each request to a primary model and, if no answer has
+arrived after a hedge delay, also to the next backup model, and so on. The
+first valid answer wins and the calls still running are cancelled, so a slow
+provider no longer sets the latency of the whole request. The delay is fixed,
+or tracks a percentile (p95 by default) of the primary's recent latencies.
+"""
+
+import asyncio
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field, replace
+from typing import Callable, Dict, List, Optional, Sequence, Union
+
+from .executor import ModelExecutor
+from .types import Conversation, Message
+from ..exceptions import ModelError
+
+@dataclass
+class HedgeStats:
+    """
+    Counters for a HedgedExecutor.
+
+    Attributes:
+        calls: Requests executed
+        hedged: Requests that started at least one backup
+        failures: Requests where no model produced a valid answer
+        wins: Requests won per member, in member order
+    """
+    calls: int = 0
+    hedged: int = 0
+    failures: int = 0
+    wins: List[int] = field(default_factory=list)
+
+class HedgedExecutor(ModelExecutor):
+    """
+    ModelExecutor that races a primary model against delayed backups.
+
+    Members are ModelExecutors or model configs (resolved through
+    LlmModels.Executor). The winning response's metadata records
+    hedge_winner (member index), hedge_model and hedge_launched (how many
+    members were called).
+
+    Synchronous calls run member calls on a shared pool of
+    len(members) * max_concurrency threads, so up to max_concurrency requests
+    hedge without queueing. A losing call that is already running cannot be
+    interrupted: it keeps its thread and its request to the provider open
+    until the member returns, and its result is discarded. Slow losers
+    therefore reduce the pool available to new requests, whose calls then
+    queue. Asynchronous calls cancel the losing tasks. close() shuts the
+    pool down.
+
+    Example:
+        executor = HedgedExecutor([
+            LlmModels.FromOpenAi(),
+            LlmModels.From({"provider": "azure", "deployment": "gpt-4.1"}),
+        ])
+        session = ModelSession("user", executor=executor)
+    """
+    def __init__(
+        self,
+        members: Sequence[Union[ModelExecutor, dict]],
+        delay: Optional[float] = None,
+        percentile: float = 0.95,
+        initial_delay: float = 2.0,
+        min_samples: int = 20,
+        window: int = 200,
+        validator: Callable[[Message], bool] = None,
+        max_concurrency: int = 8,
+    ):
+        """
+        Args:
+            members: Primary first, then backups in the order they are started
+            delay: Fixed seconds to wait before starting each backup; None adapts
+                the delay to the primary's latency percentile
+            percentile: Latency percentile of the primary used as the adaptive delay
+            initial_delay: Delay used until min_samples primary latencies are known
+            min_samples: Primary latencies needed before the delay adapts
+            window: Number of recent primary latencies kept
+            validator: Optional check a response must pass to win; invalid
+                answers count as failures and start the next backup immediately
+            max_concurrency: Synchronous requests whose member calls can all run
+                at once; sizes the worker pool
+
+        Raises:
+            ValueError: If there are no members or a setting is out of range
+        """
+        if not members:
+            raise ValueError("HedgedExecutor needs at least one member")
+        if delay is not None and delay < 0:
+            raise ValueError("delay cannot be negative")
+        if not 0 < percentile <= 1:
+            raise ValueError("percentile must be in (0, 1]")
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        from ..models.llm_models import LlmModels
+        self.members: List[ModelExecutor] = [
+            member if isinstance(member, ModelExecutor) else LlmModels.Executor(member)
+            for member in members
+        ]
+        self.delay = delay
+        self.percentile = percentile
+        self.initial_delay = initial_delay
+        self.min_samples = min_samples
+        self.validator = validator
+        self.max_concurrency = max_concurrency
+        self.stats = HedgeStats(wins=[0] * len(self.members))
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=window)
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+    def identity(self) -> Dict:
+        """Any member may answer, so the identity covers all of them."""
+        return {
+            "executor": type(self).__name__,
+            "members": [member.identity() for member in self.members],
+        }
+
+    def hedge_delay(self) -> float:
+        """Seconds to wait for an answer before starting the next backup."""
+        if self.delay is not None:
+            return self.delay
+        with self._lock:
+            samples = sorted(self._latencies)
+        if len(samples) < self.min_samples:
+            return self.initial_delay
+        return samples[max(0, math.ceil(self.percentile * len(samples)) - 1)]
+
+    def _record_primary(self, latency: float) -> None:
+        with self._lock:
+            self._latencies.append(latency)
+
+    def _valid(self, response: Message) -> bool:
+        return self.validator is None or self.validator(response)
+
+    def _won(self, index: int, response: Message, launched: int) -> Message:
+        with self._lock:
+            self.stats.calls += 1
+            self.stats.hedged += launched > 1
+            self.stats.wins[index] += 1
+        metadata = dict(response.metadata)
+        metadata["hedge_winner"] = index
+        metadata["hedge_model"] = self.members[index].identity().get("model")
+        metadata["hedge_launched"] = launched
+        return Message(response.role, response.content, metadata)
+
+    def _failed(self, errors: List[BaseException], launched: int) -> ModelError:
+        with self._lock:
+            self.stats.calls += 1
+            self.stats.hedged += launched > 1
+            self.stats.failures += 1
+        error = ModelError(f"No valid response from {launched} hedged model(s): {errors[-1]}")
+        error.__cause__ = errors[-1]
+        return error
+
+    def _call(self, index: int, conversation: Conversation) -> Message:
+        start = time.perf_counter()
+        response = self.members[index].execute(conversation)
+        if index == 0:
+            self._record_primary(time.perf_counter() - start)
+        return response
+
+    def _submit(self, index: int, conversation: Conversation) -> Future:
+        """Start a member call on the worker pool, creating it on first use."""
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(len(self.members) * self.max_concurrency, thread_name_prefix="hedge")
+            pool = self._pool
+        return pool.submit(self._call, index, conversation)
+
+    async def _acall(self, index: int, conversation: Conversation) -> Message:
+        start = time.perf_counter()
+        try:
+            response = await self.members[index].aexecute(conversation)
+        except asyncio.CancelledError:
+            if index == 0:
+                # A primary that lost the race took at least this long; leaving
+                # it out would pull the percentile below the real latency
+                self._record_primary(time.perf_counter() - start)
+            raise
+        if index == 0:
+            self._record_primary(time.perf_counter() - start)
+        return response
+
+    def execute(self, conversation: Conversation) -> Message:
+        """
+        Execute the primary, starting backups as the hedge delay passes.
+
+        Raises:
+            ModelError: If no member produced a valid response
+        """
+        delay = self.hedge_delay()
+        running = {}
+        errors: List[BaseException] = []
+        launched = 0
+
+        def launch():
+            nonlocal launched
+            running[self._submit(launched, conversation)] = launched
+            launched += 1
+
+        launch()
+        try:
+            while running:
+                timeout = delay if launched < len(self.members) else None
+                done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+                if not done:
+                    launch()
+                    continue
+                for future in done:
+                    index = running.pop(future)
+                    error = future.exception()
+                    if error is None:
+                        if self._valid(future.result()):
+                            return self._won(index, future.result(), launched)
+                        error = ModelError(f"Invalid response from hedged model {index}")
+                    errors.append(error)
+                if not running and launched < len(self.members):
+                    launch()
+        finally:
+            for future in running:
+                future.cancel()
+        raise self._failed(errors, launched)
+
+    async def aexecute(self, conversation: Conversation) -> Message:
+        """
+        Async variant of execute(); losing calls are cancelled.
+
+        Raises:
+            ModelError: If no member produced a valid response
+        """
+        delay = self.hedge_delay()
+        running: Dict["asyncio.Task", int] = {}
+        errors: List[BaseException] = []
+        launched = 0
+
+        def launch():
+            nonlocal launched
+            running[asyncio.ensure_future(self._acall(launched, conversation))] = launched
+            launched += 1
+
+        launch()
+        try:
+            while running:
+                timeout = delay if launched < len(self.members) else None
+                done, _ = await asyncio.wait(running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    launch()
+                    continue
+                for task in done:
+                    index = running.pop(task)
+                    error = task.exception()
+                    if error is None:
+                        if self._valid(task.result()):
+                            return self._won(index, task.result(), launched)
+                        error = ModelError(f"Invalid response from hedged model {index}")
+                    errors.append(error)
+                if not running and launched < len(self.members):
+                    launch()
+        finally:
+            for task in running:
+                task.cancel()
+        raise self._failed(errors, launched)
+
+    def stats_snapshot(self) -> HedgeStats:
+        """Return a copy of the current counters."""
+        with self._lock:
+            return replace(self.stats, wins=list(self.stats.wins))
+
+    def close(self) -> None:
+        """
+        Shut down the worker pool, dropping queued member calls.
+
+        Running calls finish in the background. A later execute() starts a new pool.
+        """
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,194 @@
+"""
+Process-wide registry of OpenAI and plain HTTP clients and their connection pools.
+
+Building an openai.OpenAI or openai.AzureOpenAI client creates a new httpx
+connection pool, so every executor instance used to pay for fresh TCP and TLS
+handshakes. The registry hands out one client per endpoint, API version and
+API key fingerprint, reusing keep-alive connections across executors. Plain
+httpx clients for providers spoken to directly (such as Ollama) are shared
+per base URL the same way.
+"""
+
+import asyncio
+import importlib.util
+import threading
+import weakref
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+import httpx
+
+from ..models.llm_models import key_fingerprint
+
+@dataclass(frozen=True)
+class HttpPoolSettings:
+    """
+    Connection pool settings for clients created by a ClientRegistry.
+
+    Attributes:
+        max_connections: Maximum concurrent connections per client
+        max_keepalive_connections: Idle connections kept open for reuse
+        keepalive_expiry: Seconds an idle connection is kept open
+        timeout: Request timeout in seconds
+        http2: Use HTTP/2 when the optional h2 package is installed
+    """
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
+    timeout: float = 60.0
+    http2: bool = True
+
+def http2_available() -> bool:
+    """Whether httpx can negotiate HTTP/2 (requires the h2 package)."""
+    return importlib.util.find_spec("h2") is not None
+
+class ClientRegistry:
+    """
+    Shares OpenAI clients, and so their connection pools, across executors.
+
+    Sync clients are shared process-wide. Async clients are bound to the event
+    loop they were created on, so they are shared per running loop; await
+    aclose() on that loop before it ends to close them. The registry holds
+    loops weakly, so a loop that ends without aclose() releases its clients
+    once it is garbage collected, without closing their connections gracefully.
+
+    Example:
+        registry = get_client_registry()
+        registry.configure(HttpPoolSettings(max_connections=200))
+        client = registry.openai_client(api_key, "https://api.openai.com/v1")
+    """
+    def __init__(self, settings: HttpPoolSettings = None):
+        self.settings = settings or HttpPoolSettings()
+        self._lock = threading.Lock()
+        self._clients: Dict[Tuple, object] = {}
+        self._async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Tuple, object]]" = weakref.WeakKeyDictionary()
+
+    def configure(self, settings: HttpPoolSettings) -> None:
+        """Set the pool settings used for clients created from now on."""
+        with self._lock:
+            self.settings = settings
+
+    def _limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.settings.max_connections,
+            max_keepalive_connections=self.settings.max_keepalive_connections,
+            keepalive_expiry=self.settings.keepalive_expiry,
+        )
+
+    def _http_client(self, asynchronous: bool, **kwargs):
+        http2 = self.settings.http2 and http2_available()
+        client_type = httpx.AsyncClient if asynchronous else httpx.Client
+        return client_type(limits=self._limits(), timeout=self.settings.timeout, http2=http2, **kwargs)
+
+    def _build(self, api_key: str, api_base: str, api_version: Optional[str], azure: bool, asynchronous: bool):
+        # Imported here so clients for providers spoken to directly only need httpx
+        import openai
+        http_client = self._http_client(asynchronous)
+        if asynchronous:
+            client_type = openai.AsyncAzureOpenAI if azure else openai.AsyncOpenAI
+        else:
+            client_type = openai.AzureOpenAI if azure else openai.OpenAI
+        if azure:
+            return client_type(
+                api_key=api_key,
+                api_version=api_version,
+                azure_endpoint=api_base,
+                http_client=http_client,
+            )
+        return client_type(api_key=api_key, base_url=api_base, http_client=http_client)
+
+    def _shared(self, key: Tuple, asynchronous: bool, build):
+        with self._lock:
+            if asynchronous:
+                clients = self._loop_clients(asyncio.get_running_loop())
+            else:
+                clients = self._clients
+            client = clients.get(key)
+            if client is None:
+                client = clients[key] = build()
+            return client
+
+    def _loop_clients(self, loop: asyncio.AbstractEventLoop) -> Dict[Tuple, object]:
+        """The client dict for a running loop. Caller holds the lock."""
+        clients = self._async_clients.get(loop)
+        if clients is None:
+            # Loops closed without aclose() cannot close their clients any
+            # more; only stop referencing them
+            for closed in [other for other in self._async_clients if other.is_closed()]:
+                del self._async_clients[closed]
+            clients = self._async_clients[loop] = {}
+        return clients
+
+    def openai_client(
+        self,
+        api_key: str,
+        api_base: Optional[str],
+        api_version: Optional[str] = None,
+        azure: bool = False,
+        asynchronous: bool = False,
+    ):
+        """
+        Get the shared client for an endpoint, creating it on first use.
+
+        Args:
+            api_key: API key for the endpoint (only its fingerprint is used as a key)
+            api_base: Endpoint base URL
+            api_version: API version (Azure)
+            azure: Build an Azure OpenAI client
+            asynchronous: Build an async client for the running event loop
+
+        Returns:
+            openai.OpenAI, openai.AzureOpenAI or their async counterparts
+        """
+        key = (azure, api_base, api_version, key_fingerprint(api_key))
+        return self._shared(key, asynchronous, lambda: self._build(api_key, api_base, api_version, azure, asynchronous))
+
+    def http_client(self, base_url: str, asynchronous: bool = False):
+        """
+        Get the shared httpx client for a base URL, creating it on first use.
+
+        Args:
+            base_url: Base URL requests are made relative to
+            asynchronous: Build an httpx.AsyncClient for the running event loop
+
+        Returns:
+            httpx.Client or httpx.AsyncClient
+        """
+        return self._shared(("http", base_url), asynchronous, lambda: self._http_client(asynchronous, base_url=base_url))
+
+    def close(self) -> None:
+        """
+        Close all sync clients and forget every registered client.
+
+        Async clients cannot be closed synchronously; use aclose() on their
+        loop to close them.
+        """
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+            self._async_clients = weakref.WeakKeyDictionary()
+        for client in clients:
+            client.close()
+
+    async def aclose(self) -> None:
+        """Close the running loop's async clients, awaiting their shutdown, then close() the rest."""
+        with self._lock:
+            clients = self._async_clients.pop(asyncio.get_running_loop(), {})
+        for client in clients.values():
+            await _aclose(client)
+        self.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._clients) + sum(len(clients) for clients in self._async_clients.values())
+
+async def _aclose(client) -> None:
+    """Close an httpx.AsyncClient (aclose) or an async OpenAI client (close)."""
+    close = getattr(client, "aclose", None) or client.close
+    await close()
+
+_default_registry = ClientRegistry()
+
+def get_client_registry() -> ClientRegistry:
+    """Return the process-wide ClientRegistry."""
+    return _default_registry
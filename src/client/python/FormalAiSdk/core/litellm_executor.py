@@ -3,11 +3,14 @@ LiteLLM-based model executor implementation.
 Supports both OpenAI and Ollama models through a unified interface.
 """
 
-from typing import Optional, List, Dict, Any
+import time
+from typing import Optional, List, Dict, Any, Iterator
 
 import litellm
 
 from ..core.executor import ModelExecutor
+from ..core.tokens import response_usage
+from ..models.llm_models import key_fingerprint
 from ..core.types import Conversation, Message, Role
 from ..exceptions import ExecutionError, ModelError, InvalidConversationError
 
@@ -70,9 +73,11 @@ class LiteLLMExecutor(ModelExecutor):
             # OpenAI cloud
             self.model = self.model or "gpt-4.1"
             self.litellm_kwargs = {}
+            # Passed per call rather than through the global litellm.api_key, so
+            # executors with different keys can share a process safely
             api_key = model_config.get("api_key")
             if api_key:
-                litellm.api_key = api_key
+                self.litellm_kwargs["api_key"] = api_key
             api_base = model_config.get("api_base")
             if api_base:
                 self.litellm_kwargs["api_base"] = api_base
@@ -85,9 +90,24 @@ class LiteLLMExecutor(ModelExecutor):
             self.litellm_kwargs = {}
         else:
             # Generic fallback
-            self.litellm_kwargs = {k: v for k, v in model_config.items() if k not in ("provider", "model")}
+            self.litellm_kwargs = {k: v for k, v in model_config.items() if k not in ("provider", "model", "deployment")}
+
+        # Unset options are left to LiteLLM's defaults
+        self.litellm_kwargs = {k: v for k, v in self.litellm_kwargs.items() if v is not None}
 
     
+    def identity(self) -> Dict[str, Any]:
+        """Describe the provider, model and request options (API key fingerprinted)."""
+        kwargs = {k: v for k, v in self.litellm_kwargs.items() if k != "api_key"}
+        if self.litellm_kwargs.get("api_key"):
+            kwargs["api_key"] = key_fingerprint(self.litellm_kwargs["api_key"])
+        return {
+            "executor": type(self).__name__,
+            "provider": self.provider,
+            "model": self.model,
+            "kwargs": kwargs,
+        }
+
     def _convert_role(self, role: Role) -> str:
         """Convert our Role enum to LiteLLM role string."""
         # Map our roles to litellm roles
@@ -108,13 +128,67 @@ class LiteLLMExecutor(ModelExecutor):
             for msg in conversation.messages
         ]
     
-    def _create_message(self, content: str) -> Message:
+    def _create_message(self, content: str, metadata: Optional[Dict[str, Any]] = None) -> Message:
         """Create a Message object from LiteLLM response content."""
         return Message(
             role=Role.AGENT,
-            content=content
+            content=content,
+            metadata=metadata
         )
+
+    def _response_metadata(self, response: Any, start: float, sent: float) -> Dict[str, Any]:
+        """
+        Build response metadata: model id, token usage and latencies in seconds.
+
+        Args:
+            response: The LiteLLM completion response
+            start: perf_counter() when execute was entered
+            sent: perf_counter() just before the request was sent
+        """
+        now = time.perf_counter()
+        metadata = response_usage(response)
+        metadata.setdefault("model", self.model)
+        metadata["network_latency"] = now - sent
+        metadata["total_latency"] = now - start
+        return metadata
     
+    def _build_request(self, conversation: Conversation) -> Dict[str, Any]:
+        """
+        Build the LiteLLM completion arguments for a conversation.
+
+        Raises:
+            InvalidConversationError: If the conversation is empty
+        """
+        if not conversation.messages:
+            raise InvalidConversationError("Conversation cannot be empty")
+
+        messages = self._convert_messages(conversation)
+
+        if self.provider == "ollama":
+            # For Ollama, construct a single prompt string
+            prompt = ""
+            for msg in messages:
+                if msg["role"] == "system":
+                    prompt += f"<system>\n{msg['content']}\n</system>\n\n"
+                elif msg["role"] == "user":
+                    prompt += f"{msg['content']}\n\n"
+                else:  # assistant
+                    prompt += f"Assistant: {msg['content']}\n\n"
+            messages = [{"role": "user", "content": prompt}]
+
+        return {"model": self.model, "messages": messages, **self.litellm_kwargs}
+
+    def _extract_content(self, response: Any) -> str:
+        """Extract the response content from a LiteLLM completion."""
+        return response["choices"][0]["message"]["content"]
+
+    def _extract_delta(self, chunk: Any) -> Optional[str]:
+        """Extract the content delta from a LiteLLM streaming chunk."""
+        delta = chunk["choices"][0]["delta"]
+        if isinstance(delta, dict):
+            return delta.get("content")
+        return getattr(delta, "content", None)
+
     def execute(self, conversation: Conversation) -> Message:
         """
         Execute model with given conversation history.
@@ -137,39 +211,76 @@ class LiteLLMExecutor(ModelExecutor):
             ])
             response = executor.execute(convo)
         """
-        if not conversation.messages:
-            raise InvalidConversationError("Conversation cannot be empty")
-        
+        start = time.perf_counter()
+        request = self._build_request(conversation)
+
         try:
-            messages = self._convert_messages(conversation)
-            
-            if self.provider == "ollama":
-                # For Ollama, construct a single prompt string
-                prompt = ""
-                for msg in messages:
-                    if msg["role"] == "system":
-                        prompt += f"<system>\n{msg['content']}\n</system>\n\n"
-                    elif msg["role"] == "user":
-                        prompt += f"{msg['content']}\n\n"
-                    else:  # assistant
-                        prompt += f"Assistant: {msg['content']}\n\n"
-                
-                # Execute with constructed prompt
-                response = litellm.completion(
-                    model=self.model,
-                    messages=[{"role": "user", "content": prompt}]
-                )
-            else:
-                # For other providers, use standard message format
-                response = litellm.completion(
-                    model=self.model,
-                    messages=messages
-                )
-            
-            # Extract the response content
-            content = response["choices"][0]["message"]["content"]
-            
-            return self._create_message(content)
-            
+            sent = time.perf_counter()
+            response = litellm.completion(**request)
+            return self._create_message(
+                self._extract_content(response),
+                self._response_metadata(response, start, sent)
+            )
+        except Exception as e:
+            raise ModelError(f"Error during model execution: {str(e)}") from e
+
+    async def aexecute(self, conversation: Conversation) -> Message:
+        """
+        Asynchronously execute model with given conversation history.
+
+        Uses litellm.acompletion so many requests can be in flight on a
+        single event loop without a thread per call.
+
+        Args:
+            conversation: The conversation history to process
+
+        Returns:
+            Message: The model's response as a Message object
+
+        Raises:
+            ModelError: If there's an error during model execution
+            InvalidConversationError: If the conversation is empty or invalid
+
+        Example:
+            response = await executor.aexecute(convo)
+        """
+        start = time.perf_counter()
+        request = self._build_request(conversation)
+
+        try:
+            sent = time.perf_counter()
+            response = await litellm.acompletion(**request)
+            return self._create_message(
+                self._extract_content(response),
+                self._response_metadata(response, start, sent)
+            )
+        except Exception as e:
+            raise ModelError(f"Error during model execution: {str(e)}") from e
+
+    def stream(self, conversation: Conversation) -> Iterator[str]:
+        """
+        Execute model with given conversation history, yielding content deltas.
+
+        Args:
+            conversation: The conversation history to process
+
+        Yields:
+            str: Content deltas as LiteLLM streams them
+
+        Raises:
+            ModelError: If there's an error during model execution
+            InvalidConversationError: If the conversation is empty or invalid
+
+        Example:
+            for delta in executor.stream(convo):
+                print(delta, end="", flush=True)
+        """
+        request = self._build_request(conversation)
+
+        try:
+            for chunk in litellm.completion(stream=True, **request):
+                content = self._extract_delta(chunk)
+                if content:
+                    yield content
         except Exception as e:
             raise ModelError(f"Error during model execution: {str(e)}") from e
@@ -0,0 +1,216 @@
+"""
+Native Ollama model executor.
+
+Talks to Ollama's /api/chat endpoint directly instead of going through
+LiteLLM's prompt flattening. Messages keep their real roles, so Ollama can
+apply the model's chat template and reuse the KV cache for the unchanged
+prefix of a multi-turn conversation. keep_alive pins the model in memory
+between calls, and requests share a pooled HTTP client per server.
+"""
+
+import json
+import os
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+import httpx
+
+from .executor import ModelExecutor
+from .http_clients import ClientRegistry, get_client_registry
+from .types import Conversation, Message, Role
+from ..exceptions import ModelError, InvalidConversationError
+
+DEFAULT_API_BASE = "http://localhost:11434"
+
+def _seconds(nanoseconds: Optional[int]) -> Optional[float]:
+    return nanoseconds / 1e9 if nanoseconds is not None else None
+
+class OllamaExecutor(ModelExecutor):
+    """
+    ModelExecutor implementation using Ollama's native chat API.
+
+    Attributes:
+        model: The Ollama model name (e.g. "llama3.1"); an "ollama/" prefix is stripped
+        api_base: The Ollama server URL
+        keep_alive: How long Ollama keeps the model loaded after a call (e.g. "30m", -1 forever)
+        options: Optional model options (temperature, num_ctx, ...)
+
+    Example:
+        config = LlmModels.From({"provider": "ollama", "model": "ollama/llama3.1"})
+        executor = OllamaExecutor(config)
+        session = ModelSession("user", executor=executor)
+    """
+    def __init__(self, model_config: dict, registry: ClientRegistry = None):
+        """
+        Initialize the executor from a unified config dictionary.
+
+        Args:
+            model_config: Model configuration with keys model and optionally
+                api_base (defaults to OLLAMA_API_BASE or http://localhost:11434),
+                keep_alive (defaults to "30m") and options
+            registry: ClientRegistry to take HTTP clients from (defaults to the
+                process-wide registry, so executors share connection pools)
+        """
+        model = model_config.get("model") or "llama2"
+        self.model = model[len("ollama/"):] if model.startswith("ollama/") else model
+        self.api_base = (model_config.get("api_base") or os.getenv("OLLAMA_API_BASE") or DEFAULT_API_BASE).rstrip("/")
+        self.keep_alive = model_config.get("keep_alive", "30m")
+        self.options = model_config.get("options")
+        self.registry = registry if registry is not None else get_client_registry()
+
+    @property
+    def client(self) -> httpx.Client:
+        """Shared HTTP client for the Ollama server."""
+        return self.registry.http_client(self.api_base)
+
+    @property
+    def async_client(self) -> httpx.AsyncClient:
+        """Shared async HTTP client for the Ollama server on the running event loop."""
+        return self.registry.http_client(self.api_base, asynchronous=True)
+
+    def identity(self) -> Dict[str, Any]:
+        """Describe the server, model and options."""
+        return {
+            "executor": type(self).__name__,
+            "model": self.model,
+            "api_base": self.api_base,
+            "options": self.options,
+        }
+
+    def _convert_messages(self, conversation: Conversation) -> List[Dict[str, str]]:
+        """Convert core Message objects to Ollama chat format."""
+        role_mapping = {
+            Role.AGENT: "assistant",
+            Role.CLIENT: "user",
+            Role.SYSTEM: "system"
+        }
+        return [
+            {"role": role_mapping.get(msg.role, "user"), "content": msg.content}
+            for msg in conversation.messages
+        ]
+
+    def _build_request(self, conversation: Conversation, stream: bool) -> Dict[str, Any]:
+        """
+        Build the /api/chat request body for a conversation.
+
+        Raises:
+            InvalidConversationError: If the conversation is empty
+        """
+        if not conversation.messages:
+            raise InvalidConversationError("Conversation cannot be empty")
+        body = {
+            "model": self.model,
+            "messages": self._convert_messages(conversation),
+            "stream": stream,
+        }
+        if self.keep_alive is not None:
+            body["keep_alive"] = self.keep_alive
+        if self.options:
+            body["options"] = self.options
+        return body
+
+    def _check_status(self, response: httpx.Response) -> None:
+        if response.status_code >= 400:
+            try:
+                detail = response.json().get("error", response.text)
+            except ValueError:
+                detail = response.text
+            raise ModelError(f"Ollama returned {response.status_code}: {detail}")
+
+    @staticmethod
+    def _decode(text: str) -> Dict[str, Any]:
+        """Parse a JSON object from Ollama, raising ModelError for anything else (e.g. a proxy's HTML page)."""
+        try:
+            data = json.loads(text)
+        except ValueError as e:
+            raise ModelError(f"Invalid response from Ollama: {text[:200]!r}") from e
+        if not isinstance(data, dict):
+            raise ModelError(f"Invalid response from Ollama: {text[:200]!r}")
+        return data
+
+    def _create_message(self, data: Dict[str, Any], start: float) -> Message:
+        """
+        Create a Message from a /api/chat response, with usage and latencies in seconds.
+
+        load_latency and prompt_latency show whether the model had to be loaded
+        and how much of the prompt Ollama had to evaluate (little when the
+        conversation prefix was reused).
+        """
+        metadata = {
+            "model": data.get("model", self.model),
+            "prompt_tokens": data.get("prompt_eval_count"),
+            "completion_tokens": data.get("eval_count"),
+            "load_latency": _seconds(data.get("load_duration")),
+            "prompt_latency": _seconds(data.get("prompt_eval_duration")),
+            "network_latency": time.perf_counter() - start,
+        }
+        metadata = {name: value for name, value in metadata.items() if value is not None}
+        metadata["total_latency"] = metadata["network_latency"]
+        return Message(role=Role.AGENT, content=data.get("message", {}).get("content", ""), metadata=metadata)
+
+    def execute(self, conversation: Conversation) -> Message:
+        """
+        Execute the model on a conversation.
+
+        Args:
+            conversation: The core Conversation to process
+
+        Returns:
+            Message: The model's response with usage metadata
+
+        Raises:
+            ModelError: If the request fails or Ollama returns an error
+            InvalidConversationError: If the conversation is empty
+        """
+        body = self._build_request(conversation, stream=False)
+        start = time.perf_counter()
+        try:
+            response = self.client.post("/api/chat", json=body)
+        except httpx.HTTPError as e:
+            raise ModelError(f"Error during model execution: {str(e)}") from e
+        self._check_status(response)
+        return self._create_message(self._decode(response.text), start)
+
+    async def aexecute(self, conversation: Conversation) -> Message:
+        """Async variant of execute() using the shared async HTTP client."""
+        body = self._build_request(conversation, stream=False)
+        start = time.perf_counter()
+        try:
+            response = await self.async_client.post("/api/chat", json=body)
+        except httpx.HTTPError as e:
+            raise ModelError(f"Error during model execution: {str(e)}") from e
+        self._check_status(response)
+        return self._create_message(self._decode(response.text), start)
+
+    def stream(self, conversation: Conversation) -> Iterator[str]:
+        """
+        Execute the model, yielding content deltas as Ollama streams them.
+
+        Args:
+            conversation: The core Conversation to process
+
+        Yields:
+            str: Content deltas
+
+        Raises:
+            ModelError: If the request fails or Ollama reports an error mid-stream
+        """
+        body = self._build_request(conversation, stream=True)
+        try:
+            with self.client.stream("POST", "/api/chat", json=body) as response:
+                if response.status_code >= 400:
+                    response.read()
+                    self._check_status(response)
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    chunk = self._decode(line)
+                    if "error" in chunk:
+                        raise ModelError(f"Ollama error: {chunk['error']}")
+                    content = chunk.get("message", {}).get("content")
+                    if content:
+                        yield content
+                    if chunk.get("done"):
+                        break
+        except httpx.HTTPError as e:
+            raise ModelError(f"Error during model execution: {str(e)}") from e
@@ -1,8 +1,23 @@
 import os
-import openai
+import time
+from typing import Any, Dict, Iterator, List
 
-class OpenAIExecutor:
-    def __init__(self):
+from ..core.executor import ModelExecutor
+from ..core.types import Conversation, Message, Role
+from ..exceptions import ModelError, InvalidConversationError
+from ..core.tokens import response_usage
+from ..models.llm_models import key_fingerprint
+from .http_clients import ClientRegistry, get_client_registry
+
+class OpenAIExecutor(ModelExecutor):
+    def __init__(self, registry: ClientRegistry = None):
+        """
+        Initialize the executor from the OPENAI_* environment variables.
+
+        Args:
+            registry: ClientRegistry to take clients from (defaults to the
+                process-wide registry, so executors share connection pools)
+        """
         self.api_key = os.getenv("OPENAI_API_KEY")
         self.api_base = os.getenv("OPENAI_API_BASE")
         self.api_version = os.getenv("OPENAI_API_VERSION")
@@ -10,20 +25,136 @@ class OpenAIExecutor:
         if not self.api_key or not self.api_base or not self.deployment:
             raise ValueError("Missing required OpenAI environment variables")
         self.is_azure = "azure" in self.api_base
+        self.registry = registry if registry is not None else get_client_registry()
+        self.client = self.registry.openai_client(
+            self.api_key, self.api_base, self.api_version, azure=self.is_azure
+        )
+
+    @property
+    def async_client(self):
+        """Async OpenAI client for the running event loop, sharing this executor's endpoint."""
+        return self.registry.openai_client(
+            self.api_key, self.api_base, self.api_version, azure=self.is_azure, asynchronous=True
+        )
+
+    def identity(self) -> Dict[str, Any]:
+        """Describe the endpoint and deployment (API key fingerprinted)."""
+        return {
+            "executor": type(self).__name__,
+            "model": self.deployment,
+            "api_base": self.api_base,
+            "api_version": self.api_version,
+            "api_key": key_fingerprint(self.api_key),
+        }
+
+    def _convert_messages(self, conversation: Conversation) -> List[Dict[str, str]]:
+        """Convert core Message objects to OpenAI chat format."""
+        role_mapping = {
+            Role.AGENT: "assistant",
+            Role.CLIENT: "user",
+            Role.SYSTEM: "system"
+        }
+        return [
+            {"role": role_mapping.get(msg.role, "user"), "content": msg.content}
+            for msg in conversation.messages
+        ]
 
-        if self.is_azure:
-            self.client = openai.AzureOpenAI(
-                api_key=self.api_key,
-                api_version=self.api_version,
-                azure_endpoint=self.api_base
+    def _build_messages(self, conversation: Conversation) -> List[Dict[str, str]]:
+        if not conversation.messages:
+            raise InvalidConversationError("Conversation cannot be empty")
+        return self._convert_messages(conversation)
+
+    def _wrap_result(self, response: Any, start: float) -> Message:
+        metadata = response_usage(response)
+        metadata.setdefault("model", self.deployment)
+        metadata["network_latency"] = metadata["total_latency"] = time.perf_counter() - start
+        return Message(role=Role.AGENT, content=response.choices[0].message.content, metadata=metadata)
+
+    def execute(self, conversation: Conversation) -> Message:
+        """
+        Execute a chat completion.
+
+        Args:
+            conversation: The core Conversation to process
+
+        Returns:
+            The model's response Message, with usage and latency metadata
+        """
+        messages = self._build_messages(conversation)
+        start = time.perf_counter()
+        try:
+            response = self.client.chat.completions.create(
+                model=self.deployment,
+                messages=messages,
             )
-        else:
-            self.client = openai.OpenAI(api_key=self.api_key, base_url=self.api_base)
+        except Exception as e:
+            raise ModelError(f"Error during model execution: {str(e)}") from e
+        return self._wrap_result(response, start)
+
+    async def aexecute(self, conversation: Conversation) -> Message:
+        """
+        Asynchronously execute a chat completion using the async OpenAI client.
+
+        Args:
+            conversation: The core Conversation to process
 
-    def execute(self, prompt, role="user"):
-        messages = [{"role": role, "content": prompt}]
+        Returns:
+            The model's response Message, with usage and latency metadata
+        """
+        messages = self._build_messages(conversation)
+        start = time.perf_counter()
+        try:
+            response = await self.async_client.chat.completions.create(
+                model=self.deployment,
+                messages=messages,
+            )
+        except Exception as e:
+            raise ModelError(f"Error during model execution: {str(e)}") from e
+        return self._wrap_result(response, start)
+
+    def complete(self, prompt: str, role: str = "user") -> str:
+        """
+        Send a single prompt and return the response content.
+
+        Errors from the OpenAI client are raised as is.
+
+        Args:
+            prompt: The prompt text
+            role: The OpenAI role of the prompt message
+        """
         response = self.client.chat.completions.create(
             model=self.deployment,
-            messages=messages,
+            messages=[{"role": role, "content": prompt}],
+        )
+        return response.choices[0].message.content
+
+    async def acomplete(self, prompt: str, role: str = "user") -> str:
+        """Async variant of complete()."""
+        response = await self.async_client.chat.completions.create(
+            model=self.deployment,
+            messages=[{"role": role, "content": prompt}],
         )
         return response.choices[0].message.content
+
+    def stream(self, conversation: Conversation) -> Iterator[str]:
+        """
+        Execute a chat completion, yielding content deltas as they arrive.
+
+        Args:
+            conversation: The core Conversation to process
+
+        Yields:
+            str: Content deltas
+        """
+        messages = self._build_messages(conversation)
+        try:
+            response = self.client.chat.completions.create(
+                model=self.deployment,
+                messages=messages,
+                stream=True,
+            )
+            for chunk in response:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        except Exception as e:
+            raise ModelError(f"Error during model execution: {str(e)}") from e
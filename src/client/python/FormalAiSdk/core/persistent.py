@@ -0,0 +1,145 @@
+"""
+Persistent (immutable, structurally shared) sequence for FormalAI SDK.
+
+PersistentList is an append-only cons-list that grows at the tail. Appending
+returns a new list in O(1) that shares every existing node with the original,
+so deriving many conversations from a common history costs memory only for the
+new items.
+"""
+
+from collections.abc import Sequence
+from typing import Any, Iterable, Iterator, Optional, Tuple
+
+class _Node:
+    """A single item and a link to the list it was appended to."""
+    __slots__ = ("value", "parent", "length")
+
+    def __init__(self, value: Any, parent: Optional["_Node"]):
+        self.value = value
+        self.parent = parent
+        self.length = parent.length + 1 if parent is not None else 1
+
+class PersistentList(Sequence):
+    """
+    Immutable sequence with O(1) append and shared prefixes.
+
+    Length and access to the last item are O(1). Other indexing and iteration
+    materialize the items into a tuple once per list, which is then cached.
+
+    Example:
+        base = PersistentList(["a", "b"])
+        left = base.append("c")
+        right = base.append("d")   # shares "a" and "b" with left
+        assert list(left) == ["a", "b", "c"]
+        assert list(base) == ["a", "b"]
+    """
+    __slots__ = ("_node", "_items")
+
+    def __init__(self, items: Iterable = ()):
+        node = None
+        for item in items:
+            node = _Node(item, node)
+        self._node = node
+        self._items = None
+
+    @classmethod
+    def _from_node(cls, node: Optional[_Node]) -> "PersistentList":
+        result = cls.__new__(cls)
+        result._node = node
+        result._items = None
+        return result
+
+    def copy(self) -> "PersistentList":
+        """Return the same list as a new instance, in O(1), without this one's cached items."""
+        return self._from_node(self._node)
+
+    def append(self, item: Any) -> "PersistentList":
+        """Return a new list with item added at the end, sharing this list's nodes."""
+        return self._from_node(_Node(item, self._node))
+
+    def extend(self, items: Iterable) -> "PersistentList":
+        """Return a new list with items added at the end, sharing this list's nodes."""
+        node = self._node
+        for item in items:
+            node = _Node(item, node)
+        return self._from_node(node)
+
+    def drop_last(self) -> "PersistentList":
+        """Return the list without its last item, in O(1) (the list this one was appended to)."""
+        if self._node is None:
+            raise IndexError("drop_last from empty list")
+        return self._from_node(self._node.parent)
+
+    def tail(self, n: int) -> "PersistentList":
+        """
+        Return a new list holding the last n items.
+
+        Runs in O(n); the returned list does not keep the dropped prefix alive.
+        """
+        if n <= 0:
+            return PersistentList()
+        if n >= len(self):
+            return self
+        items = []
+        node = self._node
+        for _ in range(n):
+            items.append(node.value)
+            node = node.parent
+        items.reverse()
+        return PersistentList(items)
+
+    def shares_prefix(self, other: "PersistentList") -> int:
+        """
+        Return the length of the prefix shared node-for-node with other.
+
+        Runs in O(distance to the common ancestor), not O(length).
+        """
+        a, b = self._node, other._node
+        while a is not None and b is not None and a is not b:
+            if a.length >= b.length:
+                a = a.parent
+            else:
+                b = b.parent
+        return a.length if a is not None and a is b else 0
+
+    def _materialize(self) -> Tuple:
+        if self._items is None:
+            items = [None] * len(self)
+            node = self._node
+            while node is not None:
+                items[node.length - 1] = node.value
+                node = node.parent
+            self._items = tuple(items)
+        return self._items
+
+    def __len__(self) -> int:
+        return self._node.length if self._node is not None else 0
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self._materialize()[index])
+        if self._node is not None and (index == -1 or index == self._node.length - 1):
+            return self._node.value
+        return self._materialize()[index]
+
+    def __iter__(self) -> Iterator:
+        return iter(self._materialize())
+
+    def __reversed__(self) -> Iterator:
+        node = self._node
+        while node is not None:
+            yield node.value
+            node = node.parent
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, PersistentList):
+            if self._node is other._node:
+                return True
+        elif not isinstance(other, (list, tuple)):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"PersistentList({list(self._materialize())!r})"
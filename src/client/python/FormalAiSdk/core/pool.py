@@ -0,0 +1,339 @@
+"""
+Pooled executors for controlling concurrent AI usage.
+
+An ExecutorPool owns one lane per model configuration. Every lane has:
+- a bounded number of concurrent calls,
+- optional token buckets for requests-per-minute and tokens-per-minute,
+- a FIFO wait queue so callers are served in arrival order,
+- queue-depth and wait-time metrics.
+
+All PooledExecutor instances created for the same configuration share the
+lane, so sessions spread across a process stay under one provider quota.
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, replace
+from typing import Callable, Dict, Iterator, Optional, Tuple
+
+from .executor import ModelExecutor
+from .tokens import estimate_tokens
+from .types import Conversation, Message
+from ..models.llm_models import LlmModels
+
+@dataclass(frozen=True)
+class PoolLimits:
+    """
+    Limits applied to a single model lane.
+
+    Attributes:
+        max_concurrency: Maximum number of calls in flight at once
+        requests_per_minute: Optional request rate limit
+        tokens_per_minute: Optional prompt token rate limit
+    """
+    max_concurrency: int = 4
+    requests_per_minute: Optional[float] = None
+    tokens_per_minute: Optional[float] = None
+
+    def __post_init__(self):
+        if self.max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        for name in ("requests_per_minute", "tokens_per_minute"):
+            value = getattr(self, name)
+            if value is not None and value <= 0:
+                raise ValueError(f"{name} must be positive")
+
+@dataclass
+class PoolMetrics:
+    """
+    Usage metrics for a single model lane.
+
+    Attributes:
+        queue_depth: Callers currently waiting for a slot
+        max_queue_depth: Highest queue depth observed
+        in_flight: Calls currently holding a slot
+        completed: Calls that have released their slot
+        total_wait: Total seconds callers spent queued or rate limited
+        max_wait: Longest single wait in seconds
+    """
+    queue_depth: int = 0
+    max_queue_depth: int = 0
+    in_flight: int = 0
+    completed: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+
+    @property
+    def average_wait(self) -> float:
+        """Mean wait in seconds over all calls that acquired a slot."""
+        acquired = self.completed + self.in_flight
+        return self.total_wait / acquired if acquired else 0.0
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at a per-minute rate.
+
+    reserve() always succeeds and may leave the bucket in debt; the return
+    value is how long the caller must wait before its reservation is covered.
+    Reserving in queue order therefore keeps rate limiting fair.
+    """
+    def __init__(self, per_minute: float, capacity: float = None, clock: Callable[[], float] = time.monotonic):
+        self.rate = per_minute / 60.0
+        self.capacity = capacity if capacity is not None else per_minute
+        self._clock = clock
+        self._level = self.capacity
+        self._updated = clock()
+
+    def reserve(self, amount: float) -> float:
+        """
+        Take amount tokens from the bucket.
+
+        Returns:
+            Seconds until the bucket balance is non-negative again
+        """
+        now = self._clock()
+        self._level = min(self.capacity, self._level + (now - self._updated) * self.rate)
+        self._updated = now
+        self._level -= amount
+        return 0.0 if self._level >= 0 else -self._level / self.rate
+
+class _Waiter:
+    """A queued caller, woken either through a threading.Event or an asyncio future."""
+    __slots__ = ("event", "loop", "future", "granted")
+
+    def __init__(self, event=None, loop=None, future=None):
+        self.event = event
+        self.loop = loop
+        self.future = future
+        self.granted = False
+
+    def wake(self) -> None:
+        self.granted = True
+        if self.event is not None:
+            self.event.set()
+        else:
+            self.loop.call_soon_threadsafe(_resolve, self.future)
+
+def _resolve(future: "asyncio.Future") -> None:
+    if not future.done():
+        future.set_result(None)
+
+class _Lane:
+    """Concurrency slots, rate limits and FIFO queue for one model configuration."""
+    def __init__(self, limits: PoolLimits, clock: Callable[[], float] = time.monotonic):
+        self.limits = limits
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._waiters = deque()
+        self._metrics = PoolMetrics()
+        self._requests = TokenBucket(limits.requests_per_minute, clock=clock) if limits.requests_per_minute else None
+        self._tokens = TokenBucket(limits.tokens_per_minute, clock=clock) if limits.tokens_per_minute else None
+
+    def _enter_or_enqueue(self, waiter: _Waiter) -> bool:
+        """Take a free slot (True) or join the queue (False). Caller holds the lock."""
+        if not self._waiters and self._metrics.in_flight < self.limits.max_concurrency:
+            self._metrics.in_flight += 1
+            return True
+        self._waiters.append(waiter)
+        self._metrics.queue_depth += 1
+        self._metrics.max_queue_depth = max(self._metrics.max_queue_depth, self._metrics.queue_depth)
+        return False
+
+    def _reserve(self, tokens: int) -> float:
+        with self._lock:
+            delay = 0.0
+            if self._requests is not None:
+                delay = self._requests.reserve(1)
+            if self._tokens is not None:
+                delay = max(delay, self._tokens.reserve(tokens))
+            return delay
+
+    def _record_wait(self, wait: float) -> None:
+        with self._lock:
+            self._metrics.total_wait += wait
+            self._metrics.max_wait = max(self._metrics.max_wait, wait)
+
+    def acquire(self, tokens: int) -> float:
+        """Block until a slot and rate budget are available. Returns seconds waited."""
+        start = self._clock()
+        waiter = _Waiter(event=threading.Event())
+        with self._lock:
+            entered = self._enter_or_enqueue(waiter)
+        if not entered:
+            waiter.event.wait()
+        delay = self._reserve(tokens)
+        if delay > 0:
+            time.sleep(delay)
+        wait = self._clock() - start
+        self._record_wait(wait)
+        return wait
+
+    async def acquire_async(self, tokens: int) -> float:
+        """Await a slot and rate budget without blocking the event loop."""
+        start = self._clock()
+        loop = asyncio.get_running_loop()
+        waiter = _Waiter(loop=loop, future=loop.create_future())
+        with self._lock:
+            entered = self._enter_or_enqueue(waiter)
+        if not entered:
+            try:
+                await waiter.future
+            except asyncio.CancelledError:
+                with self._lock:
+                    if not waiter.granted:
+                        self._waiters.remove(waiter)
+                        self._metrics.queue_depth -= 1
+                        raise
+                # The slot was handed over just before cancellation, pass it on
+                self.release(completed=False)
+                raise
+        delay = self._reserve(tokens)
+        if delay > 0:
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                self.release(completed=False)
+                raise
+        wait = self._clock() - start
+        self._record_wait(wait)
+        return wait
+
+    def release(self, completed: bool = True) -> None:
+        """Free a slot, handing it directly to the oldest waiter if there is one."""
+        with self._lock:
+            if completed:
+                self._metrics.completed += 1
+            if self._waiters:
+                waiter = self._waiters.popleft()
+                self._metrics.queue_depth -= 1
+                waiter.wake()
+            else:
+                self._metrics.in_flight -= 1
+
+    def metrics(self) -> PoolMetrics:
+        with self._lock:
+            return replace(self._metrics)
+
+class PooledExecutor(ModelExecutor):
+    """
+    ModelExecutor that runs every call through its pool lane.
+
+    Attributes:
+        executor: The wrapped ModelExecutor
+        key: The normalized model configuration key of the lane
+    """
+    def __init__(self, executor: ModelExecutor, lane: _Lane, key: Tuple):
+        self.executor = executor
+        self.key = key
+        self._lane = lane
+
+    def identity(self):
+        """Pooling does not change responses, so report the wrapped executor's identity."""
+        return self.executor.identity()
+
+    def _with_queue_latency(self, response: Message, wait: float, start: float) -> Message:
+        """Add the time spent waiting in the lane to the response metadata."""
+        metadata = dict(response.metadata)
+        metadata["queue_latency"] = wait
+        metadata["total_latency"] = time.perf_counter() - start
+        return Message(response.role, response.content, metadata)
+
+    def execute(self, conversation: Conversation) -> Message:
+        """Wait for a slot in the lane, then execute the wrapped executor."""
+        start = time.perf_counter()
+        wait = self._lane.acquire(estimate_tokens(conversation))
+        try:
+            response = self.executor.execute(conversation)
+        finally:
+            self._lane.release()
+        return self._with_queue_latency(response, wait, start)
+
+    async def aexecute(self, conversation: Conversation) -> Message:
+        """Await a slot in the lane, then await the wrapped executor."""
+        start = time.perf_counter()
+        wait = await self._lane.acquire_async(estimate_tokens(conversation))
+        try:
+            response = await self.executor.aexecute(conversation)
+        finally:
+            self._lane.release()
+        return self._with_queue_latency(response, wait, start)
+
+    def stream(self, conversation: Conversation) -> Iterator[str]:
+        """Wait for a slot in the lane and hold it until the wrapped stream ends or is closed."""
+        self._lane.acquire(estimate_tokens(conversation))
+        try:
+            yield from self.executor.stream(conversation)
+        finally:
+            self._lane.release()
+
+class ExecutorPool:
+    """
+    Process-wide pool of executors with per-model limits.
+
+    Example:
+        pool = ExecutorPool(PoolLimits(max_concurrency=8, requests_per_minute=500))
+        config = LlmModels.FromOpenAi()
+        session = ModelSession("user", model_config=config, pool=pool)
+        print(pool.metrics(config).average_wait)
+    """
+    def __init__(self, default_limits: PoolLimits = None):
+        """
+        Args:
+            default_limits: Limits for lanes registered without explicit limits
+        """
+        self.default_limits = default_limits or PoolLimits()
+        self._lock = threading.Lock()
+        self._lanes: Dict[Tuple, _Lane] = {}
+
+    def configure(self, model_config: dict, limits: PoolLimits) -> None:
+        """
+        Set the limits for a model configuration.
+
+        Raises:
+            ValueError: If the configuration's lane is already in use
+        """
+        key = LlmModels.Key(model_config)
+        with self._lock:
+            if key in self._lanes:
+                raise ValueError("Limits must be configured before the model is first used")
+            self._lanes[key] = _Lane(limits)
+
+    def executor(self, model_config: dict, executor: ModelExecutor = None) -> PooledExecutor:
+        """
+        Get a pooled executor for a model configuration.
+
+        Args:
+            model_config: Unified model configuration dict
+            executor: Optional executor to wrap; by default the shared
+                executor from LlmModels.Executor is used
+
+        Returns:
+            PooledExecutor sharing the configuration's lane
+        """
+        key = LlmModels.Key(model_config)
+        with self._lock:
+            lane = self._lanes.get(key)
+            if lane is None:
+                lane = self._lanes[key] = _Lane(self.default_limits)
+        if executor is None:
+            executor = LlmModels.Executor(model_config)
+        return PooledExecutor(executor, lane, key)
+
+    def metrics(self, model_config: dict = None):
+        """
+        Get metrics snapshots.
+
+        Args:
+            model_config: Optional configuration to report on
+
+        Returns:
+            PoolMetrics for the configuration, or a dict of key to PoolMetrics for all lanes
+        """
+        with self._lock:
+            lanes = dict(self._lanes)
+        if model_config is not None:
+            lane = lanes.get(LlmModels.Key(model_config))
+            return lane.metrics() if lane is not None else PoolMetrics()
+        return {key: lane.metrics() for key, lane in lanes.items()}
@@ -0,0 +1,262 @@
+"""
+Record/replay executor for deterministic offline runs.
+
+A ReplayExecutor records the responses of a live executor into a JSON
+cassette keyed by request hash, and replays them later without a network or
+model. Repeated identical requests are recorded in order and replayed in the
+same order. Replay can simulate latency by sampling the recorded latencies,
+so SDK and interpreter overhead can be benchmarked reproducibly.
+
+Recording appends each interaction to a JSON lines journal next to the
+cassette, so it costs O(1) however many interactions were recorded. The
+journal is folded into the cassette by close(), when the executor is
+garbage collected, or at interpreter exit; a journal left behind by a crash
+is picked up the next time the cassette is opened.
+"""
+
+import asyncio
+import json
+import os
+import random
+import threading
+import time
+import weakref
+from typing import Any, Dict, Iterator, List, Optional
+
+from .executor import ModelExecutor
+from .request_key import identity_request_key
+from .types import Conversation, Message, Role
+from ..exceptions import CassetteMissError
+
+CASSETTE_VERSION = 1
+
+# Keys only depend on the conversation, so a cassette can be replayed without
+# the executor that recorded it. Use one cassette per model setup.
+_CASSETTE_IDENTITY = {"executor": "ReplayExecutor", "version": CASSETTE_VERSION}
+
+class _CassetteWriter:
+    """Appends recorded interactions to the journal and folds them into the cassette."""
+    def __init__(self, path: str, interactions: Dict[str, List[Dict[str, Any]]]):
+        self.path = path
+        self.journal_path = f"{path}.journal"
+        self.interactions = interactions
+        self._journal = None
+
+    def append(self, key: str, entry: Dict[str, Any]) -> None:
+        if self._journal is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._journal = open(self.journal_path, "a", encoding="utf-8")
+        self._journal.write(json.dumps({"key": key, "entry": entry}, sort_keys=True, default=str) + "\n")
+        self._journal.flush()
+
+    def close(self) -> None:
+        """Write the cassette atomically and remove the journal, if anything was journaled."""
+        if self._journal is None and not os.path.exists(self.journal_path):
+            return
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": CASSETTE_VERSION, "interactions": self.interactions}, f, indent=1, sort_keys=True, default=str)
+        os.replace(temp_path, self.path)
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+        if os.path.exists(self.journal_path):
+            os.remove(self.journal_path)
+
+class ReplayExecutor(ModelExecutor):
+    """
+    ModelExecutor that records to and replays from a cassette file.
+
+    Modes:
+        "replay": Only replay; unrecorded requests raise CassetteMissError
+        "record": Always call the wrapped executor and record the response
+        "auto": Replay recorded requests and record the others
+
+    Replayed responses carry the recorded metadata plus metadata["replayed"].
+
+    Example:
+        # Record once against a live model
+        executor = ReplayExecutor("cassettes/git.json", LlmModels.Executor(config), mode="record")
+        ...
+        executor.close()
+        # Replay in CI with realistic latency
+        executor = ReplayExecutor("cassettes/git.json", simulate_latency=True, seed=1)
+    """
+    def __init__(
+        self,
+        path: str,
+        executor: Optional[ModelExecutor] = None,
+        mode: str = "auto",
+        simulate_latency: bool = False,
+        latency_scale: float = 1.0,
+        seed: Optional[int] = None,
+    ):
+        """
+        Args:
+            path: Cassette file (written by close() after recording)
+            executor: Live executor used for recording (not needed for "replay")
+            mode: "replay", "record" or "auto"
+            simulate_latency: Sleep for a latency sampled from the cassette's
+                recorded latencies before returning a replayed response
+            latency_scale: Factor applied to simulated latencies
+            seed: Seed for latency sampling, for reproducible runs
+
+        Raises:
+            ValueError: If the mode is unknown, or recording without an executor
+        """
+        if mode not in ("replay", "record", "auto"):
+            raise ValueError(f"Unknown replay mode: {mode}")
+        if mode == "record" and executor is None:
+            raise ValueError("Recording needs an executor")
+        self.path = path
+        self.executor = executor
+        self.mode = mode
+        self.simulate_latency = simulate_latency
+        self.latency_scale = latency_scale
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._interactions: Dict[str, List[Dict[str, Any]]] = {}
+        self._positions: Dict[str, int] = {}
+        # Every recorded latency, kept alongside the interactions for O(1) sampling
+        self._latencies: List[float] = []
+        if os.path.exists(path):
+            self._load()
+        self._writer = _CassetteWriter(path, self._interactions)
+        if os.path.exists(self._writer.journal_path):
+            self._load_journal()
+        self._finalizer = weakref.finalize(self, self._writer.close)
+
+    def identity(self) -> Dict[str, Any]:
+        """Replay the wrapped executor's identity while recording, the cassette's otherwise."""
+        if self.executor is not None:
+            return self.executor.identity()
+        return {"executor": type(self).__name__, "cassette": os.path.abspath(self.path)}
+
+    def _load(self) -> None:
+        with open(self.path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != CASSETTE_VERSION:
+            raise ValueError(f"Unsupported cassette version in {self.path}: {data.get('version')}")
+        self._interactions = data["interactions"]
+        self._latencies = [entry["latency"] for entries in self._interactions.values() for entry in entries]
+
+    def _load_journal(self) -> None:
+        """Add interactions journaled but not yet folded into the cassette."""
+        with open(self._writer.journal_path, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.endswith("\n"):
+                    break  # cut off by a crash mid-write
+                record = json.loads(line)
+                self._interactions.setdefault(record["key"], []).append(record["entry"])
+                self._latencies.append(record["entry"]["latency"])
+
+    def close(self) -> None:
+        """Fold the recorded interactions into the cassette file."""
+        with self._lock:
+            self._writer.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(entries) for entries in self._interactions.values())
+
+    def latencies(self) -> List[float]:
+        """All recorded latencies in seconds."""
+        with self._lock:
+            return list(self._latencies)
+
+    def _next(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the next recorded interaction for a key, cycling through repeats."""
+        with self._lock:
+            entries = self._interactions.get(key)
+            if not entries:
+                return None
+            position = self._positions.get(key, 0)
+            self._positions[key] = position + 1
+            return entries[position % len(entries)]
+
+    def _record(self, key: str, conversation: Conversation, entry: Dict[str, Any]) -> None:
+        entry["request"] = [[msg.role.name, msg.content] for msg in conversation.messages]
+        with self._lock:
+            self._interactions.setdefault(key, []).append(entry)
+            self._latencies.append(entry["latency"])
+            self._writer.append(key, entry)
+
+    def _lookup(self, conversation: Conversation):
+        """Return (key, recorded interaction or None), raising in replay mode on a miss."""
+        key = identity_request_key(_CASSETTE_IDENTITY, conversation)
+        entry = None if self.mode == "record" else self._next(key)
+        if entry is None and (self.mode == "replay" or self.executor is None):
+            raise CassetteMissError(f"No recorded response in {self.path} for request {key[:12]}")
+        return key, entry
+
+    def _replay_delay(self) -> float:
+        if not self.simulate_latency:
+            return 0.0
+        with self._lock:
+            latency = self._random.choice(self._latencies) if self._latencies else 0.0
+        return latency * self.latency_scale
+
+    def _replayed(self, entry: Dict[str, Any]) -> Message:
+        response = entry["response"]
+        return Message(Role[response["role"]], response["content"], {**response["metadata"], "replayed": True})
+
+    @staticmethod
+    def _entry(response: Message, latency: float) -> Dict[str, Any]:
+        return {
+            "response": {"role": response.role.name, "content": response.content, "metadata": response.metadata},
+            "latency": latency,
+        }
+
+    def execute(self, conversation: Conversation) -> Message:
+        """
+        Replay the recorded response, or execute and record it.
+
+        Raises:
+            CassetteMissError: If the request was not recorded and cannot be recorded
+        """
+        key, entry = self._lookup(conversation)
+        if entry is not None:
+            delay = self._replay_delay()
+            if delay > 0:
+                time.sleep(delay)
+            return self._replayed(entry)
+        start = time.perf_counter()
+        response = self.executor.execute(conversation)
+        self._record(key, conversation, self._entry(response, time.perf_counter() - start))
+        return response
+
+    async def aexecute(self, conversation: Conversation) -> Message:
+        """Async variant of execute(); simulated latency does not block the event loop."""
+        key, entry = self._lookup(conversation)
+        if entry is not None:
+            delay = self._replay_delay()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            return self._replayed(entry)
+        start = time.perf_counter()
+        response = await self.executor.aexecute(conversation)
+        self._record(key, conversation, self._entry(response, time.perf_counter() - start))
+        return response
+
+    def stream(self, conversation: Conversation) -> Iterator[str]:
+        """
+        Replay recorded deltas, or stream from the wrapped executor and record them.
+
+        Responses recorded with execute() are replayed as a single delta.
+        Simulated latency is spent before the first delta.
+        """
+        key, entry = self._lookup(conversation)
+        if entry is not None:
+            delay = self._replay_delay()
+            if delay > 0:
+                time.sleep(delay)
+            yield from entry.get("chunks") or [entry["response"]["content"]]
+            return
+        start = time.perf_counter()
+        chunks = []
+        for delta in self.executor.stream(conversation):
+            chunks.append(delta)
+            yield delta
+        entry = self._entry(Message(Role.AGENT, "".join(chunks)), time.perf_counter() - start)
+        entry["chunks"] = chunks
+        self._record(key, conversation, entry)
@@ -0,0 +1,46 @@
+"""
+Canonical request keys for FormalAI SDK executors.
+
+A request key is a hash of everything that determines a model response: the
+executor identity (model, provider, request options) and the normalized
+conversation. Equal keys mean the requests are interchangeable, which is what
+caching, deduplication and record/replay rely on.
+"""
+
+import hashlib
+import json
+from typing import Any, Dict
+
+from .executor import ModelExecutor
+from .types import Conversation
+
+def normalize_content(content: str) -> str:
+    """Normalize message content so insignificant whitespace differences share a key."""
+    return content.replace("\r\n", "\n").strip()
+
+def request_key(executor: ModelExecutor, conversation: Conversation) -> str:
+    """
+    Build the canonical key for executing a conversation with an executor.
+
+    Args:
+        executor: The executor that would run the request
+        conversation: The conversation to execute
+
+    Returns:
+        str: Hex SHA-256 digest of the canonical request
+    """
+    return identity_request_key(executor.identity(), conversation)
+
+def identity_request_key(identity: Dict[str, Any], conversation: Conversation) -> str:
+    """
+    Build the canonical key for a conversation and an explicit executor identity.
+
+    Useful when the executor that produced a response is not available, such
+    as when replaying recorded responses.
+    """
+    payload = {
+        "executor": identity,
+        "messages": [[msg.role.name, normalize_content(msg.content)] for msg in conversation.messages],
+    }
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
@@ -0,0 +1,88 @@
+"""
+Token counting helpers for FormalAI SDK.
+"""
+
+import functools
+from typing import Callable, Optional
+
+from .types import Conversation
+
+try:
+    import tiktoken
+except ImportError:  # optional: fall back to a character-based estimate
+    tiktoken = None
+
+# Tokens the chat format adds around every message (role and separators)
+MESSAGE_OVERHEAD = 4
+
+def _estimate_text_tokens(text: str) -> int:
+    return len(text) // 4
+
+@functools.lru_cache(maxsize=None)
+def get_tokenizer(model: Optional[str] = None) -> Callable[[str], int]:
+    """
+    Get a token counter for a model, cached per model name.
+
+    Uses tiktoken when it is installed and knows the model (provider prefixes
+    such as "azure/" are ignored), cl100k_base for unknown models, and a
+    four-characters-per-token estimate when tiktoken is unavailable or cannot
+    load an encoding (tiktoken downloads encodings on first use, which fails
+    offline).
+
+    Args:
+        model: Model name, e.g. "gpt-4.1" or "azure/gpt-4o"
+
+    Returns:
+        Callable returning the number of tokens in a string
+    """
+    if tiktoken is None:
+        return _estimate_text_tokens
+    try:
+        try:
+            encoding = tiktoken.encoding_for_model(model.split("/")[-1]) if model else tiktoken.get_encoding("cl100k_base")
+        except KeyError:
+            encoding = tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        return _estimate_text_tokens
+    return lambda text: len(encoding.encode(text, disallowed_special=()))
+
+@functools.lru_cache(maxsize=16384)
+def count_message_tokens(content: str, model: Optional[str] = None) -> int:
+    """Tokens one message adds to a prompt, including MESSAGE_OVERHEAD. Cached per content."""
+    return get_tokenizer(model)(content) + MESSAGE_OVERHEAD
+
+def estimate_message_tokens(content: str) -> int:
+    """Rough token estimate for one message, including MESSAGE_OVERHEAD."""
+    return _estimate_text_tokens(content) + MESSAGE_OVERHEAD
+
+def estimate_tokens(conversation: Conversation) -> int:
+    """Rough token estimate for budgeting (about four characters per token)."""
+    return sum(estimate_message_tokens(msg.content) for msg in conversation.messages)
+
+def _field(obj, name):
+    """Read a field from a dict-like or attribute-style response object."""
+    if obj is None:
+        return None
+    if isinstance(obj, dict):
+        return obj.get(name)
+    return getattr(obj, name, None)
+
+def response_usage(response) -> dict:
+    """
+    Extract model id and token usage from an OpenAI-style completion response.
+
+    Works for plain dicts, LiteLLM ModelResponse and OpenAI SDK objects.
+
+    Returns:
+        dict: model, prompt_tokens, completion_tokens, total_tokens and
+            cached_tokens, omitting anything the response does not report
+    """
+    usage = _field(response, "usage")
+    values = {
+        "model": _field(response, "model"),
+        "prompt_tokens": _field(usage, "prompt_tokens"),
+        "completion_tokens": _field(usage, "completion_tokens"),
+        "total_tokens": _field(usage, "total_tokens"),
+        "cached_tokens": _field(_field(usage, "prompt_tokens_details"), "cached_tokens"),
+    }
+    return {name: value for name, value in values.items() if value is not None}
@@ -2,9 +2,11 @@
 Core data structures for FormalAI SDK.
 """
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, FrozenInstanceError
 from enum import Enum, auto
-from typing import List, Dict
+from typing import Dict, Iterable
+
+from .persistent import PersistentList
 
 class Role(Enum):
     """Defines possible roles in a conversation."""
@@ -12,41 +14,76 @@ class Role(Enum):
     CLIENT = auto()  # For user messages
     SYSTEM = auto()  # For system instructions/context
 
-@dataclass(frozen=True)
 class Message:
     """
     Represents a single message in a conversation.
     
+    Messages are immutable and use __slots__, so they carry no per-instance
+    __dict__. Metadata is copied on construction but an empty metadata dict is
+    only allocated the first time it is accessed. The role is a reference to
+    the shared Role member, so it costs a single pointer per message.
+    
     Attributes:
         role: The role of the message sender (AGENT or CLIENT)
         content: The actual message content
         metadata: Optional metadata associated with the message
     """
-    role: Role
-    content: str
-    metadata: Dict = field(default_factory=dict)
+    __slots__ = ("role", "content", "_metadata")
 
-    def __post_init__(self):
-        # Create a deep copy of the metadata to ensure independence
-        # We need to use object.__setattr__ because the class is frozen
-        object.__setattr__(self, 'metadata', dict(self.metadata))
+    def __init__(self, role: Role, content: str, metadata: Dict = None):
+        # We need to use object.__setattr__ because the class is immutable.
+        # Copy the metadata to ensure independence from the caller's dict
+        object.__setattr__(self, 'role', role)
+        object.__setattr__(self, 'content', content)
+        object.__setattr__(self, '_metadata', dict(metadata) if metadata else None)
+
+    @property
+    def metadata(self) -> Dict:
+        """Metadata dict, allocated on first access when the message has none."""
+        if self._metadata is None:
+            object.__setattr__(self, '_metadata', {})
+        return self._metadata
+
+    def __setattr__(self, name, value):
+        raise FrozenInstanceError(f"cannot assign to field '{name}'")
+
+    def __delattr__(self, name):
+        raise FrozenInstanceError(f"cannot delete field '{name}'")
+
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return (self.role, self.content, self._metadata or {}) == (other.role, other.content, other._metadata or {})
+
+    def __hash__(self):
+        return hash((self.role, self.content))
+
+    def __reduce__(self):
+        return (Message, (self.role, self.content, self._metadata))
+
+    def __repr__(self):
+        return f"Message(role={self.role!r}, content={self.content!r}, metadata={self._metadata or {}!r})"
 
 @dataclass(frozen=True)
 class Conversation:
     """
     Represents a conversation consisting of a sequence of messages.
     
+    Messages are held in a PersistentList, so add_message() runs in O(1) and
+    conversations derived from a common history share that history's storage.
+    
     Attributes:
-        messages: List[Message] = A list of messages in the conversation. The list is immutable,
-                                but new messages can be added using add_message().
+        messages: PersistentList[Message] = An immutable sequence of messages in the conversation.
+                                New messages can be added using add_message().
     """
-    messages: List[Message] = field(default_factory=list)
+    messages: PersistentList = field(default_factory=PersistentList)
     
     def __post_init__(self):
-        # Create a new list for messages to ensure independence
-        messages_copy = list(self.messages)
-        # We need to use object.__setattr__ because the class is frozen
-        object.__setattr__(self, 'messages', messages_copy)
+        # Freeze the messages so the caller's list can't affect this conversation;
+        # an existing PersistentList is already immutable and is shared as-is
+        if not isinstance(self.messages, PersistentList):
+            # We need to use object.__setattr__ because the class is frozen
+            object.__setattr__(self, 'messages', PersistentList(self.messages))
     
     def add_message(self, role: Role, content: str) -> 'Conversation':
         """
@@ -64,6 +101,37 @@ class Conversation:
             conversation = conversation.add_message(Role.CLIENT, "Hello")
             conversation = conversation.add_message(Role.AGENT, "Hi there")
         """
-        new_messages = list(self.messages)
-        new_messages.append(Message(role=role, content=content))
-        return Conversation(messages=new_messages)
+        return self.append(Message(role=role, content=content))
+
+    def append(self, message: Message) -> 'Conversation':
+        """
+        Creates a new Conversation with an existing Message added, in O(1).
+        
+        Args:
+            message: The message to add, metadata included
+            
+        Returns:
+            A new Conversation instance sharing this conversation's messages
+        """
+        return Conversation(messages=self.messages.append(message))
+
+    def extend(self, messages: Iterable[Message]) -> 'Conversation':
+        """
+        Creates a new Conversation with several existing Messages added.
+        
+        Args:
+            messages: The messages to add, in order
+            
+        Returns:
+            A new Conversation instance sharing this conversation's messages
+        """
+        return Conversation(messages=self.messages.extend(messages))
+
+    def last(self, n: int) -> 'Conversation':
+        """
+        Creates a new Conversation holding only the last n messages, in O(n).
+        
+        Args:
+            n: Number of trailing messages to keep
+        """
+        return Conversation(messages=self.messages.tail(n))
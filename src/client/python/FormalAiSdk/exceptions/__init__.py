@@ -5,11 +5,15 @@ Exception classes for FormalAI SDK.
 from .base import (
     ExecutionError,
     ModelError,
-    InvalidConversationError
+    InvalidConversationError,
+    BudgetExceededError,
+    CassetteMissError
 )
 
 __all__ = [
     'ExecutionError',
     'ModelError',
-    'InvalidConversationError'
+    'InvalidConversationError',
+    'BudgetExceededError',
+    'CassetteMissError'
 ]
@@ -27,3 +27,17 @@ class InvalidConversationError(ExecutionError):
     - Malformed message content
     """
     pass
+
+class BudgetExceededError(ExecutionError):
+    """
+    Raised before a model call that would exceed a session's token budget.
+    
+    The call is not sent, so no tokens are spent on it.
+    """
+    pass
+
+class CassetteMissError(ExecutionError):
+    """
+    Raised by a ReplayExecutor in replay mode for a request that was never recorded.
+    """
+    pass
@@ -3,11 +3,25 @@ LlmModels: Unified entry points for model configuration.
 
 - LlmModels.FromOpenAi(openai_config=None): returns OpenAI config dict, using env defaults if not provided.
 - LlmModels.From(litellm_config=None): returns generic LiteLLM config dict, using env defaults if not provided.
+- LlmModels.Key(model_config): returns a hashable, secret-free key identifying a normalized config.
+- LlmModels.Executor(model_config): returns a shared executor for the config, created once per key.
 """
 
+import hashlib
+import json
 import os
+import threading
+
+def key_fingerprint(api_key):
+    """Return a short, non-reversible fingerprint of an API key (None if no key)."""
+    if not api_key:
+        return None
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
 
 class LlmModels:
+    _executors = {}
+    _executors_lock = threading.Lock()
+
     @staticmethod
     def FromOpenAi(openai_config=None):
         """
@@ -40,6 +54,9 @@ class LlmModels:
         Args:
             litellm_config (dict, optional): Explicit config. If not provided, uses env vars.
 
+        Ollama configs only take api_base from the config or OLLAMA_API_BASE,
+        never from the LiteLLM/OpenAI variables, which point at hosted endpoints.
+
         Returns:
             dict: Config dict with keys: provider, model, api_key, api_base, api_version, deployment (as available)
         """
@@ -48,7 +65,77 @@ class LlmModels:
         config.setdefault("provider", os.getenv("LITELLM_PROVIDER", "openai"))
         config.setdefault("model", os.getenv("LITELLM_MODEL", "gpt-4.1"))
         config.setdefault("api_key", os.getenv("LITELLM_API_KEY") or os.getenv("OPENAI_API_KEY"))
-        config.setdefault("api_base", os.getenv("LITELLM_API_BASE") or os.getenv("OPENAI_API_BASE"))
+        if str(config["provider"]).lower() == "ollama":
+            config.setdefault("api_base", os.getenv("OLLAMA_API_BASE"))
+        else:
+            config.setdefault("api_base", os.getenv("LITELLM_API_BASE") or os.getenv("OPENAI_API_BASE"))
         config.setdefault("api_version", os.getenv("LITELLM_API_VERSION") or os.getenv("OPENAI_API_VERSION"))
         config.setdefault("deployment", os.getenv("LITELLM_DEPLOYMENT") or os.getenv("AZURE_DEPLOYMENT_NAME"))
         return config
+
+    @staticmethod
+    def Key(model_config):
+        """
+        Build a hashable key identifying a model configuration.
+
+        Keys are normalized (provider lower-cased, unset values dropped) and never
+        contain the raw API key, only its fingerprint, so they are safe to log.
+
+        Args:
+            model_config (dict): Config dict as returned by FromOpenAi or From.
+
+        Returns:
+            tuple: Sorted (name, value) pairs
+        """
+        items = []
+        for name, value in model_config.items():
+            if value is None or value == "":
+                continue
+            if name == "provider":
+                value = str(value).lower()
+            elif name == "api_key":
+                value = key_fingerprint(value)
+            elif isinstance(value, (dict, list)):
+                value = json.dumps(value, sort_keys=True, default=str)
+            items.append((name, value))
+        return tuple(sorted(items))
+
+    @staticmethod
+    def Executor(model_config):
+        """
+        Get the shared executor for a model configuration.
+
+        Executors are memoized by LlmModels.Key, so every caller using an
+        equivalent config shares one warm executor. Executors keep their
+        credentials per instance and pass them per call, so differently-keyed
+        executors never interfere and a shared executor is safe to use from
+        multiple threads and tasks. Ollama configs get a native OllamaExecutor;
+        everything else goes through LiteLLM.
+
+        Args:
+            model_config (dict): Config dict as returned by FromOpenAi or From.
+
+        Returns:
+            ModelExecutor: The shared executor for the configuration
+        """
+        key = LlmModels.Key(model_config)
+        with LlmModels._executors_lock:
+            executor = LlmModels._executors.get(key)
+            if executor is None:
+                executor = LlmModels._executors[key] = LlmModels._CreateExecutor(dict(model_config))
+            return executor
+
+    @staticmethod
+    def _CreateExecutor(model_config):
+        """Create an executor for a config: native for Ollama, LiteLLM otherwise."""
+        if str(model_config.get("provider", "")).lower() == "ollama":
+            from ..core.ollama_executor import OllamaExecutor
+            return OllamaExecutor(model_config)
+        from ..core.litellm_executor import LiteLLMExecutor
+        return LiteLLMExecutor(model_config)
+
+    @staticmethod
+    def ClearExecutors():
+        """Forget all memoized executors (e.g. after rotating credentials)."""
+        with LlmModels._executors_lock:
+            LlmModels._executors.clear()
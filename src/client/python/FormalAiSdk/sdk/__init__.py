@@ -4,8 +4,14 @@ FormalAI SDK - High-level interfaces for AI model interaction.
 
 from .session import ModelSession
 from .fork import ModelFork
+from .session_log import SessionLog
+from .store import SessionStore
+from .columns import MessageColumns
 
 __all__ = [
     'ModelSession',
-    'ModelFork'
+    'ModelFork',
+    'SessionLog',
+    'SessionStore',
+    'MessageColumns'
 ]
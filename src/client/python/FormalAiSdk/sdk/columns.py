@@ -0,0 +1,128 @@
+"""
+Columnar storage for long message histories.
+
+MessageColumns keeps sdk Messages as columns instead of objects: actors are
+interned into an array of ids, timestamps are int64 nanoseconds, and all
+contents share one UTF-8 buffer indexed by offsets. Only non-empty metadata
+dicts are kept. A Message object is materialized when an item is accessed, so
+an archived transcript costs a few bytes per message plus its text, instead
+of several hundred bytes of object overhead.
+"""
+
+from array import array
+from collections.abc import Sequence
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Iterator, List
+
+from .types import Message
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+def _to_ns(timestamp: datetime) -> int:
+    # Exact for naive and aware datetimes alike; the timezone is not stored
+    return (timestamp.replace(tzinfo=None) - _EPOCH) // _MICROSECOND * 1000
+
+def _from_ns(ns: int) -> datetime:
+    return _EPOCH + timedelta(microseconds=ns // 1000)
+
+class MessageColumns(Sequence):
+    """
+    Append-only, columnar sequence of sdk Messages.
+
+    Items are materialized on access as new Message objects, so changing a
+    returned message does not change the stored one. Timestamps are kept to
+    the microsecond, without timezone.
+
+    Example:
+        columns = MessageColumns(session.messages)
+        print(len(columns), columns.nbytes, columns[-1].content)
+    """
+    def __init__(self, messages: Iterable[Message] = ()):
+        self._actor_ids: Dict[str, int] = {}
+        self._actor_names: List[str] = []
+        self._actors = array("I")
+        self._timestamps = array("q")
+        self._offsets = array("q", [0])
+        self._contents = bytearray()
+        self._metadata: Dict[int, Dict] = {}
+        self.extend(messages)
+
+    def _intern(self, actor: str) -> int:
+        actor_id = self._actor_ids.get(actor)
+        if actor_id is None:
+            actor_id = self._actor_ids[actor] = len(self._actor_names)
+            self._actor_names.append(actor)
+        return actor_id
+
+    def append(self, message: Message) -> None:
+        """Append a message, copying its fields into the columns."""
+        if message.metadata:
+            self._metadata[len(self._actors)] = dict(message.metadata)
+        self._actors.append(self._intern(message.actor))
+        self._timestamps.append(_to_ns(message.timestamp))
+        self._contents += message.content.encode("utf-8")
+        self._offsets.append(len(self._contents))
+
+    def extend(self, messages: Iterable[Message]) -> None:
+        for message in messages:
+            self.append(message)
+
+    def copy(self) -> "MessageColumns":
+        """Return an independent copy (the column buffers are copied, not re-encoded)."""
+        result = MessageColumns()
+        result._actor_ids = dict(self._actor_ids)
+        result._actor_names = list(self._actor_names)
+        result._actors = array("I", self._actors)
+        result._timestamps = array("q", self._timestamps)
+        result._offsets = array("q", self._offsets)
+        result._contents = bytearray(self._contents)
+        result._metadata = dict(self._metadata)
+        return result
+
+    def __len__(self) -> int:
+        return len(self._actors)
+
+    def _index(self, index: int) -> int:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("MessageColumns index out of range")
+        return index
+
+    def _materialize(self, index: int) -> Message:
+        metadata = self._metadata.get(index)
+        return Message(
+            actor=self._actor_names[self._actors[index]],
+            content=self._contents[self._offsets[index]:self._offsets[index + 1]].decode("utf-8"),
+            timestamp=_from_ns(self._timestamps[index]),
+            metadata=dict(metadata) if metadata else {},
+        )
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._materialize(i) for i in range(*index.indices(len(self)))]
+        return self._materialize(self._index(index))
+
+    def __iter__(self) -> Iterator[Message]:
+        for index in range(len(self)):
+            yield self._materialize(index)
+
+    def actor(self, index: int) -> str:
+        """The actor of one message, without materializing it."""
+        return self._actor_names[self._actors[self._index(index)]]
+
+    def content(self, index: int) -> str:
+        """The content of one message, without materializing it."""
+        index = self._index(index)
+        return self._contents[self._offsets[index]:self._offsets[index + 1]].decode("utf-8")
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate bytes held by the column buffers (metadata dicts not included)."""
+        return (
+            self._actors.itemsize * len(self._actors)
+            + self._timestamps.itemsize * len(self._timestamps)
+            + self._offsets.itemsize * len(self._offsets)
+            + len(self._contents)
+        )
@@ -0,0 +1,97 @@
+"""
+Sequence-ordered commits for concurrently answering forks.
+
+Every fork created by a session gets a sequence number. While forks are
+answering concurrently, from threads or asyncio tasks, each one waits before
+committing its response until every in-flight fork with a lower sequence
+number has committed or failed. The model calls themselves run unlocked.
+"""
+
+import asyncio
+import bisect
+import itertools
+import threading
+from typing import List, Tuple
+
+class CommitOrder:
+    """
+    Orders commits by sequence number among in-flight forks.
+
+    A fork that was created but has not started answering does not hold up
+    later forks; ordering applies to forks that are in flight together.
+
+    Example:
+        sequence = order.begin(fork.sequence)
+        try:
+            response = executor.execute(conversation)
+            order.wait(sequence)
+            commit(response)
+        finally:
+            order.finish(sequence)
+    """
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._counter = itertools.count()
+        self._pending: List[int] = []
+        self._async_waiters: List[Tuple[int, asyncio.AbstractEventLoop, "asyncio.Future"]] = []
+
+    def next(self) -> int:
+        """Allocate the next sequence number."""
+        with self._condition:
+            return next(self._counter)
+
+    def begin(self, sequence: int = None) -> int:
+        """
+        Mark a fork as in flight.
+
+        Args:
+            sequence: The fork's sequence number; None allocates a new one
+
+        Returns:
+            The sequence number to pass to wait() and finish()
+        """
+        with self._condition:
+            if sequence is None:
+                sequence = next(self._counter)
+            bisect.insort(self._pending, sequence)
+            return sequence
+
+    def _is_next(self, sequence: int) -> bool:
+        return self._pending[0] == sequence
+
+    def wait(self, sequence: int) -> None:
+        """Block until every in-flight fork with a lower sequence number has finished."""
+        with self._condition:
+            self._condition.wait_for(lambda: self._is_next(sequence))
+
+    async def wait_async(self, sequence: int) -> None:
+        """Async variant of wait(); does not block the event loop."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        with self._condition:
+            if self._is_next(sequence):
+                return
+            waiter = (sequence, loop, future)
+            self._async_waiters.append(waiter)
+        try:
+            await future
+        finally:
+            with self._condition:
+                if waiter in self._async_waiters:
+                    self._async_waiters.remove(waiter)
+
+    def finish(self, sequence: int) -> None:
+        """Mark a fork as no longer in flight, committed or not, and wake the next one."""
+        with self._condition:
+            self._pending.pop(bisect.bisect_left(self._pending, sequence))
+            self._condition.notify_all()
+            if not self._pending:
+                return
+            ready = [waiter for waiter in self._async_waiters if self._is_next(waiter[0])]
+            self._async_waiters = [waiter for waiter in self._async_waiters if not self._is_next(waiter[0])]
+        for _, loop, future in ready:
+            loop.call_soon_threadsafe(_resolve, future)
+
+def _resolve(future: "asyncio.Future") -> None:
+    if not future.done():
+        future.set_result(None)
@@ -2,9 +2,12 @@
 Fork management for the FormalAI SDK.
 """
 
-from typing import TYPE_CHECKING
+import time
+from typing import Iterator, Optional, TYPE_CHECKING
 from ..core.types import Message as CoreMessage, Role, Conversation as CoreConversation
 from ..core.executor import ModelExecutor
+from ..core.tokens import estimate_message_tokens
+from .types import HistoryWindow
 
 if TYPE_CHECKING:
     from .session import ModelSession
@@ -13,7 +16,7 @@ class ModelFork:
     """
     Handles isolated model execution for a conversation fork.
     """
-    def __init__(self, fork_id: str, from_actor: str, message: str, executor: ModelExecutor):
+    def __init__(self, fork_id: str, from_actor: str, message: str, executor: ModelExecutor, sequence: Optional[int] = None):
         """
         Initialize a new execution fork.
         
@@ -22,16 +25,54 @@ class ModelFork:
             from_actor: Actor whose message is being responded to
             message: The message to respond to
             executor: ModelExecutor instance to use for generating responses
+            sequence: Commit order among concurrently answering forks (assigned
+                by ModelSession.Fork; None takes the next number when answering)
         """
+        self.sequence = sequence
         self.fork_id = fork_id
         self.from_actor = from_actor
         self.message = message
         self.executor = executor
     
+    def _build_conversation(self, session: "ModelSession", history: CoreConversation = None) -> CoreConversation:
+        """
+        Get the session history with this fork's message appended.
+        
+        Args:
+            session: The trunk conversation the fork answers
+            history: Optional history snapshot to use instead of the session's current history
+        """
+        # Get existing conversation history from session
+        conversation = history if history is not None else session.get_conversation_history()
+        
+        # Add fork's message to existing conversation
+        return conversation.add_message(
+            Role.CLIENT if self.from_actor == session.actor else Role.AGENT,
+            self.message
+        )
+
+    def _check_budget(self, session: "ModelSession", window: HistoryWindow) -> None:
+        """Raise BudgetExceededError if the call would exceed the session's token budget."""
+        session.usage.check(window.tokens + estimate_message_tokens(self.message))
+
+    def _commit(self, session: "ModelSession", response: CoreMessage, window: HistoryWindow) -> None:
+        """Add the response, with its usage metadata, to the session and its accounting."""
+        metadata = response.metadata
+        if window.trimmed_tokens:
+            metadata = {**metadata, "trimmed_tokens": window.trimmed_tokens}
+        # Under the session lock, so a store spilling the session sees both or neither
+        with session._lock:
+            session._add_message(self.fork_id, response.content, metadata)
+            session.usage.record(self.fork_id, self.from_actor, metadata)
+        session._committed()
+
     def Answer(self, session: "ModelSession") -> None:
         """
         Execute the model and add its response to the session.
         
+        If other forks of the session are answering concurrently, the response
+        is added after those with a lower sequence number.
+        
         Args:
             session: The trunk conversation to add the response to
             
@@ -39,17 +80,103 @@ class ModelFork:
             fork = ModelFork("fork1", "user", "Hello", executor)
             fork.Answer(session)  # Executes model and adds response
         """
-        # Get existing conversation history from session
-        conversation = session.get_conversation_history()
+        window = session.get_history_window()
+        conversation = self._build_conversation(session, window.conversation)
+        self._check_budget(session, window)
         
-        # Add fork's message to existing conversation
-        conversation = conversation.add_message(
-            Role.CLIENT if self.from_actor == session.actor else Role.AGENT,
-            self.message
-        )
+        sequence = session._order.begin(self.sequence)
+        try:
+            # Execute model with single message
+            response: CoreMessage = self.executor.execute(conversation)
+            
+            # Add response to session under fork's ID, after earlier in-flight forks
+            session._order.wait(sequence)
+            self._commit(session, response, window)
+        finally:
+            session._order.finish(sequence)
+
+    async def AnswerAsync(self, session: "ModelSession") -> None:
+        """
+        Asynchronously execute the model and add its response to the session.
+        
+        Args:
+            session: The trunk conversation to add the response to
+            
+        Example:
+            fork = ModelFork("fork1", "user", "Hello", executor)
+            await fork.AnswerAsync(session)
+        """
+        window = session.get_history_window()
+        conversation = self._build_conversation(session, window.conversation)
+        self._check_budget(session, window)
+        
+        sequence = session._order.begin(self.sequence)
+        try:
+            response: CoreMessage = await self.executor.aexecute(conversation)
+            
+            await session._order.wait_async(sequence)
+            self._commit(session, response, window)
+        finally:
+            session._order.finish(sequence)
+
+    def AnswerStream(self, session: "ModelSession") -> Iterator[str]:
+        """
+        Stream the model's response into the session, yielding content deltas.
+        
+        The response message is added to the session before the first delta
+        and its content grows as deltas arrive. When the stream completes, the
+        message metadata records time_to_first_token and tokens_per_second
+        (in seconds and streamed chunks per second). If the stream fails, the
+        partial message is kept with metadata["incomplete"] set and the error
+        is re-raised. The message's place in the history is fixed when the
+        stream starts, so streams are not ordered by fork sequence.
+        
+        Args:
+            session: The trunk conversation to add the response to
+            
+        Yields:
+            str: Content deltas as the executor produces them
+            
+        Example:
+            fork = session.Fork("fork1", "user", "Hello")
+            for delta in fork.AnswerStream(session):
+                print(delta, end="", flush=True)
+        """
+        window = session.get_history_window()
+        conversation = self._build_conversation(session, window.conversation)
+        self._check_budget(session, window)
+        # Logged once the stream ends, when the content is complete
+        message = session._add_message(self.fork_id, "", persist=False)
+        if window.trimmed_tokens:
+            message.metadata["trimmed_tokens"] = window.trimmed_tokens
         
-        # Execute model with single message
-        response: CoreMessage = self.executor.execute(conversation)
+        start = time.perf_counter()
+        first_token = None
+        chunks = 0
+        try:
+            for delta in self.executor.stream(conversation):
+                if first_token is None:
+                    first_token = time.perf_counter()
+                chunks += 1
+                message.content += delta
+                yield delta
+        except BaseException:
+            with session._lock:
+                message.metadata["incomplete"] = True
+                session._persist(message)
+            raise
+        finally:
+            # The content grew in place; bring the session's core view up to date
+            session._refresh_message(message)
         
-        # Add response to session under fork's ID
-        session.add_response(self.fork_id, response.content)
+        end = time.perf_counter()
+        with session._lock:
+            message.metadata["completion_chunks"] = chunks
+            message.metadata["total_latency"] = end - start
+            if first_token is not None:
+                message.metadata["time_to_first_token"] = first_token - start
+                generation_time = end - first_token
+                message.metadata["tokens_per_second"] = chunks / generation_time if generation_time > 0 else None
+            session.usage.record(self.fork_id, self.from_actor, message.metadata)
+            session._persist(message)
+        session._committed()
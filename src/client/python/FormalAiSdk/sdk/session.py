@@ -2,17 +2,49 @@
 Session management for the FormalAI SDK.
 """
 
-from typing import List
-from ..core.types import Role, Conversation as CoreConversation
+import copy
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union, TYPE_CHECKING
+from ..core.types import Role, Conversation as CoreConversation, Message as CoreMessage
 from ..core.executor import ModelExecutor
-from .types import Message
+from ..core.persistent import PersistentList
+from ..core.tokens import count_message_tokens, estimate_message_tokens, estimate_tokens
+from .types import Message, ForkResult, HistoryWindow, Snapshot, SnapshotDiff
+from .usage import SessionUsage
 from .fork import ModelFork
+from .session_log import SessionLog
+from .commit_order import CommitOrder
+from .columns import MessageColumns
+
+if TYPE_CHECKING:
+    from ..core.pool import ExecutorPool
 
 class ModelSession:
     """
     Manages a trunk conversation.
+    
+    The history is a PersistentList, so branch() creates a child session in
+    O(1) that shares the parent's messages and appends independently. A core
+    Conversation view of the history is kept alongside it and extended on
+    every add_response, so building a prompt does not revisit old messages.
+    
+    Sessions are safe to share between threads and asyncio tasks: state
+    changes are made under a per-session lock (never held during a model
+    call), and forks answering concurrently commit their responses in the
+    order the forks were created (see CommitOrder).
     """
-    def __init__(self, actor: str, model_config: dict = None, executor: ModelExecutor = None):
+    def __init__(
+        self,
+        actor: str,
+        model_config: dict = None,
+        executor: ModelExecutor = None,
+        pool: "ExecutorPool" = None,
+        token_budget: int = None,
+        max_history_tokens: int = None,
+    ):
         """
         Initialize a new trunk conversation.
 
@@ -20,44 +52,511 @@ class ModelSession:
             actor: The actor who owns the trunk conversation
             model_config: Unified model configuration dict (from LlmModels.FromOpenAi or LlmModels.From)
             executor: Optional ModelExecutor for handling model responses (overrides model_config if provided)
+            pool: Optional ExecutorPool; model_config calls then share the pool's per-model limits
+            token_budget: Optional hard cap on total tokens; calls that would exceed it
+                raise BudgetExceededError before being sent
+            max_history_tokens: Optional token budget for the history sent with each fork;
+                older turns beyond it are dropped (see get_history_window)
         """
+        if max_history_tokens is not None and max_history_tokens < 0:
+            raise ValueError("max_history_tokens cannot be negative")
         self.actor = actor
-        self.messages: List[Message] = []
+        self._history = PersistentList()
+        self._core = CoreConversation()
+        self._core_tokens = 0
+        # Windowing caches: token counts by message id (with the message and the
+        # content they were counted for), and the system/pinned messages found
+        # in the last history scanned
+        self._token_counts: Dict[int, Tuple[Message, str, int]] = {}
+        self._token_counts_model: Optional[str] = None
+        self._pinned: Tuple[PersistentList, Tuple[Tuple[int, Message], ...]] = (PersistentList(), ())
+        self.parent: Optional["ModelSession"] = None
+        self._branch_point = 0
+        self._discarded = False
+        self.log: Optional[SessionLog] = None
+        # Set by a SessionStore while the session is spilled, to re-admit it on commit
+        self._on_commit: Optional[Callable[["ModelSession"], None]] = None
+        self._lock = threading.RLock()
+        self._order = CommitOrder()
+        self._snapshots_lock = threading.Lock()
+        self._snapshots: List[Snapshot] = []
+        self._snapshot_id: Optional[int] = None
+        self._archive = MessageColumns()
+        self._archive_shared = False
+        self.usage = SessionUsage(token_budget)
+        self.max_history_tokens = max_history_tokens
         self.model_config = model_config
         if executor is not None:
             self.executor = executor
+        elif pool is not None and isinstance(model_config, dict):
+            self.executor = pool.executor(model_config)
         elif model_config is not None:
-            from ..core.litellm_executor import LiteLLMExecutor
             # If model_config is already a ModelExecutor, use it directly
-            from ..core.executor import ModelExecutor
             if isinstance(model_config, ModelExecutor):
                 self.executor = model_config
             else:
-                self.executor = LiteLLMExecutor(model_config)
+                from ..models.llm_models import LlmModels
+                self.executor = LlmModels.Executor(model_config)
         else:
             self.executor = None
 
-    def get_conversation_history(self, include_last_n: int = None) -> CoreConversation:
+    @classmethod
+    def open(cls, path: str, actor: str, tail: int = None, sync: bool = False, **kwargs) -> "ModelSession":
         """
-        Get conversation history as a core Conversation object.
-        Optionally limit to last N messages.
+        Open a session backed by an append-only log, resuming it if the log exists.
+        
+        Only the last tail messages are loaded, so resuming costs O(tail)
+        however long the logged history is; the full history stays readable
+        through session.log. Messages added afterwards (including merged
+        branches) are appended to the log; assigning session.messages is not
+        logged.
+        
+        Args:
+            path: The log's data file (see SessionLog)
+            actor: The actor who owns the trunk conversation
+            tail: Number of logged messages to load; None loads all of them
+            sync: fsync the log after every append
+            **kwargs: Other ModelSession arguments (executor, model_config, ...)
+            
+        Example:
+            session = ModelSession.open("agent.jsonl", "user", tail=50, executor=executor)
+            session.Fork("fork1", "user", "Continue").Answer(session)
+            session.close()
+        """
+        session = cls(actor, **kwargs)
+        log = SessionLog(path, sync=sync)
+        session._history = PersistentList(log.read() if tail is None else log.tail(tail))
+        session._rebuild_core()
+        session.log = log
+        return session
+
+    def close(self) -> None:
+        """Close the session's log, if it has one."""
+        if self.log is not None:
+            self.log.close()
+
+    def _committed(self) -> None:
+        """Notify the store that spilled this session, if any, that it changed. Call without the lock."""
+        on_commit = self._on_commit
+        if on_commit is not None:
+            on_commit(self)
+
+    def _persist(self, message: Message) -> None:
+        with self._lock:
+            if self.log is not None:
+                self.log.append(message)
+
+    @property
+    def messages(self) -> PersistentList:
+        """The session history, oldest first. Read-only; use add_response to append."""
+        return self._history
+
+    @property
+    def estimated_tokens(self) -> int:
+        """Estimated tokens in the history, kept up to date in O(1) as messages are added."""
+        return self._core_tokens
+
+    @messages.setter
+    def messages(self, messages) -> None:
+        with self._lock:
+            self._history = messages if isinstance(messages, PersistentList) else PersistentList(messages)
+            self._rebuild_core()
+
+    def _core_message(self, msg: Message) -> CoreMessage:
+        return CoreMessage(self._core_role(msg), msg.content)
+
+    def _rebuild_core(self) -> None:
+        """Recreate the core view from the whole history, in O(n)."""
+        self._core = self._to_conversation(self._history)
+        self._core_tokens = sum(estimate_message_tokens(msg.content) for msg in self._history)
+
+    def _refresh_message(self, message: Message) -> None:
+        """
+        Update the core view after a message's content changed in place (streaming).
+        
+        O(1) when the message is still the newest one, O(n) otherwise.
+        """
+        with self._lock:
+            if not self._history or self._history[-1] is not message:
+                self._rebuild_core()
+            else:
+                previous = self._core.messages[-1]
+                self._core = CoreConversation(self._core.messages.drop_last().append(self._core_message(message)))
+                self._core_tokens += estimate_message_tokens(message.content) - estimate_message_tokens(previous.content)
+        self._committed()
+
+    def _check_open(self) -> None:
+        if self._discarded:
+            raise ValueError("This branch has been merged or discarded")
+
+    def branch(self) -> "ModelSession":
+        """
+        Create a child session that continues from this session's current history.
+        
+        Branching is O(1): the child shares every existing message with the
+        parent and appends its own messages independently, so neither sees the
+        other's new messages. The child shares the executor and the usage
+        accounting (and so the token budget) with the parent. Branches are not
+        logged; merging one logs its messages to the parent's log.
+        
+        Returns:
+            The child ModelSession
+            
+        Example:
+            attempts = [session.branch() for _ in range(3)]
+            for i, attempt in enumerate(attempts):
+                attempt.Fork(f"idea{i}", "user", "Try another approach").Answer(attempt)
+            session.merge(max(attempts, key=score))
+        """
+        with self._lock:
+            self._check_open()
+            child = copy.copy(self)
+        child.parent = self
+        child.log = None
+        child._on_commit = None
+        # The archive is copied on the next archive() of either session
+        self._archive_shared = child._archive_shared = True
+        child._lock = threading.RLock()
+        child._order = CommitOrder()
+        child._branch_point = len(child._history)
+        return child
+
+    def branch_messages(self) -> PersistentList:
+        """Messages added on this branch since it was created (the whole history for a root session)."""
+        return self._history.tail(len(self._history) - self._branch_point)
+
+    def merge(self, branch: "ModelSession") -> List[Message]:
+        """
+        Append a direct branch's new messages to this session and close the branch.
+        
+        If this session has not changed since the branch was created, the
+        branch's history is adopted as is in O(1).
+        
+        Args:
+            branch: A session created by this session's branch()
+            
+        Returns:
+            The messages that were appended
+            
+        Raises:
+            ValueError: If branch is not an open direct branch of this session
+        """
+        with self._lock, branch._lock:
+            self._check_open()
+            branch._check_open()
+            if branch.parent is not self:
+                raise ValueError("Only direct branches of this session can be merged")
+            added = branch.branch_messages()
+            if len(self._history) == branch._branch_point and self._history.shares_prefix(branch._history) == branch._branch_point:
+                self._history = branch._history
+                self._core = branch._core
+                self._core_tokens = branch._core_tokens
+            else:
+                for message in added:
+                    self._append(message)
+            if self.log is not None:
+                self.log.extend(added)
+            branch.discard()
+        self._committed()
+        return list(added)
+
+    @property
+    def archived(self) -> MessageColumns:
+        """Messages moved out of the history by archive(), oldest first."""
+        return self._archive
+
+    def archive(self, keep_last: int = 0) -> int:
+        """
+        Move all but the newest messages into columnar storage (see MessageColumns).
+        
+        Archived messages cost a few bytes each plus their text instead of
+        full Message objects, and are materialized again only when read
+        through session.archived. They are no longer part of session.messages,
+        the prompts sent by forks or new snapshots; memory held by earlier
+        snapshots is released once those snapshots are gone.
+        
+        Args:
+            keep_last: Number of newest messages to keep in the history
+            
+        Returns:
+            The number of messages archived
+            
+        Raises:
+            ValueError: If keep_last is negative or the session is a branch
+        """
+        if keep_last < 0:
+            raise ValueError("keep_last cannot be negative")
+        with self._lock:
+            self._check_open()
+            if self.parent is not None:
+                raise ValueError("Only root sessions can be archived")
+            count = max(len(self._history) - keep_last, 0)
+            if not count:
+                return 0
+            if self._archive_shared:
+                self._archive = self._archive.copy()
+                self._archive_shared = False
+            self._archive.extend(self._history[:count])
+            self._history = PersistentList(self._history[count:])
+            self._rebuild_core()
+            return count
+
+    def discard(self) -> None:
+        """Drop this branch's history; the session can no longer be used."""
+        with self._lock:
+            self._history = PersistentList()
+            self._core = CoreConversation()
+            self._core_tokens = 0
+            self._discarded = True
+
+    def snapshot(self, label: str = None) -> Snapshot:
         """
-        messages = self.messages
-        if include_last_n is not None:
-            messages = messages[-include_last_n:]
+        Save the current state so it can be checked out or diffed later.
         
+        Snapshots are O(1): they keep a copy of the persistent history, which
+        shares its nodes with the previous snapshot, so N snapshots of a
+        growing session cost memory only for the messages added between them.
+        The copies do not share the items cached by full reads of the history.
+        Branches share their parent's snapshot list. Content a stream is still
+        writing into is not frozen by a snapshot.
+        
+        Args:
+            label: Optional description of the state
+            
+        Returns:
+            The Snapshot, whose id can be passed to checkout()
+        """
+        with self._lock, self._snapshots_lock:
+            self._check_open()
+            snapshot = Snapshot(
+                id=len(self._snapshots),
+                messages=self._history.copy(),
+                conversation=CoreConversation(self._core.messages.copy()),
+                tokens=self._core_tokens,
+                label=label,
+                parent_id=self._snapshot_id,
+                archived=len(self._archive),
+            )
+            self._snapshots.append(snapshot)
+            self._snapshot_id = snapshot.id
+            return snapshot
+
+    @property
+    def snapshots(self) -> List[Snapshot]:
+        """All snapshots taken by this session and its branches, oldest first."""
+        with self._snapshots_lock:
+            return list(self._snapshots)
+
+    def _get_snapshot(self, snapshot: Union[Snapshot, int]) -> Snapshot:
+        with self._snapshots_lock:
+            return self._find_snapshot(snapshot)
+
+    def _find_snapshot(self, snapshot: Union[Snapshot, int]) -> Snapshot:
+        snapshot_id = snapshot.id if isinstance(snapshot, Snapshot) else snapshot
+        if not 0 <= snapshot_id < len(self._snapshots) or (
+            isinstance(snapshot, Snapshot) and self._snapshots[snapshot_id] is not snapshot
+        ):
+            raise ValueError(f"Unknown snapshot: {snapshot_id}")
+        return self._snapshots[snapshot_id]
+
+    def checkout(self, snapshot: Union[Snapshot, int]) -> None:
+        """
+        Restore the history saved in a snapshot, in O(1).
+        
+        Later messages are not lost: they stay in any snapshot that holds
+        them. A session log is not rewound; messages added after the checkout
+        are appended to it as usual.
+        
+        Args:
+            snapshot: A Snapshot of this session, or its id
+            
+        Raises:
+            ValueError: If the snapshot does not belong to this session, or
+                messages were archived since it was taken
+        """
+        snapshot = self._get_snapshot(snapshot)
+        with self._lock:
+            self._check_open()
+            if snapshot.archived != len(self._archive):
+                raise ValueError("Cannot check out a snapshot taken before messages were archived")
+            self._branch_point = min(self._branch_point, self._history.shares_prefix(snapshot.messages))
+            self._history = snapshot.messages.copy()
+            self._core = CoreConversation(snapshot.conversation.messages.copy())
+            self._core_tokens = snapshot.tokens
+            self._snapshot_id = snapshot.id
+
+    def diff(self, old: Union[Snapshot, int], new: Union[Snapshot, int] = None) -> SnapshotDiff:
+        """
+        Compare two snapshots, or a snapshot and the current history.
+        
+        Runs in O(messages that differ), since the shared prefix is found
+        through the shared history nodes.
+        
+        Args:
+            old: The first snapshot or its id
+            new: The second snapshot or its id; None compares with the current history
+            
+        Example:
+            before = session.snapshot("before tools")
+            ...
+            for message in session.diff(before).added:
+                print(message.actor, message.content)
+        """
+        old_messages = self._get_snapshot(old).messages
+        with self._lock:
+            current = self._history
+        new_messages = current if new is None else self._get_snapshot(new).messages
+        common = old_messages.shares_prefix(new_messages)
+        return SnapshotDiff(
+            common=common,
+            removed=list(old_messages.tail(len(old_messages) - common)),
+            added=list(new_messages.tail(len(new_messages) - common)),
+        )
+
+    def _core_role(self, msg: Message) -> Role:
+        """Map a session message's actor to its core role."""
+        if msg.actor == self.actor:
+            return Role.CLIENT
+        if msg.actor == "system":
+            return Role.SYSTEM
+        return Role.AGENT
+
+    def _to_conversation(self, messages: Sequence[Message]) -> CoreConversation:
         conversation = CoreConversation()
         for msg in messages:
-            # Map roles based on actor type
-            if msg.actor == self.actor:
-                role = Role.CLIENT
-            elif msg.actor == "system":
-                role = Role.SYSTEM
-            else:
-                role = Role.AGENT
-            conversation = conversation.add_message(role, msg.content)
+            conversation = conversation.append(self._core_message(msg))
         return conversation
 
+    def get_conversation_history(self, include_last_n: int = None, max_tokens: int = None) -> CoreConversation:
+        """
+        Get conversation history as a core Conversation object.
+        Optionally limit to last N messages and/or to a token budget.
+        
+        The full history and the last N messages come from the session's
+        incrementally maintained core view, without re-mapping old messages.
+        
+        Args:
+            include_last_n: Only consider the last N messages
+            max_tokens: Token budget, applied as in get_history_window
+        """
+        if max_tokens is not None:
+            messages = self._history
+            if include_last_n is not None:
+                messages = messages[-include_last_n:]
+            return self.get_history_window(max_tokens, messages).conversation
+        if include_last_n is None or include_last_n == 0:
+            return self._core
+        if include_last_n > 0:
+            return self._core.last(include_last_n)
+        return self._to_conversation(self._history[-include_last_n:])
+
+    @property
+    def tokenizer_model(self) -> Optional[str]:
+        """Model name used to pick the tokenizer for history budgeting."""
+        if isinstance(self.model_config, dict) and self.model_config.get("model"):
+            return self.model_config["model"]
+        if self.executor is not None:
+            return self.executor.identity().get("model")
+        return None
+
+    def get_history_window(self, max_tokens: int = None, messages: Sequence[Message] = None) -> HistoryWindow:
+        """
+        Fit the history to a token budget, keeping the turns that matter most.
+        
+        System messages, messages with metadata["pinned"] set and the newest
+        message are always kept. The remaining budget is filled with the newest
+        turns; everything older than the first turn that doesn't fit is dropped.
+        Tokens are counted with the session model's tokenizer (see tokenizer_model);
+        without a budget the whole history is kept and tokens is a rough estimate.
+        
+        The history is walked from the newest message and the walk stops at
+        the first turn that doesn't fit, so only kept messages are tokenized,
+        each once: counts are cached on the session. Dropped messages are not
+        tokenized, so trimmed_tokens is a rough estimate.
+        
+        Args:
+            max_tokens: Token budget (defaults to max_history_tokens; None keeps everything)
+            messages: Messages to fit (defaults to the whole session)
+            
+        Returns:
+            HistoryWindow with the kept history and how much was trimmed
+            
+        Example:
+            window = session.get_history_window(4000)
+            print(f"dropped {window.trimmed_messages} messages, {window.trimmed_tokens} tokens")
+        """
+        max_tokens = self.max_history_tokens if max_tokens is None else max_tokens
+        if messages is None:
+            with self._lock:
+                if max_tokens is None:
+                    return HistoryWindow(self._core, self._core_tokens)
+                history, core, estimate = self._history, self._core, self._core_tokens
+        else:
+            if max_tokens is None:
+                conversation = self._to_conversation(messages)
+                return HistoryWindow(conversation, estimate_tokens(conversation))
+            history = messages if isinstance(messages, PersistentList) else PersistentList(messages)
+            core = None
+            estimate = sum(estimate_message_tokens(msg.content) for msg in history)
+        if not history:
+            return HistoryWindow(CoreConversation(), 0)
+
+        model = self.tokenizer_model
+        cached = self._token_counts if self._token_counts_model == model else {}
+        counts: Dict[int, Tuple[Message, str, int]] = {}
+
+        def count(msg: Message) -> int:
+            entry = cached.get(id(msg))
+            if entry is None or entry[0] is not msg or entry[1] is not msg.content:
+                entry = (msg, msg.content, count_message_tokens(msg.content, model))
+            counts[id(msg)] = entry
+            return entry[2]
+
+        newest = len(history) - 1
+        pinned = self._pinned_messages(history)
+        pinned_positions = {position for position, _ in pinned}
+        tokens = count(history[-1]) + sum(count(msg) for position, msg in pinned if position != newest)
+        remaining = max_tokens - tokens
+        start = 0
+        for position, msg in zip(range(newest - 1, -1, -1), itertools.islice(reversed(history), 1, None)):
+            if position in pinned_positions:
+                continue
+            msg_tokens = count(msg)
+            if msg_tokens > remaining:
+                start = position + 1
+                break
+            remaining -= msg_tokens
+            tokens += msg_tokens
+        self._token_counts, self._token_counts_model = counts, model
+
+        if start == 0:
+            return HistoryWindow(core if core is not None else self._to_conversation(history), tokens)
+        kept = [msg for position, msg in pinned if position < start] + list(history.tail(len(history) - start))
+        return HistoryWindow(
+            self._to_conversation(kept),
+            tokens,
+            trimmed_tokens=max(estimate - sum(estimate_message_tokens(msg.content) for msg in kept), 0),
+            trimmed_messages=len(history) - len(kept),
+        )
+
+    def _pinned_messages(self, history: PersistentList) -> Tuple[Tuple[int, Message], ...]:
+        """
+        The system and pinned messages of history, with their positions.
+        
+        Only the messages after the prefix history shares with the previously
+        scanned history are scanned, so this is O(new messages) turn to turn.
+        """
+        scanned, pinned = self._pinned
+        shared = history.shares_prefix(scanned)
+        found = []
+        for position, msg in zip(range(len(history) - 1, shared - 1, -1), reversed(history)):
+            if msg.actor == "system" or msg.metadata.get("pinned"):
+                found.append((position, msg))
+        found.reverse()
+        pinned = tuple(entry for entry in pinned if entry[0] < shared) + tuple(found)
+        self._pinned = (history, pinned)
+        return pinned
+
     def Fork(self, fork_id: str, from_actor: str, message: str) -> ModelFork:
         """
         Create a new fork for model execution.
@@ -71,23 +570,106 @@ class ModelSession:
             A ModelFork instance configured to execute the response
             
         Raises:
-            ValueError: If no executor was provided to the session
+            ValueError: If no executor was provided to the session, or the branch was closed
         """
+        self._check_open()
         if not self.executor:
             raise ValueError("No executor available for fork creation")
             
-        return ModelFork(fork_id, from_actor, message, self.executor)
+        return ModelFork(fork_id, from_actor, message, self.executor, self._order.next())
 
-    def add_response(self, actor: str, content: str) -> None:
+    def run_forks(self, forks: Sequence[ModelFork], max_concurrency: int = 8) -> List[ForkResult]:
+        """
+        Run independent forks in parallel and add their responses to the session.
+        
+        All forks see the same history snapshot, taken before any of them runs.
+        Responses are appended in the order the forks are given, regardless of
+        which call finishes first, so the resulting trunk is deterministic.
+        
+        Args:
+            forks: The forks to run, in the order their responses should be appended
+            max_concurrency: Maximum number of executor calls in flight at once
+            
+        Returns:
+            A ForkResult per fork, in the same order, including per-fork latency
+            
+        Raises:
+            ValueError: If max_concurrency is less than 1
+            BudgetExceededError: If the batch would exceed the token budget (nothing is sent)
+            Exception: The first fork error (in fork order) is re-raised after
+                the successful responses have been appended
+            
+        Example:
+            forks = [session.Fork(f"todo{i}", "user", text) for i, text in enumerate(todos)]
+            results = session.run_forks(forks, max_concurrency=16)
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        if not forks:
+            return []
+
+        window = self.get_history_window()
+        conversations = [fork._build_conversation(self, window.conversation) for fork in forks]
+        # Check the whole batch up front so concurrent calls can't overshoot the budget
+        self.usage.check(sum(window.tokens + estimate_message_tokens(fork.message) for fork in forks))
+
+        def run(fork: ModelFork, conversation: CoreConversation) -> ForkResult:
+            start = time.perf_counter()
+            try:
+                response = fork.executor.execute(conversation)
+            except Exception as e:
+                return ForkResult(fork.fork_id, None, time.perf_counter() - start, e)
+            return ForkResult(fork.fork_id, response.content, time.perf_counter() - start, metadata=response.metadata)
+
+        sequences = [self._order.begin(fork.sequence) for fork in forks]
+        try:
+            with ThreadPoolExecutor(max_workers=min(max_concurrency, len(forks))) as pool:
+                results = list(pool.map(run, forks, conversations))
+
+            # The batch commits together, once in-flight forks created before it have committed
+            self._order.wait(min(sequences))
+            for fork, result in zip(forks, results):
+                if result.error is None:
+                    fork._commit(self, CoreMessage(Role.AGENT, result.content, result.metadata), window)
+        finally:
+            for sequence in sequences:
+                self._order.finish(sequence)
+
+        for result in results:
+            if result.error is not None:
+                raise result.error
+        return results
+
+    def add_response(self, actor: str, content: str, metadata: dict = None) -> Message:
         """
         Add a response to the trunk conversation.
         
         Args:
             actor: The actor providing the response
             content: The response content
+            metadata: Optional metadata to copy onto the message
+            
+        Returns:
+            The Message that was added
         """
-        message = Message(actor=actor, content=content)
-        self.messages.append(message)
+        message = self._add_message(actor, content, metadata)
+        self._committed()
+        return message
+
+    def _add_message(self, actor: str, content: str, metadata: dict = None, persist: bool = True) -> Message:
+        message = Message(actor=actor, content=content, metadata=dict(metadata) if metadata else {})
+        with self._lock:
+            self._check_open()
+            self._append(message)
+            if persist:
+                self._persist(message)
+        return message
+
+    def _append(self, message: Message) -> None:
+        """Append to the history and the core view, in O(1). Caller holds the lock."""
+        self._history = self._history.append(message)
+        self._core = self._core.append(self._core_message(message))
+        self._core_tokens += estimate_message_tokens(message.content)
 
     def to_core_conversation(self) -> CoreConversation:
         """
@@ -0,0 +1,179 @@
+"""
+Append-only on-disk log of session messages.
+
+A SessionLog stores sdk Message records as JSON lines in a data file and
+keeps a companion index file of fixed-width record offsets. The index is
+memory-mapped, so finding the last n records is O(1) and reading them is
+O(n), however long the log is. This is what lets ModelSession.open() resume
+a session with 100k+ turns by loading only its tail.
+
+Writes go to the data file first and to the index second. On open, index
+entries past the end of the data are dropped, unindexed records after the
+last indexed one are re-indexed, and a partially written record at the end
+is truncated, so a crash mid-append loses at most that record.
+"""
+
+import json
+import mmap
+import os
+import struct
+import threading
+from typing import Iterable, List, Optional
+
+from .types import Message
+
+_OFFSET = struct.Struct("<Q")
+
+class SessionLog:
+    """
+    Append-only message log with a memory-mapped offset index.
+
+    Metadata values that are not JSON serializable are stored as strings.
+
+    Example:
+        with SessionLog("agent.jsonl") as log:
+            log.append(Message("user", "Hello"))
+            print(len(log), log.tail(10))
+    """
+    def __init__(self, path: str, sync: bool = False):
+        """
+        Open or create a log.
+
+        Args:
+            path: The data file; the index is stored next to it as path + ".idx"
+            sync: fsync both files after every append, for durability across
+                power loss (slower)
+        """
+        self.path = path
+        self.index_path = path + ".idx"
+        self.sync = sync
+        self._lock = threading.Lock()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._data = open(path, "a+b")
+        self._index = open(self.index_path, "a+b")
+        self._map: Optional[mmap.mmap] = None
+        self._count = os.path.getsize(self.index_path) // _OFFSET.size
+        self._recover()
+
+    def __enter__(self) -> "SessionLog":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _offset(self, i: int) -> int:
+        """Byte offset of record i in the data file, read through the index map."""
+        end = (i + 1) * _OFFSET.size
+        if self._map is None or len(self._map) < end:
+            if self._map is not None:
+                self._map.close()
+            self._index.flush()
+            self._map = mmap.mmap(self._index.fileno(), 0, access=mmap.ACCESS_READ)
+        return _OFFSET.unpack_from(self._map, i * _OFFSET.size)[0]
+
+    def _data_size(self) -> int:
+        self._data.seek(0, os.SEEK_END)
+        return self._data.tell()
+
+    def _recover(self) -> None:
+        """Make the index and the data agree after an interrupted append."""
+        data_size = self._data_size()
+        count = self._count
+        while count and self._offset(count - 1) >= data_size:
+            count -= 1
+        # Re-scan from the last indexed record, which is normally the only one read
+        start = self._offset(count - 1) if count else 0
+        count = max(count - 1, 0)
+        self._truncate_index(count)
+        self._data.seek(start)
+        offsets = []
+        position = start
+        for line in self._data:
+            if not line.endswith(b"\n"):
+                break
+            offsets.append(position)
+            position += len(line)
+        if position < data_size:
+            self._data.truncate(position)
+        self._write_offsets(offsets)
+
+    def _truncate_index(self, count: int) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._index.truncate(count * _OFFSET.size)
+        self._count = count
+
+    def _write_offsets(self, offsets: List[int]) -> None:
+        if offsets:
+            self._index.write(b"".join(_OFFSET.pack(offset) for offset in offsets))
+            self._index.flush()
+            self._count += len(offsets)
+
+    @staticmethod
+    def _encode(message: Message) -> bytes:
+        return json.dumps(message.to_dict(), ensure_ascii=False, default=str).encode("utf-8") + b"\n"
+
+    def append(self, message: Message) -> None:
+        """Append one message."""
+        self.extend((message,))
+
+    def extend(self, messages: Iterable[Message]) -> None:
+        """Append messages in order, with a single write per file."""
+        records = [self._encode(message) for message in messages]
+        if not records:
+            return
+        with self._lock:
+            position = self._data_size()
+            offsets = []
+            for record in records:
+                offsets.append(position)
+                position += len(record)
+            self._data.write(b"".join(records))
+            self._data.flush()
+            if self.sync:
+                os.fsync(self._data.fileno())
+            self._write_offsets(offsets)
+            if self.sync:
+                os.fsync(self._index.fileno())
+
+    def read(self, start: int = 0, stop: Optional[int] = None) -> List[Message]:
+        """
+        Read the records in [start, stop), clamped to the log's length.
+
+        Only the requested byte range of the data file is read.
+        """
+        with self._lock:
+            stop = self._count if stop is None else min(stop, self._count)
+            start = max(start, 0)
+            if start >= stop:
+                return []
+            begin = self._offset(start)
+            end = self._offset(stop) if stop < self._count else self._data_size()
+            self._data.seek(begin)
+            data = self._data.read(end - begin)
+        return [Message.from_dict(json.loads(line)) for line in data.splitlines()]
+
+    def tail(self, n: int) -> List[Message]:
+        """Read the last n records, in O(n)."""
+        return self.read(max(self._count - n, 0)) if n > 0 else []
+
+    def __getitem__(self, i: int) -> Message:
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError("SessionLog index out of range")
+        return self.read(i, i + 1)[0]
+
+    def close(self) -> None:
+        """Close the data and index files."""
+        with self._lock:
+            if self._map is not None:
+                self._map.close()
+                self._map = None
+            self._data.close()
+            self._index.close()
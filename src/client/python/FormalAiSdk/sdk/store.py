@@ -0,0 +1,376 @@
+"""
+In-memory store of ModelSessions that spills cold sessions to disk.
+
+A SessionStore keeps recently used sessions resident up to a memory
+ceiling. When the ceiling is exceeded the least recently used sessions are
+written to one compressed file each and dropped from memory; the next get()
+reloads them transparently. This lets one process host many mostly idle
+conversations.
+"""
+
+import base64
+import json
+import os
+import threading
+import weakref
+import zlib
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from functools import partial
+from typing import Dict, Iterator, List, Optional
+
+from .columns import MessageColumns
+from .session import ModelSession
+from .session_log import SessionLog
+from .types import Message
+from .usage import SessionUsage
+
+STORE_VERSION = 1
+
+# Rough resident cost of one message besides its text: the Message object,
+# its timestamp and metadata dict, its history node and its core message.
+MESSAGE_OVERHEAD_BYTES = 600
+
+@dataclass
+class StoreStats:
+    """
+    Counters for a SessionStore.
+
+    Attributes:
+        hits: get() calls served from memory
+        loads: get() calls that reloaded a spilled session
+        evictions: Sessions spilled to disk to respect the limits
+        spilled_bytes: Compressed bytes written by evictions and flushes
+        resident_sessions: Sessions currently in memory
+        resident_bytes: Estimated memory used by the resident sessions
+    """
+    hits: int = 0
+    loads: int = 0
+    evictions: int = 0
+    spilled_bytes: int = 0
+    resident_sessions: int = 0
+    resident_bytes: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of get() calls served from memory."""
+        total = self.hits + self.loads
+        return self.hits / total if total else 0.0
+
+def estimate_session_bytes(session: ModelSession) -> int:
+    """
+    Estimate a session's resident memory in O(1).
+
+    Uses the session's cached token estimate (about four characters per
+    token) plus a fixed per-message overhead, and the size of its archive.
+    """
+    return session.estimated_tokens * 4 + len(session.messages) * MESSAGE_OVERHEAD_BYTES + session.archived.nbytes
+
+class SessionStore:
+    """
+    Thread-safe keyed store of ModelSessions with least-recently-used spilling.
+
+    A spilled session keeps its actor, history, archive, token settings and usage
+    accounting; its executor is restored from the arguments it was created
+    with, or the store's defaults. Snapshots are not kept. Sizes are measured
+    whenever a session is stored or fetched, so a session that grows is
+    accounted for on its next access.
+
+    A session object stays usable after it is evicted: get() hands the same
+    object out again while it is referenced, and a response committed to it
+    makes it resident again, so a session fetched by one thread is not lost
+    when another thread's access evicts it. use() keeps a session resident
+    for the duration of a block.
+
+    Example:
+        store = SessionStore("/var/lib/agent/sessions", max_resident_bytes=256 * 2**20, executor=executor)
+        session = store.get_or_create(user_id, "user")
+        session.Fork("reply", "user", text).Answer(session)
+        print(store.stats_snapshot().hit_rate)
+    """
+    def __init__(
+        self,
+        directory: str,
+        max_resident_bytes: Optional[int] = 64 * 2**20,
+        max_resident_sessions: Optional[int] = None,
+        **session_kwargs,
+    ):
+        """
+        Args:
+            directory: Where spilled sessions are written; sessions already
+                spilled there are available through get()
+            max_resident_bytes: Estimated memory ceiling for resident sessions
+                (None for no byte limit)
+            max_resident_sessions: Optional cap on the number of resident sessions
+            **session_kwargs: Default ModelSession arguments (executor,
+                model_config, pool, ...) for created and reloaded sessions
+
+        Raises:
+            ValueError: If a limit is not positive
+        """
+        if max_resident_bytes is not None and max_resident_bytes <= 0:
+            raise ValueError("max_resident_bytes must be positive")
+        if max_resident_sessions is not None and max_resident_sessions <= 0:
+            raise ValueError("max_resident_sessions must be positive")
+        self.directory = directory
+        self.max_resident_bytes = max_resident_bytes
+        self.max_resident_sessions = max_resident_sessions
+        self.session_kwargs = session_kwargs
+        self.stats = StoreStats()
+        self._lock = threading.RLock()
+        self._resident: "OrderedDict[str, ModelSession]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._kwargs: Dict[str, Dict] = {}
+        self._pins: Counter = Counter()
+        # Spilled sessions that are still referenced, handed out again by get()
+        self._evicted: "weakref.WeakValueDictionary[str, ModelSession]" = weakref.WeakValueDictionary()
+        os.makedirs(directory, exist_ok=True)
+        self._spilled = {
+            self._key(name[:-len(".session")])
+            for name in os.listdir(directory)
+            if name.endswith(".session")
+        }
+
+    @staticmethod
+    def _filename(key: str) -> str:
+        return base64.urlsafe_b64encode(key.encode("utf-8")).decode("ascii").rstrip("=") + ".session"
+
+    @staticmethod
+    def _key(encoded: str) -> str:
+        return base64.urlsafe_b64decode(encoded + "=" * (-len(encoded) % 4)).decode("utf-8")
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, self._filename(key))
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._resident or key in self._spilled
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._resident.keys() | self._spilled)
+
+    def keys(self) -> List[str]:
+        """All stored keys, resident or spilled."""
+        with self._lock:
+            return sorted(self._resident.keys() | self._spilled)
+
+    def create(self, key: str, actor: str, **session_kwargs) -> ModelSession:
+        """
+        Create and store a new session.
+
+        Args:
+            key: The session's key
+            actor: The actor who owns the session
+            **session_kwargs: ModelSession arguments overriding the store's defaults
+
+        Raises:
+            ValueError: If the key is already stored
+        """
+        with self._lock:
+            if key in self:
+                raise ValueError(f"Session already stored: {key}")
+            session = ModelSession(actor, **{**self.session_kwargs, **session_kwargs})
+            self._kwargs[key] = session_kwargs
+            self._admit(key, session)
+            return session
+
+    def get_or_create(self, key: str, actor: str, **session_kwargs) -> ModelSession:
+        """Return the session stored under key, creating it as create() would if there is none."""
+        with self._lock:
+            if key in self:
+                return self.get(key)
+            return self.create(key, actor, **session_kwargs)
+
+    def put(self, key: str, session: ModelSession) -> None:
+        """Store a session under key, replacing any stored session. Its executor is kept for reloads."""
+        with self._lock:
+            if self._resident.get(key) is not session and self._evicted.get(key) is not session:
+                self.delete(key)
+            self._kwargs[key] = {
+                name: value
+                for name, value in (("executor", session.executor), ("model_config", session.model_config))
+                if value is not None
+            }
+            self._admit(key, session)
+
+    def get(self, key: str) -> ModelSession:
+        """
+        Return the session stored under key, reloading it from disk if it was spilled.
+
+        Raises:
+            KeyError: If no session is stored under key
+        """
+        with self._lock:
+            session = self._resident.get(key)
+            if session is not None:
+                self.stats.hits += 1
+                self._resident.move_to_end(key)
+                self._measure(key)
+                self._enforce(keep=key)
+                return session
+            if key not in self._spilled:
+                raise KeyError(key)
+            session = self._evicted.get(key)
+            if session is not None:
+                self.stats.hits += 1
+                self._admit(key, session)
+                return session
+            session = self._load(key)
+            self.stats.loads += 1
+            self._admit(key, session)
+            return session
+
+    @contextmanager
+    def use(self, key: str) -> Iterator[ModelSession]:
+        """
+        Fetch a session and keep it resident until the block exits.
+
+        Example:
+            with store.use(user_id) as session:
+                session.Fork("reply", "user", text).Answer(session)
+        """
+        with self._lock:
+            self._pins[key] += 1
+            try:
+                session = self.get(key)
+            except BaseException:
+                self._unpin(key)
+                raise
+        try:
+            yield session
+        finally:
+            with self._lock:
+                self._unpin(key)
+                if key in self._resident:
+                    self._measure(key)
+                self._enforce(keep=None)
+
+    def _unpin(self, key: str) -> None:
+        self._pins[key] -= 1
+        if not self._pins[key]:
+            del self._pins[key]
+
+    def delete(self, key: str) -> None:
+        """Remove a session from memory and disk; unknown keys are ignored."""
+        with self._lock:
+            session = self._resident.pop(key, None)
+            if session is not None:
+                self.stats.resident_bytes -= self._sizes.pop(key)
+                self.stats.resident_sessions = len(self._resident)
+            else:
+                session = self._evicted.pop(key, None)
+            if session is not None:
+                session._on_commit = None
+                session.close()
+            if key in self._spilled:
+                self._spilled.discard(key)
+                os.remove(self._path(key))
+            self._kwargs.pop(key, None)
+
+    def _admit(self, key: str, session: ModelSession) -> None:
+        self._evicted.pop(key, None)
+        session._on_commit = None
+        self._resident[key] = session
+        self._resident.move_to_end(key)
+        self._measure(key)
+        self._enforce(keep=key)
+
+    def _measure(self, key: str) -> None:
+        size = estimate_session_bytes(self._resident[key])
+        self.stats.resident_bytes += size - self._sizes.get(key, 0)
+        self.stats.resident_sessions = len(self._resident)
+        self._sizes[key] = size
+
+    def _over_limit(self) -> bool:
+        if self.max_resident_sessions is not None and len(self._resident) > self.max_resident_sessions:
+            return True
+        return self.max_resident_bytes is not None and self.stats.resident_bytes > self.max_resident_bytes
+
+    def _enforce(self, keep: Optional[str]) -> None:
+        """Spill least recently used sessions until within the limits, never the one in use or pinned ones."""
+        if not self._over_limit():
+            return
+        for key in list(self._resident):
+            if key == keep or key in self._pins:
+                continue
+            self._spill(key)
+            self.stats.evictions += 1
+            if not self._over_limit():
+                return
+
+    def _spill(self, key: str) -> None:
+        session = self._resident.pop(key)
+        self.stats.resident_bytes -= self._sizes.pop(key)
+        self.stats.resident_sessions = len(self._resident)
+        # Set before writing, so a commit the written copy misses re-admits the session
+        session._on_commit = partial(self._readmit, key)
+        self._write(key, session)
+        self._evicted[key] = session
+
+    def _readmit(self, key: str, session: ModelSession) -> None:
+        """Make an evicted session resident again after a commit, unless it was replaced or deleted."""
+        with self._lock:
+            if self._evicted.get(key) is session:
+                self._admit(key, session)
+
+    def _write(self, key: str, session: ModelSession) -> None:
+        # Commits update the history and usage under the session lock, so this
+        # reads a consistent state; the history itself is immutable
+        with session._lock:
+            messages = session.messages
+            usage = session.usage.to_dict()
+            archived = [message.to_dict() for message in session.archived]
+            log = session.log.path if session.log is not None else None
+        record = {
+            "version": STORE_VERSION,
+            "key": key,
+            "actor": session.actor,
+            "max_history_tokens": session.max_history_tokens,
+            "usage": usage,
+            "log": log,
+            "archived": archived,
+            "messages": [message.to_dict() for message in messages],
+        }
+        payload = zlib.compress(json.dumps(record, ensure_ascii=False, default=str).encode("utf-8"))
+        path = self._path(key)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(payload)
+        os.replace(temp_path, path)
+        self._spilled.add(key)
+        self.stats.spilled_bytes += len(payload)
+
+    def _load(self, key: str) -> ModelSession:
+        with open(self._path(key), "rb") as f:
+            record = json.loads(zlib.decompress(f.read()))
+        if record.get("version") != STORE_VERSION:
+            raise ValueError(f"Unsupported session store version for {key}: {record.get('version')}")
+        kwargs = {**self.session_kwargs, **self._kwargs.get(key, {}), "max_history_tokens": record["max_history_tokens"]}
+        session = ModelSession(record["actor"], **kwargs)
+        session.usage = SessionUsage.from_dict(record["usage"])
+        session._archive = MessageColumns(Message.from_dict(message) for message in record["archived"])
+        session.messages = [Message.from_dict(message) for message in record["messages"]]
+        if record["log"] is not None:
+            session.log = SessionLog(record["log"])
+        return session
+
+    def flush(self) -> None:
+        """Write every resident session to disk, keeping it resident."""
+        with self._lock:
+            for key, session in self._resident.items():
+                self._write(key, session)
+
+    def close(self) -> None:
+        """Spill every resident session and close the logs of all sessions, e.g. at shutdown."""
+        with self._lock:
+            for key in list(self._resident):
+                self._spill(key)
+            for session in list(self._evicted.values()):
+                session.close()
+
+    def stats_snapshot(self) -> StoreStats:
+        """Return a copy of the current counters."""
+        with self._lock:
+            return replace(self.stats)
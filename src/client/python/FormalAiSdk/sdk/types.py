@@ -2,8 +2,12 @@
 Type definitions for the FormalAI SDK.
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
+from typing import Dict, List, Optional
+
+from ..core.persistent import PersistentList
+from ..core.types import Conversation as CoreConversation
 
 @dataclass
 class Message:
@@ -14,11 +18,107 @@ class Message:
         actor: The identifier of the actor who sent the message
         content: The text content of the message
         timestamp: When the message was created
+        metadata: Additional data about the message (e.g. streaming timings)
     """
     actor: str
     content: str
     timestamp: datetime = None
+    metadata: Dict = field(default_factory=dict)
     
     def __post_init__(self):
         if self.timestamp is None:
             self.timestamp = datetime.now()
+
+    def to_dict(self) -> Dict:
+        """JSON-compatible form of the message, as stored by SessionLog and SessionStore."""
+        return {
+            "actor": self.actor,
+            "content": self.content,
+            "timestamp": self.timestamp.isoformat(),
+            "metadata": self.metadata,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Message":
+        """Rebuild a message from to_dict() output."""
+        return cls(
+            actor=data["actor"],
+            content=data["content"],
+            timestamp=datetime.fromisoformat(data["timestamp"]),
+            metadata=data["metadata"],
+        )
+
+@dataclass
+class ForkResult:
+    """
+    Outcome of a single fork run by ModelSession.run_forks().
+    
+    Attributes:
+        fork_id: The identifier of the fork
+        content: The response content, or None if the fork failed
+        latency: Wall-clock seconds spent in the executor call
+        error: The exception raised by the fork, if any
+        metadata: The response metadata (token usage, latencies), if any
+    """
+    fork_id: str
+    content: Optional[str]
+    latency: float
+    error: Optional[BaseException] = None
+    metadata: Dict = field(default_factory=dict)
+
+@dataclass
+class HistoryWindow:
+    """
+    Session history fitted to a token budget by ModelSession.get_history_window().
+    
+    Attributes:
+        conversation: The history that fits, in core format
+        tokens: Tokens in the kept messages
+        trimmed_tokens: Estimated tokens in the messages that were dropped
+        trimmed_messages: Number of messages that were dropped
+    """
+    conversation: CoreConversation
+    tokens: int
+    trimmed_tokens: int = 0
+    trimmed_messages: int = 0
+
+@dataclass
+class Snapshot:
+    """
+    A saved state of a ModelSession, taken by ModelSession.snapshot().
+    
+    The messages share every node with the history they were taken from, so
+    a snapshot only costs the messages added since its parent.
+    
+    Attributes:
+        id: Index of the snapshot in the session's snapshot list
+        messages: The history at the time of the snapshot
+        conversation: The history in core format
+        tokens: Estimated tokens in the history
+        label: Optional description
+        parent_id: The snapshot this state was taken after, if any
+        archived: Number of messages the session had archived at the time
+        timestamp: When the snapshot was taken
+    """
+    id: int
+    messages: PersistentList
+    conversation: CoreConversation
+    tokens: int
+    label: Optional[str] = None
+    parent_id: Optional[int] = None
+    archived: int = 0
+    timestamp: datetime = field(default_factory=datetime.now)
+
+@dataclass
+class SnapshotDiff:
+    """
+    Difference between two snapshots, computed by ModelSession.diff().
+    
+    Attributes:
+        common: Number of leading messages the snapshots share
+        removed: Messages only in the first snapshot, after the shared prefix
+        added: Messages only in the second snapshot, after the shared prefix
+    """
+    common: int
+    removed: List[Message]
+    added: List[Message]
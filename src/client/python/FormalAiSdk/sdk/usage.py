@@ -0,0 +1,151 @@
+"""
+Token usage and latency accounting for the FormalAI SDK.
+"""
+
+import threading
+from dataclasses import asdict, dataclass, replace
+from typing import Dict, Optional
+
+from ..exceptions import BudgetExceededError
+
+@dataclass
+class UsageTotals:
+    """
+    Accumulated usage over a set of model calls.
+    
+    Latencies are in seconds. Responses served from a cache count as calls and
+    cache hits but add no tokens or latency, since they cost neither.
+    
+    Attributes:
+        calls: Number of model responses recorded
+        cache_hits: Responses served from a cache
+        prompt_tokens: Prompt tokens reported by the provider
+        completion_tokens: Completion tokens reported by the provider
+        cached_tokens: Prompt tokens the provider served from its prompt cache
+        trimmed_tokens: History tokens dropped by windowing before the call
+        queue_latency: Time spent waiting in executor pools
+        network_latency: Time spent waiting on the provider
+        total_latency: End-to-end executor time
+    """
+    calls: int = 0
+    cache_hits: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0
+    trimmed_tokens: int = 0
+    queue_latency: float = 0.0
+    network_latency: float = 0.0
+    total_latency: float = 0.0
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+    def add(self, metadata: Dict) -> None:
+        """Add one response's metadata to the totals."""
+        self.calls += 1
+        self.trimmed_tokens += metadata.get("trimmed_tokens") or 0
+        if metadata.get("cache"):
+            self.cache_hits += 1
+            return
+        self.prompt_tokens += metadata.get("prompt_tokens") or 0
+        self.completion_tokens += metadata.get("completion_tokens") or 0
+        self.cached_tokens += metadata.get("cached_tokens") or 0
+        self.queue_latency += metadata.get("queue_latency") or 0.0
+        self.network_latency += metadata.get("network_latency") or 0.0
+        self.total_latency += metadata.get("total_latency") or 0.0
+
+class SessionUsage:
+    """
+    Usage totals for a ModelSession, overall and per fork and actor.
+    
+    Attributes:
+        token_budget: Optional hard cap on total (prompt + completion) tokens
+    
+    Example:
+        session = ModelSession("user", model_config=config, token_budget=50_000)
+        ...
+        print(session.usage.totals().total_tokens)
+        print(session.usage.by_fork()["git_cmd_fork"].network_latency)
+    """
+    def __init__(self, token_budget: Optional[int] = None):
+        if token_budget is not None and token_budget < 0:
+            raise ValueError("token_budget cannot be negative")
+        self.token_budget = token_budget
+        self._lock = threading.Lock()
+        self._totals = UsageTotals()
+        self._by_fork: Dict[str, UsageTotals] = {}
+        self._by_actor: Dict[str, UsageTotals] = {}
+
+    def record(self, fork_id: str, actor: str, metadata: Dict) -> None:
+        """
+        Record a response's usage.
+        
+        Args:
+            fork_id: The fork that produced the response
+            actor: The actor whose message the fork answered
+            metadata: The response metadata
+        """
+        with self._lock:
+            self._totals.add(metadata)
+            self._by_fork.setdefault(fork_id, UsageTotals()).add(metadata)
+            self._by_actor.setdefault(actor, UsageTotals()).add(metadata)
+
+    def check(self, estimated_prompt_tokens: int) -> None:
+        """
+        Ensure a call with the estimated prompt size fits in the remaining budget.
+        
+        Raises:
+            BudgetExceededError: If the call would exceed the token budget
+        """
+        if self.token_budget is None:
+            return
+        with self._lock:
+            used = self._totals.total_tokens
+        if used + estimated_prompt_tokens > self.token_budget:
+            raise BudgetExceededError(
+                f"Token budget exceeded: {used} used + ~{estimated_prompt_tokens} prompt tokens "
+                f"> budget of {self.token_budget}"
+            )
+
+    def to_dict(self) -> Dict:
+        """JSON-compatible form of the budget and totals, for SessionStore."""
+        with self._lock:
+            return {
+                "token_budget": self.token_budget,
+                "totals": asdict(self._totals),
+                "by_fork": {key: asdict(value) for key, value in self._by_fork.items()},
+                "by_actor": {key: asdict(value) for key, value in self._by_actor.items()},
+            }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "SessionUsage":
+        """Rebuild usage accounting from to_dict() output."""
+        usage = cls(data["token_budget"])
+        usage._totals = UsageTotals(**data["totals"])
+        usage._by_fork = {key: UsageTotals(**value) for key, value in data["by_fork"].items()}
+        usage._by_actor = {key: UsageTotals(**value) for key, value in data["by_actor"].items()}
+        return usage
+
+    @property
+    def remaining(self) -> Optional[int]:
+        """Tokens left in the budget, or None if there is no budget."""
+        if self.token_budget is None:
+            return None
+        with self._lock:
+            return max(0, self.token_budget - self._totals.total_tokens)
+
+    def totals(self) -> UsageTotals:
+        """Return a copy of the session-wide totals."""
+        with self._lock:
+            return replace(self._totals)
+
+    def by_fork(self) -> Dict[str, UsageTotals]:
+        """Return copies of the totals per fork id."""
+        with self._lock:
+            return {key: replace(value) for key, value in self._by_fork.items()}
+
+    def by_actor(self) -> Dict[str, UsageTotals]:
+        """Return copies of the totals per answered actor."""
+        with self._lock:
+            return {key: replace(value) for key, value in self._by_actor.items()}
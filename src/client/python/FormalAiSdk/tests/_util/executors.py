@@ -0,0 +1,140 @@
+"""
+Fake ModelExecutors shared by the executor, pool and session tests.
+"""
+
+import asyncio
+import threading
+import time
+from typing import Dict, Optional, Sequence, Union
+
+from ...core.executor import ModelExecutor
+from ...core.types import Message, Role
+
+class CountingExecutor(ModelExecutor):
+    """
+    Executor that numbers its responses, so repeated or cached answers are detectable.
+
+    execute() answers f"{prefix} {calls}"; stream() yields chunks, or
+    "streamed " and the call number.
+    """
+    def __init__(self, model="test-model", prefix="response", metadata=None, chunks=None, delay=0.0):
+        self.model = model
+        self.prefix = prefix
+        self.metadata = metadata if metadata is not None else {"model": model}
+        self.chunks = chunks
+        self.delay = delay
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def identity(self):
+        return {"executor": "CountingExecutor", "model": self.model}
+
+    def _count(self) -> int:
+        with self.lock:
+            self.calls += 1
+            return self.calls
+
+    def execute(self, conversation):
+        calls = self._count()
+        time.sleep(self.delay)
+        return Message(role=Role.AGENT, content=f"{self.prefix} {calls}", metadata=dict(self.metadata))
+
+    def stream(self, conversation):
+        calls = self._count()
+        yield from self.chunks if self.chunks is not None else ["streamed ", f"{calls}"]
+
+class EchoExecutor(ModelExecutor):
+    """
+    Executor echoing the last message after a delay, recording calls and peak concurrency.
+
+    Args:
+        delay: Seconds per call, or a dict of seconds per message content
+        prefix: Prepended to the echoed content
+        error: Exception raised instead of answering
+    """
+    def __init__(self, delay: Union[float, Dict[str, float]] = 0.0, prefix: str = "echo ", error: Optional[Exception] = None):
+        self.delay = delay
+        self.prefix = prefix
+        self.error = error
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def _enter(self, conversation) -> float:
+        content = conversation.messages[-1].content
+        with self.lock:
+            self.calls.append(content)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        return self.delay.get(content, 0.0) if isinstance(self.delay, dict) else self.delay
+
+    def _leave(self, conversation) -> Message:
+        with self.lock:
+            self.in_flight -= 1
+        if self.error is not None:
+            raise self.error
+        return Message(role=Role.AGENT, content=f"{self.prefix}{conversation.messages[-1].content}")
+
+    def execute(self, conversation):
+        time.sleep(self._enter(conversation))
+        return self._leave(conversation)
+
+    async def aexecute(self, conversation):
+        await asyncio.sleep(self._enter(conversation))
+        return self._leave(conversation)
+
+class ScriptedExecutor(ModelExecutor):
+    """
+    Executor answering from a script after a delay, recording what it saw.
+
+    Each call takes the next outcome (the last one repeats); an exception
+    outcome is raised. Without a script it answers with its name. Records the
+    conversations seen, calls started and async calls cancelled.
+    """
+    def __init__(self, name, outcomes: Sequence[Union[str, Exception]] = None, delay=0.0):
+        self.name = name
+        self.outcomes = list(outcomes) if outcomes else [name]
+        self.delay = delay
+        self.seen = []
+        self.started = 0
+        self.cancelled = 0
+
+    def identity(self):
+        return {"executor": "ScriptedExecutor", "model": self.name}
+
+    def _respond(self, conversation):
+        self.seen.append(conversation)
+        outcome = self.outcomes[min(len(self.seen), len(self.outcomes)) - 1]
+        if isinstance(outcome, Exception):
+            raise outcome
+        return Message(role=Role.AGENT, content=outcome)
+
+    def execute(self, conversation):
+        self.started += 1
+        time.sleep(self.delay)
+        return self._respond(conversation)
+
+    async def aexecute(self, conversation):
+        self.started += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return self._respond(conversation)
+
+class StreamingExecutor(ModelExecutor):
+    """Executor that streams a fixed list of deltas, optionally failing part way."""
+    def __init__(self, deltas, fail_after=None):
+        self.deltas = deltas
+        self.fail_after = fail_after
+
+    def execute(self, conversation):
+        return Message(role=Role.AGENT, content="".join(self.deltas))
+
+    def stream(self, conversation):
+        for i, delta in enumerate(self.deltas):
+            if i == self.fail_after:
+                raise RuntimeError("stream dropped")
+            yield delta
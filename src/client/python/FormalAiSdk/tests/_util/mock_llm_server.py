@@ -0,0 +1,434 @@
+"""
+Local mock LLM server for load testing executors without a real model.
+
+An asyncio HTTP/1.1 server (keep-alive, no dependencies) implementing:
+- OpenAI chat completions: POST /v1/chat/completions, /chat/completions and
+  Azure-style /openai/deployments/<name>/chat/completions (SSE streaming),
+- Ollama chat: POST /api/chat (NDJSON streaming). prompt_eval_count only
+  counts the messages that differ from the previous request for the same
+  model, and load_duration is only reported for a model's first request,
+  mimicking Ollama's prefix reuse and keep-alive.
+
+Behaviour is set by MockServerConfig: latency distributions, a concurrency
+limit and request rate limit (excess requests get 429), random 429
+injection, per-chunk streaming delays and the models served.
+
+Conversations are identified by a "[conversation:<id>]" tag in their first
+message, or by a hash of the first message. Each conversation has transient
+memory: "remember: <fact>" stores a fact and "recall" lists the stored facts.
+Replies are tagged with the conversation id and turn number, e.g.
+"[conversation:ab12] turn 2: echo: Hello".
+
+Usage:
+    with MockLlmServer(MockServerConfig(latency=lognormal(0.2, 0.5))) as server:
+        config = LlmModels.FromOpenAi({"api_base": server.url + "/v1", "api_key": "mock"})
+
+    python -m FormalAiSdk.tests._util.mock_llm_server --port 8765 --latency 0.05
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from typing import Callable, Collection, Dict, List, Optional, Tuple
+
+LatencyDistribution = Callable[[random.Random], float]
+
+def fixed(seconds: float) -> LatencyDistribution:
+    """Always the same latency."""
+    return lambda rng: seconds
+
+def uniform(low: float, high: float) -> LatencyDistribution:
+    """Latency uniformly distributed between low and high seconds."""
+    return lambda rng: rng.uniform(low, high)
+
+def lognormal(median: float, sigma: float) -> LatencyDistribution:
+    """Long-tailed latency with the given median, like real provider latencies."""
+    return lambda rng: rng.lognormvariate(math.log(median), sigma)
+
+@dataclass
+class MockServerConfig:
+    """
+    Behaviour of a MockLlmServer.
+
+    Attributes:
+        latency: Distribution of time before the first byte of a response
+        chunk_delay: Seconds between streamed chunks
+        max_concurrency: Requests processed at once; others wait (None for no limit)
+        requests_per_second: Request rate limit; excess requests get 429 (None for no limit)
+        error_rate: Probability of injecting a 429 into an accepted request
+        memory_ttl: Seconds a conversation's memory survives without activity
+        models: Model names served; requests for other models get 404 (None serves any)
+        seed: Seed for latency sampling and error injection
+    """
+    latency: LatencyDistribution = field(default_factory=lambda: fixed(0.0))
+    chunk_delay: float = 0.0
+    max_concurrency: Optional[int] = None
+    requests_per_second: Optional[float] = None
+    error_rate: float = 0.0
+    memory_ttl: float = 300.0
+    models: Optional[Collection[str]] = None
+    seed: Optional[int] = None
+
+@dataclass
+class MockServerStats:
+    """
+    Counters for a MockLlmServer.
+
+    Attributes:
+        requests: Chat requests received
+        completed: Chat requests answered successfully
+        rate_limited: Requests rejected with 429 (rate limit or injection)
+        streamed: Requests answered with a stream
+        connections: TCP connections accepted
+        max_in_flight: Highest number of requests processed at once
+    """
+    requests: int = 0
+    completed: int = 0
+    rate_limited: int = 0
+    streamed: int = 0
+    connections: int = 0
+    max_in_flight: int = 0
+
+_CONVERSATION_TAG = re.compile(r"\[conversation:([\w-]+)\]")
+_REASONS = {status.value: status.phrase for status in HTTPStatus}
+
+_OPENAI_PATH = re.compile(r"^(/v1)?/chat/completions$|^/openai/deployments/[^/]+/chat/completions$")
+
+class _Conversations:
+    """
+    Transient per-conversation memory with inactivity expiry.
+
+    Entries are kept in order of last activity, so expiry only looks at the
+    stalest ones: O(1) amortized per turn.
+    """
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, List[str], int]]" = OrderedDict()
+
+    def _expire(self, now: float) -> None:
+        while self._entries:
+            key, (seen, _, _) = next(iter(self._entries.items()))
+            if now - seen <= self.ttl:
+                return
+            del self._entries[key]
+
+    def turn(self, conversation_id: str, text: str) -> str:
+        now = time.monotonic()
+        self._expire(now)
+        _, facts, turns = self._entries.pop(conversation_id, (now, [], 0))
+        turns += 1
+        if text.lower().startswith("remember:"):
+            facts = facts + [text.split(":", 1)[1].strip()]
+            reply = "noted"
+        elif text.strip().lower() == "recall":
+            reply = "; ".join(facts) if facts else "nothing remembered"
+        else:
+            reply = f"echo: {text}"
+        self._entries[conversation_id] = (now, facts, turns)
+        return f"[conversation:{conversation_id}] turn {turns}: {reply}"
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+def prompt_tokens(messages: List[Dict]) -> int:
+    """Mock token count of prompt messages: four characters per token plus four per message."""
+    return sum(len(msg.get("content", "")) // 4 + 4 for msg in messages)
+
+def conversation_id(messages: List[Dict]) -> str:
+    """The id tagged in the first message, or a hash of the first message."""
+    first = messages[0].get("content", "") if messages else ""
+    match = _CONVERSATION_TAG.search(first)
+    if match:
+        return match.group(1)
+    return hashlib.sha256(first.encode("utf-8")).hexdigest()[:12]
+
+class MockLlmServer:
+    """
+    OpenAI- and Ollama-compatible mock server on a local port.
+
+    Use as a context manager to run it on a background thread (for sync code
+    and executors), or call start()/stop() from a running event loop.
+
+    Attributes:
+        url: Base URL of the server, e.g. http://127.0.0.1:54321
+        stats: MockServerStats counters
+        recent_requests: Bodies of the last 100 chat requests, oldest first
+    """
+    def __init__(self, config: MockServerConfig = None, host: str = "127.0.0.1", port: int = 0):
+        self.config = config or MockServerConfig()
+        self.host = host
+        self.port = port
+        self.url: Optional[str] = None
+        self.stats = MockServerStats()
+        self.conversations = _Conversations(self.config.memory_ttl)
+        self.recent_requests = deque(maxlen=100)
+        self._ollama_prompts: Dict[str, List[Dict]] = {}
+        self._random = random.Random(self.config.seed)
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._in_flight = 0
+        self._allowance = self.config.requests_per_second or 0.0
+        self._allowance_at = time.monotonic()
+        self._connections: Dict[asyncio.StreamWriter, "asyncio.Task"] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+
+    async def start(self) -> "MockLlmServer":
+        """Start serving on the running event loop."""
+        if self.config.max_concurrency:
+            self._semaphore = asyncio.Semaphore(self.config.max_concurrency)
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port, backlog=1024)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self.url = f"http://{self.host}:{self.port}"
+        return self
+
+    async def stop(self) -> None:
+        """Stop accepting connections and close the open ones."""
+        self._server.close()
+        connections = dict(self._connections)
+        for writer in connections:
+            writer.close()
+        # Let the handlers see the closed connections and end on their own
+        await asyncio.gather(*connections.values(), return_exceptions=True)
+        await self._server.wait_closed()
+
+    def __enter__(self) -> "MockLlmServer":
+        started = threading.Event()
+
+        def run():
+            self._loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self._loop)
+            self._loop.run_until_complete(self.start())
+            started.set()
+            self._loop.run_forever()
+            self._loop.run_until_complete(self.stop())
+            pending = asyncio.all_tasks(self._loop)
+            for task in pending:
+                task.cancel()
+            self._loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            self._loop.close()
+
+        self._thread = threading.Thread(target=run, name="mock-llm-server", daemon=True)
+        self._thread.start()
+        started.wait()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+    # --- Rate limiting ---
+
+    def _rate_limited(self) -> bool:
+        """Sliding token bucket over requests_per_second, plus random error injection."""
+        rate = self.config.requests_per_second
+        if rate:
+            now = time.monotonic()
+            self._allowance = min(rate, self._allowance + (now - self._allowance_at) * rate)
+            self._allowance_at = now
+            if self._allowance < 1:
+                return True
+            self._allowance -= 1
+        return self.config.error_rate > 0 and self._random.random() < self.config.error_rate
+
+    # --- HTTP plumbing ---
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.stats.connections += 1
+        self._connections[writer] = asyncio.current_task()
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                try:
+                    await self._dispatch(method, path.split("?")[0], body, writer)
+                except ConnectionError:
+                    raise
+                except Exception as e:
+                    # A bug or unexpected request must still get an answer; the
+                    # connection may hold part of a response, so close it after
+                    await self._send(writer, 500, {"error": f"mock server error: {e!r}"}, {"Connection": "close"})
+                    break
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            self._connections.pop(writer, None)
+            writer.close()
+
+    async def _send(self, writer: asyncio.StreamWriter, status: int, payload: Dict, extra_headers: Dict = None) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        reason = _REASONS.get(status, "Unknown")
+        head = [f"HTTP/1.1 {status} {reason}", "Content-Type: application/json", f"Content-Length: {len(body)}"]
+        head += [f"{name}: {value}" for name, value in (extra_headers or {}).items()]
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+        await writer.drain()
+
+    async def _send_chunked(self, writer: asyncio.StreamWriter, content_type: str, chunks: List[bytes]) -> None:
+        head = f"HTTP/1.1 200 OK\r\nContent-Type: {content_type}\r\nTransfer-Encoding: chunked\r\n\r\n"
+        writer.write(head.encode("latin-1"))
+        for index, chunk in enumerate(chunks):
+            if index and self.config.chunk_delay:
+                await asyncio.sleep(self.config.chunk_delay)
+            writer.write(f"{len(chunk):x}\r\n".encode("latin-1") + chunk + b"\r\n")
+            await writer.drain()
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+    async def _dispatch(self, method: str, path: str, body: bytes, writer: asyncio.StreamWriter) -> None:
+        ollama = path == "/api/chat"
+        if method != "POST" or not (ollama or _OPENAI_PATH.match(path)):
+            await self._send(writer, 404, {"error": f"no route for {method} {path}"})
+            return
+        try:
+            request = json.loads(body or b"{}")
+            messages = request["messages"]
+        except (ValueError, KeyError):
+            await self._send(writer, 400, {"error": "request needs a messages list"})
+            return
+
+        self.stats.requests += 1
+        self.recent_requests.append(request)
+        model = request.get("model", "mock")
+        if self.config.models is not None and model not in self.config.models:
+            message = f"model '{model}' not found"
+            error = message if ollama else {"message": message, "type": "invalid_request_error", "code": "model_not_found"}
+            await self._send(writer, 404, {"error": error})
+            return
+        if self._rate_limited():
+            self.stats.rate_limited += 1
+            error = {"error": {"message": "Rate limit exceeded (mock)", "type": "rate_limit_error", "code": "429"}}
+            await self._send(writer, 429, error, {"Retry-After": "1"})
+            return
+
+        if self._semaphore is not None:
+            await self._semaphore.acquire()
+        self._in_flight += 1
+        self.stats.max_in_flight = max(self.stats.max_in_flight, self._in_flight)
+        try:
+            latency = self.config.latency(self._random)
+            if latency > 0:
+                await asyncio.sleep(latency)
+            last = messages[-1].get("content", "") if messages else ""
+            reply = self.conversations.turn(conversation_id(messages), last)
+            stream = request.get("stream", ollama)
+            if ollama:
+                await self._reply_ollama(writer, model, messages, reply, stream)
+            else:
+                await self._reply_openai(writer, model, messages, reply, stream)
+            self.stats.completed += 1
+            self.stats.streamed += bool(stream)
+        finally:
+            self._in_flight -= 1
+            if self._semaphore is not None:
+                self._semaphore.release()
+
+    # --- Response formats ---
+
+    @staticmethod
+    def _words(reply: str) -> List[str]:
+        words = reply.split(" ")
+        return words[:1] + [" " + word for word in words[1:]]
+
+    async def _reply_openai(self, writer, model: str, messages: List[Dict], reply: str, stream: bool) -> None:
+        prompt, completion_tokens = prompt_tokens(messages), len(reply.split(" "))
+        base = {"id": f"chatcmpl-mock-{self.stats.requests}", "created": int(time.time()), "model": model}
+        if not stream:
+            await self._send(writer, 200, {
+                **base,
+                "object": "chat.completion",
+                "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": reply}}],
+                "usage": {
+                    "prompt_tokens": prompt,
+                    "completion_tokens": completion_tokens,
+                    "total_tokens": prompt + completion_tokens,
+                },
+            })
+            return
+        events = [
+            {**base, "object": "chat.completion.chunk",
+             "choices": [{"index": 0, "finish_reason": None, "delta": {"content": word}}]}
+            for word in self._words(reply)
+        ]
+        events.append({**base, "object": "chat.completion.chunk", "choices": [{"index": 0, "finish_reason": "stop", "delta": {}}]})
+        chunks = [f"data: {json.dumps(event)}\n\n".encode("utf-8") for event in events] + [b"data: [DONE]\n\n"]
+        await self._send_chunked(writer, "text/event-stream", chunks)
+
+    async def _reply_ollama(self, writer, model: str, messages: List[Dict], reply: str, stream: bool) -> None:
+        previous = self._ollama_prompts.get(model)
+        self._ollama_prompts[model] = messages
+        reused = 0
+        for old, new in zip(previous or (), messages):
+            if old != new:
+                break
+            reused += 1
+        final = {
+            "model": model,
+            "done": True,
+            "prompt_eval_count": prompt_tokens(messages[reused:]),
+            "eval_count": len(reply.split(" ")),
+            "load_duration": 0 if previous is not None else 1_000_000,
+            "prompt_eval_duration": 1000,
+        }
+        if not stream:
+            await self._send(writer, 200, {**final, "message": {"role": "assistant", "content": reply}})
+            return
+        lines = [{"model": model, "done": False, "message": {"role": "assistant", "content": word}} for word in self._words(reply)]
+        lines.append({**final, "message": {"role": "assistant", "content": ""}})
+        await self._send_chunked(writer, "application/x-ndjson", [(json.dumps(line) + "\n").encode("utf-8") for line in lines])
+
+def main():
+    parser = argparse.ArgumentParser(description="OpenAI/Ollama-compatible mock LLM server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="Median latency in seconds")
+    parser.add_argument("--sigma", type=float, default=0.0, help="Lognormal spread of the latency (0 for fixed)")
+    parser.add_argument("--chunk-delay", type=float, default=0.0)
+    parser.add_argument("--max-concurrency", type=int, default=None)
+    parser.add_argument("--rps", type=float, default=None, help="Request rate limit; excess gets 429")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Probability of injecting a 429")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    latency = lognormal(args.latency, args.sigma) if args.latency and args.sigma else fixed(args.latency)
+    config = MockServerConfig(
+        latency=latency,
+        chunk_delay=args.chunk_delay,
+        max_concurrency=args.max_concurrency,
+        requests_per_second=args.rps,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    )
+
+    async def serve():
+        server = await MockLlmServer(config, args.host, args.port).start()
+        print(f"Mock LLM server listening on {server.url}")
+        await asyncio.Event().wait()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -1,2 +1,15 @@
 # conftest.py for FormalAiSdk tests
-# (Empty file - add shared fixtures here if needed)
+
+import pytest
+
+from ..core import tokens
+
+@pytest.fixture
+def estimated_tokens(monkeypatch):
+    """Count tokens with the character estimate, whether or not tiktoken is installed."""
+    monkeypatch.setattr(tokens, "tiktoken", None)
+    tokens.get_tokenizer.cache_clear()
+    tokens.count_message_tokens.cache_clear()
+    yield
+    tokens.get_tokenizer.cache_clear()
+    tokens.count_message_tokens.cache_clear()
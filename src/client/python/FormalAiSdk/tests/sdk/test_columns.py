@@ -0,0 +1,82 @@
+"""
+Tests for columnar message storage and session archiving.
+"""
+
+import sys
+from datetime import datetime
+import pytest
+
+from FormalAiSdk.sdk.columns import MessageColumns
+from FormalAiSdk.sdk.session import ModelSession
+from FormalAiSdk.sdk.store import SessionStore
+from FormalAiSdk.sdk.types import Message
+from FormalAiSdk.tests.sdk.test_fork import MockExecutor
+
+def test_round_trips_messages():
+    messages = [
+        Message("user", "Hello", datetime(2025, 5, 13, 12, 0, 0, 123456)),
+        Message("bot", "héllo ✓", metadata={"prompt_tokens": 3}),
+        Message("user", ""),
+    ]
+    columns = MessageColumns(messages)
+
+    assert len(columns) == 3
+    assert list(columns) == messages
+    assert columns[-2] == messages[1]
+    assert columns[1:] == messages[1:]
+    assert columns.actor(2) == "user" and columns.content(1) == "héllo ✓"
+    with pytest.raises(IndexError):
+        columns[3]
+
+def test_materialized_messages_are_copies():
+    columns = MessageColumns([Message("bot", "Hi", metadata={"a": 1})])
+    message = columns[0]
+    message.content = "changed"
+    message.metadata["a"] = 2
+    assert columns[0].content == "Hi"
+    assert columns[0].metadata == {"a": 1}
+
+def test_columns_are_smaller_than_messages():
+    messages = [Message("user" if i % 2 else "assistant", f"message {i}") for i in range(1000)]
+    columns = MessageColumns(messages)
+    object_bytes = sum(sys.getsizeof(m) + sys.getsizeof(m.content) + sys.getsizeof(m.timestamp) + sys.getsizeof(m.metadata) for m in messages)
+    assert columns.nbytes * 4 < object_bytes
+
+def test_session_archive_keeps_newest_history():
+    session = ModelSession("user", executor=MockExecutor())
+    for i in range(10):
+        session.add_response("user", f"message {i}")
+    before = session.snapshot()
+
+    assert session.archive(keep_last=3) == 7
+    assert [m.content for m in session.messages] == ["message 7", "message 8", "message 9"]
+    assert [m.content for m in session.archived] == [f"message {i}" for i in range(7)]
+    assert len(session.get_conversation_history().messages) == 3
+    assert session.archive(keep_last=3) == 0
+    with pytest.raises(ValueError):
+        session.checkout(before)
+
+def test_branches_do_not_see_later_archiving():
+    session = ModelSession("user")
+    for i in range(4):
+        session.add_response("user", f"message {i}")
+    session.archive(keep_last=2)
+    child = session.branch()
+    session.archive()
+
+    assert len(session.archived) == 4
+    assert len(child.archived) == 2
+    with pytest.raises(ValueError):
+        child.archive()
+
+def test_store_keeps_archive(tmp_path):
+    store = SessionStore(str(tmp_path), max_resident_sessions=1)
+    session = store.create("a", "user")
+    for i in range(5):
+        session.add_response("user", f"message {i}")
+    session.archive(keep_last=1)
+    store.create("b", "user")
+
+    reloaded = store.get("a")
+    assert [m.content for m in reloaded.archived] == [f"message {i}" for i in range(4)]
+    assert [m.content for m in reloaded.messages] == ["message 4"]
@@ -2,11 +2,14 @@
 Tests for the SDK fork management.
 """
 
+import asyncio
+
 import pytest
 from FormalAiSdk.core.types import Message as CoreMessage, Role
 from FormalAiSdk.core.executor import ModelExecutor
 from FormalAiSdk.sdk.session import ModelSession
 from FormalAiSdk.sdk.fork import ModelFork
+from FormalAiSdk.tests._util.executors import StreamingExecutor
 
 class MockExecutor(ModelExecutor):
     """Mock executor that returns predefined responses."""
@@ -122,3 +125,79 @@ def test_fork_conversation_content(actor, test_session):
     assert last_conversation.messages[2].role == Role.AGENT
     assert last_conversation.messages[3].content == "Fork message"
     assert last_conversation.messages[3].role == Role.CLIENT
+
+def test_answer_async(actor, test_session):
+    """Test that AnswerAsync awaits aexecute and appends the response."""
+    class AsyncExecutor(ModelExecutor):
+        def execute(self, conversation):
+            raise AssertionError("sync execute should not be used")
+
+        async def aexecute(self, conversation):
+            return CoreMessage(role=Role.AGENT, content=f"Async {len(conversation.messages)}")
+
+    test_session.add_response(actor, "Hello")
+    fork = ModelFork("fork1", actor, "Hi", AsyncExecutor())
+    asyncio.run(fork.AnswerAsync(test_session))
+
+    assert len(test_session.messages) == 2
+    assert test_session.messages[1].actor == "fork1"
+    assert test_session.messages[1].content == "Async 2"
+
+def test_answer_async_many_sessions(actor):
+    """Test that many sessions can be answered concurrently on one loop."""
+    class SlowAsyncExecutor(ModelExecutor):
+        def execute(self, conversation):
+            raise AssertionError("sync execute should not be used")
+
+        async def aexecute(self, conversation):
+            await asyncio.sleep(0.01)
+            return CoreMessage(role=Role.AGENT, content=conversation.messages[-1].content)
+
+    executor = SlowAsyncExecutor()
+    sessions = [ModelSession(actor, executor=executor) for _ in range(50)]
+
+    async def run_all():
+        await asyncio.gather(*(
+            ModelFork("fork1", actor, f"Message {i}", executor).AnswerAsync(session)
+            for i, session in enumerate(sessions)
+        ))
+
+    asyncio.run(run_all())
+
+    for i, session in enumerate(sessions):
+        assert session.messages[-1].content == f"Message {i}"
+
+def test_answer_stream(actor, test_session):
+    """Test that AnswerStream grows the session message as deltas arrive."""
+    test_session.add_response(actor, "Hello")
+    fork = ModelFork("fork1", actor, "Hi", StreamingExecutor(["Hel", "lo ", "there"]))
+
+    seen = []
+    for delta in fork.AnswerStream(test_session):
+        # The response is visible in the session while streaming
+        seen.append((delta, test_session.messages[-1].content))
+
+    assert seen == [("Hel", "Hel"), ("lo ", "Hello "), ("there", "Hello there")]
+    response = test_session.messages[-1]
+    assert len(test_session.messages) == 2
+    assert response.actor == "fork1"
+    assert response.content == "Hello there"
+    assert response.metadata["completion_chunks"] == 3
+    assert response.metadata["total_latency"] >= 0
+    assert response.metadata["time_to_first_token"] >= 0
+    assert "tokens_per_second" in response.metadata
+    assert "incomplete" not in response.metadata
+    # The session's core view picked up the streamed content
+    assert test_session.get_conversation_history().messages[-1].content == "Hello there"
+
+def test_answer_stream_failure_marks_message(actor, test_session):
+    """Test that a failed stream keeps the partial message marked incomplete."""
+    fork = ModelFork("fork1", actor, "Hi", StreamingExecutor(["a", "b", "c"], fail_after=2))
+
+    with pytest.raises(RuntimeError):
+        for _ in fork.AnswerStream(test_session):
+            pass
+
+    assert test_session.messages[-1].content == "ab"
+    assert test_session.messages[-1].metadata["incomplete"] is True
+    assert test_session.get_conversation_history().messages[-1].content == "ab"
@@ -2,14 +2,21 @@
 Tests for the SDK session management.
 """
 
+import asyncio
+import threading
+import time
 from datetime import datetime
 import pytest
 
 from FormalAiSdk.sdk.types import Message
 from FormalAiSdk.sdk.session import ModelSession
 from FormalAiSdk.sdk.fork import ModelFork
-from FormalAiSdk.core.types import Role, Conversation
+from FormalAiSdk.core.types import Role, Conversation, Message as CoreMessage
+from FormalAiSdk.core.executor import ModelExecutor
+from FormalAiSdk.core.tokens import estimate_message_tokens, estimate_tokens
+from FormalAiSdk.sdk import session as session_module
 from FormalAiSdk.tests.sdk.test_fork import MockExecutor
+from FormalAiSdk.tests._util.executors import EchoExecutor, ScriptedExecutor
 
 @pytest.fixture
 def actor():
@@ -82,3 +89,344 @@ def test_fork_without_executor(actor):
     
     with pytest.raises(ValueError):
         session.Fork("fork1", actor, "Hello")
+
+def test_run_forks_preserves_fork_order(actor):
+    """Test that responses are appended in fork order, not completion order."""
+    executor = EchoExecutor({"slow": 0.05, "fast": 0.0})
+    session = ModelSession(actor, executor=executor)
+    session.add_response(actor, "Hello")
+
+    forks = [session.Fork("a", actor, "slow"), session.Fork("b", actor, "fast")]
+    results = session.run_forks(forks, max_concurrency=2)
+
+    assert [r.fork_id for r in results] == ["a", "b"]
+    assert [m.actor for m in session.messages] == [actor, "a", "b"]
+    assert session.messages[1].content == "echo slow"
+    assert results[0].latency >= results[1].latency
+    assert all(r.error is None for r in results)
+
+def test_run_forks_share_history_snapshot(actor):
+    """Test that each fork sees the history from before the batch started."""
+    seen = []
+
+    class CapturingExecutor(ModelExecutor):
+        def execute(self, conversation):
+            seen.append([m.content for m in conversation.messages])
+            return CoreMessage(role=Role.AGENT, content="ok")
+
+    session = ModelSession(actor, executor=CapturingExecutor())
+    session.add_response(actor, "Hello")
+    session.run_forks([session.Fork("a", actor, "one"), session.Fork("b", actor, "two")], max_concurrency=1)
+
+    assert seen == [["Hello", "one"], ["Hello", "two"]]
+
+def test_run_forks_respects_max_concurrency(actor):
+    """Test that no more than max_concurrency calls are in flight."""
+    executor = EchoExecutor({str(i): 0.01 for i in range(12)})
+    session = ModelSession(actor, executor=executor)
+
+    session.run_forks([session.Fork(f"f{i}", actor, str(i)) for i in range(12)], max_concurrency=3)
+
+    assert len(session.messages) == 12
+    assert 1 < executor.max_in_flight <= 3
+
+def test_run_forks_reraises_after_appending_successes(actor):
+    """Test that a failing fork is re-raised once successful responses are added."""
+    class FailingExecutor(ModelExecutor):
+        def execute(self, conversation):
+            if conversation.messages[-1].content == "bad":
+                raise RuntimeError("boom")
+            return CoreMessage(role=Role.AGENT, content="ok")
+
+    session = ModelSession(actor, executor=FailingExecutor())
+    forks = [session.Fork("a", actor, "good"), session.Fork("b", actor, "bad"), session.Fork("c", actor, "good")]
+
+    with pytest.raises(RuntimeError, match="boom"):
+        session.run_forks(forks)
+    assert [m.actor for m in session.messages] == ["a", "c"]
+
+def test_run_forks_rejects_invalid_concurrency(session, actor):
+    """Test that max_concurrency must be positive."""
+    with pytest.raises(ValueError):
+        session.run_forks([session.Fork("a", actor, "x")], max_concurrency=0)
+
+def test_history_window_keeps_system_pinned_and_newest(actor, estimated_tokens):
+    """Test token-budgeted history drops the oldest unpinned turns."""
+    session = ModelSession(actor)
+    session.add_response("system", "You are terse.")
+    session.add_response(actor, "pinned fact " * 10, {"pinned": True})
+    for i in range(10):
+        session.add_response(actor, f"turn {i} " + "x" * 36)
+
+    window = session.get_history_window(max_tokens=60)
+
+    contents = [msg.content for msg in window.conversation.messages]
+    assert contents[0] == "You are terse."
+    assert contents[1].startswith("pinned fact")
+    assert contents[-1].startswith("turn 9")
+    assert not any(content.startswith("turn 0") for content in contents)
+    assert window.tokens <= 60
+    assert window.trimmed_messages == 12 - len(contents)
+    assert window.tokens + window.trimmed_tokens == session.get_history_window(10**6).tokens
+
+def test_history_window_keeps_newest_message_over_budget(actor, estimated_tokens):
+    session = ModelSession(actor)
+    session.add_response(actor, "old")
+    session.add_response(actor, "y" * 400)
+
+    window = session.get_history_window(max_tokens=10)
+
+    assert [msg.content for msg in window.conversation.messages] == ["y" * 400]
+    assert window.trimmed_messages == 1
+
+def test_history_window_tokenizes_only_kept_messages_once(actor, estimated_tokens, monkeypatch):
+    """Test that windowing walks back from the newest message and caches counts."""
+    counted = []
+    def count(content, model=None):
+        counted.append(content)
+        return estimate_message_tokens(content)
+    monkeypatch.setattr(session_module, "count_message_tokens", count)
+    session = ModelSession(actor)
+    session.add_response("system", "You are terse.")
+    for i in range(1000):
+        session.add_response(actor, f"turn {i} " + "x" * 36)
+
+    window = session.get_history_window(max_tokens=60)
+    assert [msg.content for msg in window.conversation.messages][0] == "You are terse."
+    kept = len(window.conversation.messages)
+    assert len(counted) == kept + 1
+    assert window.trimmed_messages == 1001 - kept
+
+    counted.clear()
+    session.add_response(actor, "newest")
+    session.get_history_window(max_tokens=60)
+    assert counted == ["newest"]
+
+def test_max_history_tokens_trims_fork_prompts(actor, estimated_tokens):
+    """Test that forks send windowed history and report trimmed tokens."""
+    executor = EchoExecutor({})
+    sent = []
+    execute = executor.execute
+    executor.execute = lambda conversation: sent.append(conversation) or execute(conversation)
+    session = ModelSession(actor, executor=executor, max_history_tokens=40)
+    for i in range(20):
+        session.add_response(actor, f"message {i} " + "z" * 40)
+
+    session.Fork("fork", actor, "question").Answer(session)
+
+    messages = sent[-1].messages
+    assert len(messages) < 21
+    assert messages[-1].content == "question"
+    assert session.messages[-1].metadata["trimmed_tokens"] > 0
+    assert session.usage.totals().trimmed_tokens == session.messages[-1].metadata["trimmed_tokens"]
+
+def test_branch_shares_history_and_appends_independently(session, actor):
+    session.add_response(actor, "Hello")
+    left, right = session.branch(), session.branch()
+
+    left.add_response("left", "Idea A")
+    right.add_response("right", "Idea B")
+    session.add_response(actor, "Trunk moves on")
+
+    assert [m.content for m in left.messages] == ["Hello", "Idea A"]
+    assert [m.content for m in right.messages] == ["Hello", "Idea B"]
+    assert [m.content for m in session.messages] == ["Hello", "Trunk moves on"]
+    # The shared prefix is the same Message object, not a copy
+    assert left.messages[0] is session.messages[0]
+    assert left.messages.shares_prefix(right.messages) == 1
+
+def test_fork_answers_on_branch(session, actor):
+    session.add_response(actor, "Hello")
+    child = session.branch()
+    child.Fork("fork", actor, "Question").Answer(child)
+
+    assert len(child.messages) == 2
+    assert len(session.messages) == 1
+    assert child.usage is session.usage
+
+def test_merge_adopts_branch_when_parent_unchanged(session, actor):
+    session.add_response(actor, "Hello")
+    child = session.branch()
+    child.add_response("idea", "Idea")
+
+    merged = session.merge(child)
+
+    assert [m.content for m in merged] == ["Idea"]
+    assert [m.content for m in session.messages] == ["Hello", "Idea"]
+    with pytest.raises(ValueError):
+        child.add_response(actor, "Too late")
+
+def test_merge_appends_after_parent_moved_on(session, actor):
+    session.add_response(actor, "Hello")
+    child = session.branch()
+    grandchild = child.branch()
+    grandchild.add_response("deep", "Deep idea")
+    child.merge(grandchild)
+    session.add_response(actor, "Meanwhile")
+
+    session.merge(child)
+
+    assert [m.content for m in session.messages] == ["Hello", "Meanwhile", "Deep idea"]
+
+def test_merge_rejects_foreign_or_closed_branches(session, actor):
+    other = ModelSession(actor)
+    with pytest.raises(ValueError):
+        session.merge(other.branch())
+
+    child = session.branch()
+    child.discard()
+    assert len(child.messages) == 0
+    with pytest.raises(ValueError):
+        session.merge(child)
+    with pytest.raises(ValueError):
+        child.Fork("fork", actor, "x")
+
+def test_core_view_is_extended_not_rebuilt(session, actor):
+    session.add_response(actor, "Hello")
+    session.add_response("bot", "Hi")
+    before = session.get_conversation_history()
+
+    session.add_response(actor, "How are you?")
+    after = session.get_conversation_history()
+
+    # The new view shares the previous view's messages instead of re-mapping them
+    assert after.messages.shares_prefix(before.messages) == 2
+    assert after.messages[0] is before.messages[0]
+    assert [m.role for m in after.messages] == [Role.CLIENT, Role.AGENT, Role.CLIENT]
+    assert session.get_conversation_history() is after
+    assert session.get_history_window().tokens == estimate_tokens(after)
+
+def test_core_view_include_last_n(session, actor):
+    for i in range(5):
+        session.add_response(actor, f"message {i}")
+
+    assert [m.content for m in session.get_conversation_history(include_last_n=2).messages] == ["message 3", "message 4"]
+    assert len(session.get_conversation_history(include_last_n=0).messages) == 5
+    assert len(session.get_conversation_history(include_last_n=10).messages) == 5
+
+def test_core_view_follows_branches_and_assignment(session, actor):
+    session.add_response(actor, "Hello")
+    child = session.branch()
+    child.add_response("idea", "Idea")
+    assert [m.content for m in session.get_conversation_history().messages] == ["Hello"]
+
+    session.merge(child)
+    assert [m.content for m in session.get_conversation_history().messages] == ["Hello", "Idea"]
+
+    session.messages = [Message(actor="system", content="Be brief")]
+    assert [m.role for m in session.get_conversation_history().messages] == [Role.SYSTEM]
+
+def test_snapshots_share_history(session, actor):
+    session.add_response(actor, "Hello")
+    first = session.snapshot("start")
+    session.add_response("bot", "Hi")
+    second = session.snapshot()
+
+    assert second.parent_id == first.id
+    assert second.messages.shares_prefix(first.messages) == 1
+    assert [s.label for s in session.snapshots] == ["start", None]
+
+def test_snapshots_do_not_keep_materialized_history(session, actor):
+    session.add_response(actor, "Hello")
+    snapshot = session.snapshot()
+    assert [m.content for m in session.messages] == ["Hello"]
+    session.get_conversation_history()
+
+    session.checkout(snapshot)
+    assert [m.content for m in session.messages] == ["Hello"]
+    assert snapshot.messages._items is None
+    assert snapshot.conversation.messages._items is None
+
+def test_checkout_restores_history_and_view(session, actor):
+    session.add_response(actor, "Hello")
+    start = session.snapshot()
+    session.add_response("bot", "Wrong turn")
+    wrong = session.snapshot("wrong")
+
+    session.checkout(start)
+    assert [m.content for m in session.messages] == ["Hello"]
+    assert [m.content for m in session.get_conversation_history().messages] == ["Hello"]
+
+    session.add_response("bot", "Better turn")
+    session.checkout(wrong.id)
+    assert [m.content for m in session.messages] == ["Hello", "Wrong turn"]
+    with pytest.raises(ValueError):
+        session.checkout(99)
+    with pytest.raises(ValueError):
+        session.checkout(ModelSession(actor).snapshot())
+
+def test_diff_between_snapshots(session, actor):
+    session.add_response(actor, "Hello")
+    start = session.snapshot()
+    session.add_response("bot", "A")
+    a = session.snapshot()
+    session.checkout(start)
+    session.add_response("bot", "B")
+    session.add_response(actor, "C")
+
+    diff = session.diff(a)
+    assert diff.common == 1
+    assert [m.content for m in diff.removed] == ["A"]
+    assert [m.content for m in diff.added] == ["B", "C"]
+    assert session.diff(start, a).added == [a.messages[-1]]
+    assert session.diff(a, a).added == []
+
+def test_concurrent_forks_commit_in_creation_order(actor):
+    session = ModelSession(actor, executor=EchoExecutor({str(i): 0.05 - i * 0.01 for i in range(5)}))
+    forks = [session.Fork(f"fork{i}", actor, str(i)) for i in range(5)]
+    assert [fork.sequence for fork in forks] == sorted(fork.sequence for fork in forks)
+
+    started = threading.Barrier(len(forks))
+    def answer(fork):
+        started.wait()
+        fork.Answer(session)
+    threads = [threading.Thread(target=answer, args=(fork,)) for fork in forks]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert [m.actor for m in session.messages] == [f"fork{i}" for i in range(5)]
+
+def test_concurrent_async_forks_commit_in_creation_order(actor):
+    session = ModelSession(actor, executor=EchoExecutor({str(i): 0.05 - i * 0.01 for i in range(5)}))
+    forks = [session.Fork(f"fork{i}", actor, str(i)) for i in range(5)]
+
+    async def run_all():
+        await asyncio.gather(*(fork.AnswerAsync(session) for fork in reversed(forks)))
+
+    asyncio.run(run_all())
+    assert [m.actor for m in session.messages] == [f"fork{i}" for i in range(5)]
+
+def test_failed_fork_does_not_block_later_forks(actor):
+    session = ModelSession(actor, executor=EchoExecutor())
+    first, second = session.Fork("first", actor, "a"), session.Fork("second", actor, "b")
+    first.executor = ScriptedExecutor("down", [RuntimeError("model down")], delay=0.02)
+    errors = []
+    def answer_first():
+        try:
+            first.Answer(session)
+        except RuntimeError as e:
+            errors.append(e)
+    thread = threading.Thread(target=answer_first)
+    thread.start()
+    time.sleep(0.005)  # let the first fork start answering
+    second.Answer(session)
+    thread.join()
+
+    assert len(errors) == 1
+    assert [m.actor for m in session.messages] == ["second"]
+
+def test_concurrent_appends_are_not_lost(session, actor):
+    def add(worker):
+        for i in range(200):
+            session.add_response(actor, f"{worker}-{i}")
+    threads = [threading.Thread(target=add, args=(w,)) for w in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(session.messages) == 1600
+    assert len(session.get_conversation_history().messages) == 1600
+    assert session.get_history_window().tokens == estimate_tokens(session.get_conversation_history())
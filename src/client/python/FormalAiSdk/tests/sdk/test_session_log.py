@@ -0,0 +1,88 @@
+"""
+Tests for the append-only session log and resuming logged sessions.
+"""
+
+import os
+import pytest
+
+from FormalAiSdk.sdk.types import Message
+from FormalAiSdk.sdk.session import ModelSession
+from FormalAiSdk.sdk.session_log import SessionLog
+from FormalAiSdk.tests.sdk.test_fork import MockExecutor
+from FormalAiSdk.tests._util.executors import StreamingExecutor
+from FormalAiSdk.sdk.fork import ModelFork
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "session.jsonl")
+
+def test_append_read_and_tail(path):
+    with SessionLog(path) as log:
+        log.append(Message("user", "Hello", metadata={"pinned": True}))
+        log.extend([Message("bot", f"line {i}\nwith newline") for i in range(5)])
+
+        assert len(log) == 6
+        assert log[0].content == "Hello"
+        assert log[0].metadata == {"pinned": True}
+        assert [m.content for m in log.tail(2)] == ["line 3\nwith newline", "line 4\nwith newline"]
+        assert [m.content for m in log.read(1, 3)] == ["line 0\nwith newline", "line 1\nwith newline"]
+        assert log.tail(0) == []
+        assert log[-1].timestamp is not None
+
+def test_reopen_keeps_records(path):
+    with SessionLog(path) as log:
+        log.extend([Message("user", str(i)) for i in range(100)])
+    with SessionLog(path) as log:
+        assert len(log) == 100
+        assert [m.content for m in log.tail(3)] == ["97", "98", "99"]
+        log.append(Message("user", "100"))
+        assert log[100].content == "100"
+
+def test_recovers_from_interrupted_appends(path):
+    with SessionLog(path) as log:
+        log.extend([Message("user", str(i)) for i in range(3)])
+    # A record written without its index entry, then a partial record
+    with open(path, "ab") as f:
+        f.write(SessionLog._encode(Message("user", "3")))
+        f.write(b'{"actor": "user", "cont')
+
+    with SessionLog(path) as log:
+        assert [m.content for m in log.read()] == ["0", "1", "2", "3"]
+        log.append(Message("user", "4"))
+        assert log[-1].content == "4"
+
+    # Index entries pointing past the end of the data are dropped
+    with open(path, "r+b") as f:
+        f.truncate(os.path.getsize(path) - 5)
+    with SessionLog(path) as log:
+        assert [m.content for m in log.read()] == ["0", "1", "2", "3"]
+
+def test_session_resumes_tail(path):
+    session = ModelSession.open(path, "user", executor=MockExecutor())
+    for i in range(20):
+        session.add_response("user" if i % 2 else "bot", f"message {i}")
+    session.Fork("fork", "user", "question").Answer(session)
+    session.close()
+
+    resumed = ModelSession.open(path, "user", tail=3, executor=MockExecutor())
+    assert len(resumed.log) == 21
+    assert [m.content for m in resumed.messages][:2] == ["message 18", "message 19"]
+    assert resumed.messages[-1].actor == "fork"
+    assert resumed.get_conversation_history(include_last_n=2).messages[0].content == "message 19"
+    resumed.close()
+
+def test_session_logs_streams_and_merges(path):
+    session = ModelSession.open(path, "user")
+    fork = ModelFork("fork", "user", "Hi", StreamingExecutor(["Hel", "lo"]))
+    for _ in fork.AnswerStream(session):
+        pass
+    child = session.branch()
+    child.add_response("idea", "Idea")
+    assert len(session.log) == 1
+    session.merge(child)
+    session.close()
+
+    with SessionLog(path) as log:
+        messages = log.read()
+    assert [m.content for m in messages] == ["Hello", "Idea"]
+    assert messages[0].metadata["completion_chunks"] == 2
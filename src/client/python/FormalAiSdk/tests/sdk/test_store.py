@@ -0,0 +1,146 @@
+"""
+Tests for the spilling SessionStore.
+"""
+
+import gc
+import threading
+import pytest
+
+from FormalAiSdk.sdk.session import ModelSession
+from FormalAiSdk.sdk.store import SessionStore, estimate_session_bytes
+from FormalAiSdk.tests.sdk.test_fork import MockExecutor
+
+@pytest.fixture
+def executor():
+    return MockExecutor()
+
+def fill(session, n, size=100):
+    for i in range(n):
+        session.add_response("user", f"{i} " + "x" * size)
+
+def test_spills_least_recently_used(tmp_path, executor):
+    store = SessionStore(str(tmp_path), max_resident_sessions=2, executor=executor)
+    a = store.create("a", "user")
+    fill(a, 3)
+    store.create("b", "user")
+    store.get("a")
+    store.create("c", "user")
+
+    stats = store.stats_snapshot()
+    assert stats.evictions == 1
+    assert stats.resident_sessions == 2
+    assert len(store) == 3
+    # b was least recently used; its key is still stored
+    with pytest.raises(ValueError):
+        store.create("b", "user")
+
+def test_evicted_session_stays_usable(tmp_path, executor):
+    store = SessionStore(str(tmp_path), max_resident_sessions=1, executor=executor)
+    a = store.create("a", "user")
+    store.create("b", "user")
+    assert store.stats_snapshot().evictions == 1
+
+    # Committing to the evicted object makes it resident again
+    a.Fork("fork", "user", "question").Answer(a)
+    assert store.get("a") is a
+    assert store.stats_snapshot().loads == 0
+
+    b = store.get("b")
+    assert store.get("a") is a
+    b.add_response("user", "late")
+    store.close()
+    reopened = SessionStore(str(tmp_path), executor=executor)
+    assert [m.actor for m in reopened.get("a").messages] == ["fork"]
+    assert [m.content for m in reopened.get("b").messages] == ["late"]
+
+def test_putting_a_stored_session_again_keeps_it_open(tmp_path, executor):
+    store = SessionStore(str(tmp_path), max_resident_sessions=1, executor=executor)
+    session = ModelSession.open(str(tmp_path / "a.jsonl"), "user", executor=executor)
+    store.put("a", session)
+    store.put("a", session)
+    store.create("b", "user")
+    store.put("a", session)
+
+    session.add_response("user", "logged")
+    assert store.get("a") is session
+    assert [m.content for m in session.log.read()] == ["logged"]
+    assert session.estimated_tokens > 0
+
+def test_get_or_create(tmp_path, executor):
+    store = SessionStore(str(tmp_path), executor=executor)
+    session = store.get_or_create("a", "user")
+    assert store.get_or_create("a", "other") is session
+    assert session.actor == "user"
+
+def test_reloads_history_usage_and_executor(tmp_path, executor, estimated_tokens):
+    store = SessionStore(str(tmp_path), max_resident_sessions=1, executor=executor, max_history_tokens=500)
+    session = store.create("a", "user", token_budget=10_000)
+    fill(session, 5)
+    session.Fork("fork", "user", "question").Answer(session)
+    usage = session.usage.totals()
+    store.create("b", "user")
+    del session
+    gc.collect()
+
+    reloaded = store.get("a")
+    assert store.stats_snapshot().loads == 1
+    assert len(reloaded.messages) == 6
+    assert reloaded.messages[-1].actor == "fork"
+    assert reloaded.usage.totals() == usage
+    assert reloaded.usage.token_budget == 10_000
+    assert reloaded.max_history_tokens == 500
+    assert reloaded.executor is executor
+    assert store.stats_snapshot().loads == 1
+
+def test_byte_ceiling_and_reopen(tmp_path, executor):
+    store = SessionStore(str(tmp_path), max_resident_bytes=20_000, executor=executor)
+    for key in ("a", "b", "c"):
+        fill(store.create(key, "user"), 10, size=1_000)
+        store.get(key)
+
+    stats = store.stats_snapshot()
+    assert stats.evictions >= 1
+    assert stats.resident_bytes <= 20_000
+    assert stats.resident_bytes == estimate_session_bytes(store.get("c"))
+
+    store.close()
+    reopened = SessionStore(str(tmp_path), executor=executor)
+    assert reopened.keys() == ["a", "b", "c"]
+    assert len(reopened.get("b").messages) == 10
+    reopened.delete("b")
+    assert "b" not in reopened
+    with pytest.raises(KeyError):
+        reopened.get("b")
+
+def test_concurrent_access(tmp_path, executor):
+    store = SessionStore(str(tmp_path), max_resident_sessions=3, executor=executor)
+    for i in range(8):
+        store.create(str(i), "user")
+    errors = []
+
+    def worker(offset):
+        try:
+            for j in range(50):
+                key = str((offset + j) % 8)
+                with store.use(key) as session:
+                    session.add_response("user", f"{offset}-{j}")
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert sum(len(store.get(str(i)).messages) for i in range(8)) == 200
+
+def test_pinned_sessions_stay_resident(tmp_path, executor):
+    store = SessionStore(str(tmp_path), max_resident_sessions=1, executor=executor)
+    store.create("a", "user")
+    with store.use("a") as a:
+        store.create("b", "user")
+        a.add_response("user", "still usable")
+    assert store.stats_snapshot().resident_sessions == 1
+    assert store.get("a").messages[-1].content == "still usable"
@@ -0,0 +1,92 @@
+"""
+Tests for session token usage and latency accounting.
+"""
+
+import pytest
+
+from FormalAiSdk.core.executor import ModelExecutor
+from FormalAiSdk.core.types import Message as CoreMessage, Role
+from FormalAiSdk.exceptions import BudgetExceededError
+from FormalAiSdk.sdk.session import ModelSession
+from FormalAiSdk.sdk.usage import SessionUsage, UsageTotals
+
+class UsageExecutor(ModelExecutor):
+    """Executor reporting fixed usage metadata."""
+    def __init__(self, prompt_tokens=10, completion_tokens=5):
+        self.prompt_tokens = prompt_tokens
+        self.completion_tokens = completion_tokens
+        self.calls = 0
+
+    def execute(self, conversation):
+        self.calls += 1
+        return CoreMessage(role=Role.AGENT, content="ok", metadata={
+            "model": "test-model",
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "cached_tokens": 2,
+            "network_latency": 0.5,
+            "total_latency": 0.75,
+        })
+
+@pytest.fixture
+def actor():
+    return "test_user"
+
+def test_usage_totals_skip_cached_responses():
+    totals = UsageTotals()
+    totals.add({"prompt_tokens": 10, "completion_tokens": 5, "total_latency": 1.0})
+    totals.add({"prompt_tokens": 10, "completion_tokens": 5, "cache": "memory"})
+    assert totals.calls == 2
+    assert totals.cache_hits == 1
+    assert totals.total_tokens == 15
+    assert totals.total_latency == 1.0
+
+def test_answer_records_usage_per_fork_and_actor(actor):
+    session = ModelSession(actor, executor=UsageExecutor())
+    session.Fork("a", actor, "Hello").Answer(session)
+    session.Fork("a", actor, "Again").Answer(session)
+    session.Fork("b", "other", "Hi").Answer(session)
+
+    totals = session.usage.totals()
+    assert totals.calls == 3
+    assert totals.prompt_tokens == 30
+    assert totals.completion_tokens == 15
+    assert totals.cached_tokens == 6
+    assert totals.network_latency == pytest.approx(1.5)
+    assert session.usage.by_fork()["a"].calls == 2
+    assert session.usage.by_fork()["b"].total_tokens == 15
+    assert session.usage.by_actor()[actor].calls == 2
+    assert session.usage.by_actor()["other"].calls == 1
+    # Usage metadata is kept on the session message
+    assert session.messages[-1].metadata["model"] == "test-model"
+
+def test_run_forks_records_usage(actor):
+    session = ModelSession(actor, executor=UsageExecutor())
+    results = session.run_forks([session.Fork(f"f{i}", actor, "x") for i in range(3)])
+
+    assert session.usage.totals().calls == 3
+    assert all(result.metadata["prompt_tokens"] == 10 for result in results)
+
+def test_budget_blocks_call_before_it_is_sent(actor):
+    executor = UsageExecutor(prompt_tokens=40, completion_tokens=40)
+    session = ModelSession(actor, executor=executor, token_budget=100)
+
+    session.Fork("a", actor, "Hello").Answer(session)
+    assert session.usage.remaining == 20
+
+    with pytest.raises(BudgetExceededError):
+        session.Fork("a", actor, "x" * 200).Answer(session)
+    assert executor.calls == 1
+    assert len(session.messages) == 1
+
+def test_budget_checks_whole_fork_batch(actor):
+    executor = UsageExecutor()
+    session = ModelSession(actor, executor=executor, token_budget=50)
+
+    with pytest.raises(BudgetExceededError):
+        session.run_forks([session.Fork(f"f{i}", actor, "x" * 40) for i in range(5)])
+    assert executor.calls == 0
+
+def test_negative_budget_is_rejected():
+    with pytest.raises(ValueError):
+        SessionUsage(token_budget=-1)
@@ -0,0 +1,40 @@
+"""
+Tests for the benchmark suite runner and its result comparison.
+"""
+
+import json
+
+from ..benchmarks import suite
+
+def result(**medians):
+    return {"benchmarks": {name: {"median": median} for name, median in medians.items()}}
+
+def test_run_filters_and_reports_medians():
+    results = suite.run("executor.noop", rounds=2, min_time=0.001, log=lambda line: None)
+
+    assert list(results["benchmarks"]) == ["executor.noop"]
+    stats = results["benchmarks"]["executor.noop"]
+    assert stats["rounds"] == 2
+    assert stats["min"] <= stats["median"]
+    json.dumps(results)
+
+def test_compare_flags_regressions_over_threshold():
+    baseline = result(fast=1.0, steady=1.0, gone=1.0)
+    current = result(fast=0.5, steady=1.05, new=1.0)
+    current["benchmarks"]["slow"] = {"median": 1.5}
+    baseline["benchmarks"]["slow"] = {"median": 1.0}
+
+    lines, regressions = suite.compare(baseline, current, threshold=0.1)
+
+    assert regressions == ["slow"]
+    assert any("improved" in line for line in lines if line.startswith("fast"))
+    assert any("only in baseline" in line for line in lines)
+    assert any("only in current" in line for line in lines)
+
+def test_compare_command_exit_status(tmp_path):
+    baseline, current = tmp_path / "baseline.json", tmp_path / "current.json"
+    baseline.write_text(json.dumps(result(a=1.0)))
+    current.write_text(json.dumps(result(a=2.0)))
+
+    assert suite.main(["compare", str(baseline), str(baseline)]) == 0
+    assert suite.main(["compare", str(baseline), str(current)]) == 1
@@ -0,0 +1,127 @@
+"""
+Tests for the two-tier response cache.
+"""
+
+import asyncio
+
+import pytest
+
+from ..core.caching_executor import CachingExecutor
+from ..core.request_key import request_key
+from ..core.types import Conversation, Role
+from ._util.executors import CountingExecutor
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+def conversation(text="Yes or no?"):
+    return Conversation().add_message(Role.SYSTEM, "Answer yes or no.").add_message(Role.CLIENT, text)
+
+def test_request_key_is_canonical():
+    """Test that keys ignore insignificant whitespace but not model or content."""
+    executor = CountingExecutor()
+    assert request_key(executor, conversation("Yes or no?")) == request_key(executor, conversation(" Yes or no?\r\n"))
+    assert request_key(executor, conversation("Yes or no?")) != request_key(executor, conversation("Maybe?"))
+    assert request_key(executor, conversation()) != request_key(CountingExecutor("other"), conversation())
+
+def test_memory_hit_skips_executor():
+    inner = CountingExecutor()
+    executor = CachingExecutor(inner)
+
+    first = executor.execute(conversation())
+    second = executor.execute(conversation())
+
+    assert inner.calls == 1
+    assert second.content == first.content == "response 1"
+    assert second.metadata == {"model": "test-model", "cache": "memory"}
+    assert "cache" not in first.metadata
+    assert executor.stats.memory_hits == 1
+    assert executor.stats.misses == 1
+    assert executor.stats.hit_rate == 0.5
+
+def test_memory_tier_is_lru_bounded():
+    inner = CountingExecutor()
+    executor = CachingExecutor(inner, max_entries=2)
+
+    for text in ("a", "b", "a", "c"):  # "b" is least recently used when "c" arrives
+        executor.execute(conversation(text))
+    executor.execute(conversation("a"))
+    executor.execute(conversation("b"))
+
+    assert executor.stats.memory_evictions == 2
+    assert inner.calls == 4
+
+def test_memory_ttl_expires_entries():
+    clock = Clock()
+    inner = CountingExecutor()
+    executor = CachingExecutor(inner, ttl=60, clock=clock)
+
+    executor.execute(conversation())
+    clock.now += 61
+    executor.execute(conversation())
+
+    assert inner.calls == 2
+    assert executor.stats.expired == 1
+
+def test_disk_tier_survives_new_executor(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    first = CachingExecutor(CountingExecutor(), path=path)
+    first.execute(conversation())
+    first.close()
+
+    inner = CountingExecutor()
+    second = CachingExecutor(inner, path=path)
+    response = second.execute(conversation())
+    again = second.execute(conversation())
+    second.close()
+
+    assert inner.calls == 0
+    assert response.content == "response 1"
+    assert response.metadata["cache"] == "disk"
+    assert again.metadata["cache"] == "memory"
+    assert second.stats.disk_hits == 1
+
+def test_disk_tier_evicts_by_size(tmp_path):
+    inner = CountingExecutor()
+    executor = CachingExecutor(inner, max_entries=1, path=str(tmp_path / "cache.sqlite"), max_disk_bytes=200)
+
+    for text in ("a", "b", "c"):
+        executor.execute(conversation(text))
+    executor.close()
+
+    assert executor.stats.disk_evictions >= 1
+
+def test_disk_ttl_expires_entries(tmp_path):
+    clock = Clock()
+    inner = CountingExecutor()
+    executor = CachingExecutor(inner, max_entries=1, path=str(tmp_path / "cache.sqlite"), disk_ttl=10, clock=clock)
+
+    executor.execute(conversation("a"))
+    executor.execute(conversation("b"))  # pushes "a" out of memory
+    clock.now += 11
+    executor.execute(conversation("a"))
+    executor.close()
+
+    assert inner.calls == 3
+    assert executor.stats.expired == 1
+
+def test_async_and_stream_share_the_cache():
+    inner = CountingExecutor()
+    executor = CachingExecutor(inner)
+
+    streamed = "".join(executor.stream(conversation("s")))
+    replayed = list(executor.stream(conversation("s")))
+    awaited = asyncio.run(executor.aexecute(conversation("s")))
+
+    assert streamed == "streamed 1"
+    assert replayed == ["streamed 1"]
+    assert awaited.content == "streamed 1"
+    assert inner.calls == 1
+
+def test_invalid_size_is_rejected():
+    with pytest.raises(ValueError):
+        CachingExecutor(CountingExecutor(), max_entries=0)
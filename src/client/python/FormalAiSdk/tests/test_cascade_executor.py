@@ -0,0 +1,157 @@
+"""
+Tests for the cascading fallback executor and its circuit breakers.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from ..core.cascade_executor import CascadeExecutor, CascadeTier, CircuitBreaker
+from ..core.types import Conversation, Role
+from ..exceptions import ModelError
+from ._util.executors import ScriptedExecutor
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def conversation():
+    return (Conversation()
+            .add_message(Role.SYSTEM, "Long system prompt")
+            .add_message(Role.CLIENT, "Show the current status"))
+
+def test_first_valid_tier_wins():
+    local = ScriptedExecutor("local", ["git status"])
+    smart = ScriptedExecutor("smart", ["git status"])
+    executor = CascadeExecutor([local, smart])
+
+    response = executor.execute(conversation())
+
+    assert response.metadata["cascade_tier"] == 0
+    assert response.metadata["cascade_name"] == "local"
+    assert smart.seen == []
+
+def test_invalid_and_failed_tiers_fall_through():
+    local = ScriptedExecutor("local", ["I don't know"])
+    broken = ScriptedExecutor("broken", [RuntimeError("down")])
+    smart = ScriptedExecutor("smart", ["git status"])
+    executor = CascadeExecutor([local, broken, smart], validator=lambda m: m.content.startswith("git "))
+
+    assert executor.execute(conversation()).metadata["cascade_name"] == "smart"
+    stats = executor.tier_stats()
+    assert (stats[0].invalid, stats[1].failures, stats[2].successes) == (1, 1, 1)
+    assert [s.success_rate for s in stats] == [0.0, 0.0, 1.0]
+
+def test_tier_system_prompt_replaces_system_messages():
+    local = ScriptedExecutor("local")
+    executor = CascadeExecutor([CascadeTier(local, system_prompt="Short prompt")])
+
+    executor.execute(conversation())
+
+    messages = local.seen[0].messages
+    assert [(m.role, m.content) for m in messages] == [
+        (Role.SYSTEM, "Short prompt"),
+        (Role.CLIENT, "Show the current status"),
+    ]
+
+def test_timeout_falls_through():
+    slow = ScriptedExecutor("slow", delay=1.0)
+    fast = ScriptedExecutor("fast")
+    executor = CascadeExecutor([CascadeTier(slow, timeout=0.05), fast])
+
+    start = time.perf_counter()
+    assert executor.execute(conversation()).metadata["cascade_name"] == "fast"
+    assert asyncio.run(executor.aexecute(conversation())).metadata["cascade_name"] == "fast"
+    assert time.perf_counter() - start < 0.9
+    assert executor.tier_stats()[0].timeouts == 2
+
+def test_timed_out_calls_do_not_block_later_calls():
+    slow = ScriptedExecutor("slow", delay=0.5)
+    executor = CascadeExecutor([CascadeTier(slow, timeout=0.05), ScriptedExecutor("fast")], failure_threshold=100)
+    # More abandoned calls than a default thread pool has workers
+    for _ in range(40):
+        executor.execute(conversation())
+    slow.delay = 0.0
+
+    assert executor.execute(conversation()).metadata["cascade_name"] == "slow"
+
+def test_raising_validator_falls_through_and_frees_trial():
+    clock = FakeClock()
+    def validator(message):
+        if message.content == "boom":
+            raise ValueError("cannot parse")
+        return True
+    flaky = ScriptedExecutor("flaky", [RuntimeError("down"), "boom"])
+    executor = CascadeExecutor([flaky, ScriptedExecutor("smart")], validator=validator, failure_threshold=1, reset_timeout=10, clock=clock)
+    executor.execute(conversation())
+
+    clock.now = 10
+    assert executor.execute(conversation()).metadata["cascade_name"] == "smart"
+    assert executor.tier_stats()[0].invalid == 1
+    assert executor.breakers[0].state == "open"
+    clock.now = 20
+    assert executor.breakers[0].allow()
+
+def test_breaker_skips_failing_tier_until_reset():
+    clock = FakeClock()
+    broken = ScriptedExecutor("broken", [RuntimeError("down")])
+    smart = ScriptedExecutor("smart")
+    executor = CascadeExecutor([broken, smart], failure_threshold=2, reset_timeout=30, clock=clock)
+
+    for _ in range(4):
+        executor.execute(conversation())
+    assert len(broken.seen) == 2
+    assert executor.tier_stats()[0].skipped == 2
+    assert executor.breakers[0].state == "open"
+
+    # After the cool-down a single trial call goes through; success closes the breaker
+    clock.now = 31
+    broken.outcomes = ["git status"]
+    assert executor.execute(conversation()).metadata["cascade_name"] == "broken"
+    assert executor.breakers[0].state == "closed"
+
+def test_half_open_failure_reopens():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+    breaker.record_failure()
+    assert not breaker.allow()
+    clock.now = 10
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+def test_cancelled_trial_call_frees_half_open_breaker():
+    clock = FakeClock()
+    flaky = ScriptedExecutor("flaky", [RuntimeError("down"), "git status"])
+    executor = CascadeExecutor([flaky, ScriptedExecutor("smart")], failure_threshold=1, reset_timeout=10, clock=clock)
+    executor.execute(conversation())
+    assert executor.breakers[0].state == "open"
+
+    async def cancel_trial():
+        clock.now = 10
+        flaky.delay = 1.0
+        task = asyncio.ensure_future(executor.aexecute(conversation()))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancel_trial())
+    assert flaky.cancelled == 1
+    assert executor.breakers[0].allow()
+
+def test_all_tiers_failing_raises_model_error():
+    executor = CascadeExecutor([ScriptedExecutor("a", [RuntimeError("down")])])
+    with pytest.raises(ModelError, match="a: down"):
+        executor.execute(conversation())
+    with pytest.raises(ModelError):
+        asyncio.run(executor.aexecute(conversation()))
+
+def test_requires_tiers():
+    with pytest.raises(ValueError):
+        CascadeExecutor([])
@@ -0,0 +1,113 @@
+"""
+Tests for single-flight request coalescing.
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from ..core.coalescing_executor import CoalescingExecutor
+from ..core.types import Conversation, Role
+from ._util.executors import EchoExecutor, StreamingExecutor
+
+def conversation(text="Is it raining?"):
+    return Conversation().add_message(Role.CLIENT, text)
+
+def run_threads(executor, texts):
+    results = [None] * len(texts)
+    errors = [None] * len(texts)
+
+    def run(i, text):
+        try:
+            results[i] = executor.execute(conversation(text))
+        except Exception as e:
+            errors[i] = e
+
+    threads = [threading.Thread(target=run, args=(i, text)) for i, text in enumerate(texts)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, errors
+
+def test_identical_concurrent_requests_share_one_call():
+    inner = EchoExecutor(0.05, prefix="answer to ")
+    executor = CoalescingExecutor(inner)
+
+    results, _ = run_threads(executor, ["same"] * 8)
+
+    assert len(inner.calls) == 1
+    assert all(result is results[0] for result in results)
+    assert executor.stats.upstream == 1
+    assert executor.stats.coalesced == 7
+
+def test_different_requests_are_not_coalesced():
+    inner = EchoExecutor(0.05, prefix="answer to ")
+    executor = CoalescingExecutor(inner)
+
+    results, _ = run_threads(executor, ["a", "b", "a"])
+
+    assert len(inner.calls) == 2
+    assert results[0] is results[2]
+    assert results[1].content == "answer to b"
+
+def test_completed_requests_are_not_cached():
+    inner = EchoExecutor(0, prefix="answer to ")
+    executor = CoalescingExecutor(inner)
+
+    executor.execute(conversation())
+    executor.execute(conversation())
+
+    assert len(inner.calls) == 2
+    assert executor.stats.coalesced == 0
+
+def test_errors_reach_every_waiter():
+    inner = EchoExecutor(0.05, error=RuntimeError("provider down"))
+    executor = CoalescingExecutor(inner)
+
+    _, errors = run_threads(executor, ["same"] * 4)
+
+    assert len(inner.calls) == 1
+    assert all(isinstance(error, RuntimeError) for error in errors)
+
+def test_async_requests_share_one_call():
+    inner = EchoExecutor(0.05, prefix="answer to ")
+    executor = CoalescingExecutor(inner)
+
+    async def run_all():
+        return await asyncio.gather(*(executor.aexecute(conversation()) for _ in range(10)))
+
+    results = asyncio.run(run_all())
+
+    assert len(inner.calls) == 1
+    assert all(result is results[0] for result in results)
+    assert executor.stats_snapshot().coalesced == 9
+
+def test_cancelled_async_caller_does_not_cancel_others():
+    inner = EchoExecutor(0.05, prefix="answer to ")
+    executor = CoalescingExecutor(inner)
+
+    async def run():
+        first = asyncio.ensure_future(executor.aexecute(conversation()))
+        second = asyncio.ensure_future(executor.aexecute(conversation()))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        result = await second
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return result
+
+    result = asyncio.run(run())
+
+    assert result.content == "answer to Is it raining?"
+    assert len(inner.calls) == 1
+
+def test_streams_are_passed_through():
+    """Test that streams reach the wrapped executor's stream, each on its own."""
+    executor = CoalescingExecutor(StreamingExecutor(["Hel", "lo"]))
+
+    assert list(executor.stream(conversation())) == ["Hel", "lo"]
+    assert list(executor.stream(conversation())) == ["Hel", "lo"]
+    assert executor.stats_snapshot().upstream == 2
+    assert executor.stats_snapshot().coalesced == 0
@@ -2,6 +2,9 @@
 Tests for the base ModelExecutor class.
 """
 
+import asyncio
+import threading
+
 import pytest
 from ..core.executor import ModelExecutor
 from ..core.types import Conversation, Message, Role
@@ -64,3 +67,30 @@ def test_executor_type_checking():
     ])
     response = executor.execute(conversation)
     assert isinstance(response, Message)
+
+def test_default_aexecute_runs_execute_off_loop():
+    """Test that the default aexecute awaits execute in a worker thread."""
+    loop_thread = threading.get_ident()
+    seen_threads = []
+
+    class TestExecutor(ModelExecutor):
+        def execute(self, conversation: Conversation) -> Message:
+            seen_threads.append(threading.get_ident())
+            return Message(role=Role.AGENT, content=conversation.messages[-1].content)
+
+    conversation = Conversation([
+        Message(role=Role.CLIENT, content="Echo")
+    ])
+    response = asyncio.run(TestExecutor().aexecute(conversation))
+
+    assert response.content == "Echo"
+    assert seen_threads and seen_threads[0] != loop_thread
+
+def test_default_stream_yields_execute_content():
+    """Test that the default stream yields the whole response once."""
+    class TestExecutor(ModelExecutor):
+        def execute(self, conversation: Conversation) -> Message:
+            return Message(role=Role.AGENT, content="Whole response")
+
+    conversation = Conversation([Message(role=Role.CLIENT, content="Hi")])
+    assert list(TestExecutor().stream(conversation)) == ["Whole response"]
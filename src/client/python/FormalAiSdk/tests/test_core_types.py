@@ -2,6 +2,9 @@
 Tests for core data structures in FormalAI SDK.
 """
 
+import copy
+import pickle
+
 import pytest
 from ..core.types import Role, Message, Conversation
 
@@ -49,6 +52,32 @@ def test_message_immutability():
     metadata["key"] = "new_value"
     assert msg.metadata["key"] == "value"
 
+def test_message_is_compact():
+    """Test that Message has no per-instance dict and allocates metadata lazily."""
+    msg = Message(Role.CLIENT, "Hello")
+    assert not hasattr(msg, "__dict__")
+    assert msg._metadata is None
+    
+    # Metadata is allocated on first access and then kept
+    msg.metadata["seen"] = True
+    assert msg.metadata == {"seen": True}
+    
+    with pytest.raises(AttributeError):
+        msg.metadata = {}
+
+def test_message_equality_and_copying():
+    """Test value semantics of Message."""
+    msg = Message(role=Role.AGENT, content="Hi", metadata={"k": 1})
+    assert msg == Message(Role.AGENT, "Hi", {"k": 1})
+    assert msg != Message(Role.AGENT, "Hi")
+    assert Message(Role.AGENT, "Hi") == Message(Role.AGENT, "Hi", {})
+    assert hash(Message(Role.AGENT, "Hi")) == hash(Message(Role.AGENT, "Hi", {}))
+    
+    for clone in (pickle.loads(pickle.dumps(msg)), copy.copy(msg), copy.deepcopy(msg)):
+        assert clone == msg
+        assert clone.metadata == {"k": 1}
+    assert "content='Hi'" in repr(msg)
+
 def test_conversation_creation():
     """Test Conversation class creation."""
     # Test empty conversation
@@ -101,3 +130,28 @@ def test_conversation_message_independence():
     # Verify conversation messages can't be modified externally
     with pytest.raises(AttributeError):
         conv.messages = []
+
+def test_conversation_add_message_shares_history():
+    """Test that conversations derived from a common history share it."""
+    base = Conversation().add_message(Role.CLIENT, "Hello")
+    left = base.add_message(Role.AGENT, "Hi")
+    right = base.add_message(Role.AGENT, "Hey")
+
+    assert [m.content for m in base.messages] == ["Hello"]
+    assert [m.content for m in left.messages] == ["Hello", "Hi"]
+    assert [m.content for m in right.messages] == ["Hello", "Hey"]
+    assert left.messages[0] is right.messages[0]
+    assert left.messages.shares_prefix(right.messages) == 1
+
+def test_conversation_append_extend_and_last():
+    """Test appending existing messages and taking the last N."""
+    first = Message(role=Role.SYSTEM, content="Be brief", metadata={"pinned": True})
+    conv = Conversation().append(first).extend([
+        Message(role=Role.CLIENT, content="Hello"),
+        Message(role=Role.AGENT, content="Hi"),
+    ])
+
+    assert len(conv.messages) == 3
+    assert conv.messages[0] is first
+    assert [m.content for m in conv.last(2).messages] == ["Hello", "Hi"]
+    assert conv == Conversation(list(conv.messages))
@@ -0,0 +1,135 @@
+"""
+Tests for hedged requests across several executors.
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from ..core.hedged_executor import HedgedExecutor
+from ..core.types import Conversation, Role
+from ..exceptions import ModelError
+from ._util.executors import EchoExecutor, ScriptedExecutor
+
+def conversation():
+    return Conversation().add_message(Role.CLIENT, "Hello")
+
+def test_fast_primary_does_not_start_backup():
+    primary, backup = ScriptedExecutor("primary", delay=0.0), ScriptedExecutor("backup", delay=0.0)
+    executor = HedgedExecutor([primary, backup], delay=0.5)
+
+    response = executor.execute(conversation())
+
+    assert response.content == "primary"
+    assert response.metadata["hedge_winner"] == 0
+    assert response.metadata["hedge_launched"] == 1
+    assert backup.started == 0
+
+def test_slow_primary_is_beaten_by_backup():
+    primary, backup = ScriptedExecutor("primary", delay=1.0), ScriptedExecutor("backup", delay=0.0)
+    executor = HedgedExecutor([primary, backup], delay=0.05)
+
+    start = time.perf_counter()
+    response = executor.execute(conversation())
+
+    assert time.perf_counter() - start < 0.5
+    assert response.content == "backup"
+    assert response.metadata["hedge_model"] == "backup"
+    assert executor.stats_snapshot().wins == [0, 1]
+    assert executor.stats_snapshot().hedged == 1
+    executor.close()
+
+def test_async_losers_are_cancelled():
+    primary, backup = ScriptedExecutor("primary", delay=1.0), ScriptedExecutor("backup", delay=0.0)
+    executor = HedgedExecutor([primary, backup], delay=0.05)
+
+    response = asyncio.run(executor.aexecute(conversation()))
+
+    assert response.content == "backup"
+    assert primary.cancelled == 1
+
+def test_failure_starts_next_backup_immediately():
+    primary = ScriptedExecutor("primary", [RuntimeError("down")])
+    backup = ScriptedExecutor("backup", delay=0.0)
+    executor = HedgedExecutor([primary, backup], delay=10)
+
+    start = time.perf_counter()
+    assert executor.execute(conversation()).content == "backup"
+    assert asyncio.run(executor.aexecute(conversation())).content == "backup"
+    assert time.perf_counter() - start < 1
+
+def test_invalid_answers_do_not_win():
+    primary = ScriptedExecutor("primary", ["I cannot help with that"])
+    backup = ScriptedExecutor("backup", delay=0.0)
+    executor = HedgedExecutor([primary, backup], delay=10, validator=lambda message: "cannot" not in message.content)
+
+    assert executor.execute(conversation()).content == "backup"
+
+def test_all_members_failing_raises_model_error():
+    members = [ScriptedExecutor(f"m{i}", [RuntimeError(f"down {i}")]) for i in range(2)]
+    executor = HedgedExecutor(members, delay=0.01)
+
+    with pytest.raises(ModelError, match="down"):
+        executor.execute(conversation())
+    with pytest.raises(ModelError):
+        asyncio.run(executor.aexecute(conversation()))
+    assert executor.stats_snapshot().failures == 2
+
+def test_delay_adapts_to_primary_percentile():
+    primary = ScriptedExecutor("primary", delay=0.0)
+    executor = HedgedExecutor([primary], initial_delay=3.0, min_samples=5)
+    assert executor.hedge_delay() == 3.0
+
+    for latency in [0.1, 0.2, 0.3, 0.4, 1.0]:
+        executor._record_primary(latency)
+    assert executor.hedge_delay() == 1.0
+    executor.percentile = 0.5
+    assert executor.hedge_delay() == 0.3
+
+def test_cancelled_primary_latency_is_recorded_as_lower_bound():
+    primary, backup = ScriptedExecutor("primary", delay=1.0), ScriptedExecutor("backup", delay=0.0)
+    executor = HedgedExecutor([primary, backup], delay=0.05)
+
+    asyncio.run(executor.aexecute(conversation()))
+
+    assert primary.cancelled == 1
+    assert len(executor._latencies) == 1
+    assert executor._latencies[0] >= 0.05
+
+def run_concurrently(executor, n):
+    threads = [threading.Thread(target=executor.execute, args=(conversation(),)) for _ in range(n)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+def test_sync_calls_run_up_to_max_concurrency():
+    inner = EchoExecutor(delay=0.2)
+    executor = HedgedExecutor([inner], delay=1.0, max_concurrency=12)
+
+    start = time.perf_counter()
+    run_concurrently(executor, 12)
+
+    assert inner.max_in_flight == 12
+    assert time.perf_counter() - start < 0.4
+    executor.close()
+
+def test_running_losers_are_bounded_by_the_pool():
+    primary, backup = EchoExecutor(delay=0.5), EchoExecutor(delay=0.0)
+    executor = HedgedExecutor([primary, backup], delay=0.01, max_concurrency=2)
+
+    run_concurrently(executor, 8)
+
+    # The losing primaries keep running, but never on more threads than the pool has
+    assert primary.max_in_flight <= 4
+    assert len(executor._pool._threads) <= 4
+    executor.close()
+    assert executor._pool is None
+
+def test_requires_members():
+    with pytest.raises(ValueError):
+        HedgedExecutor([])
+    with pytest.raises(ValueError):
+        HedgedExecutor([EchoExecutor()], max_concurrency=0)
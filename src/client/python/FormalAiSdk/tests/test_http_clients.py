@@ -0,0 +1,70 @@
+"""
+Tests for the shared OpenAI client registry.
+"""
+
+import asyncio
+import gc
+
+import pytest
+
+from ..core.http_clients import ClientRegistry, HttpPoolSettings
+
+@pytest.fixture
+def registry():
+    registry = ClientRegistry(HttpPoolSettings(max_connections=8, max_keepalive_connections=4, http2=False))
+    yield registry
+    registry.close()
+
+def test_same_endpoint_shares_client(registry):
+    first = registry.openai_client("sk-one", "https://api.example.com/v1")
+    second = registry.openai_client("sk-one", "https://api.example.com/v1")
+    assert first is second
+    assert len(registry) == 1
+
+def test_clients_are_keyed_by_endpoint_version_and_key(registry):
+    base = registry.openai_client("sk-one", "https://api.example.com/v1")
+    assert registry.openai_client("sk-two", "https://api.example.com/v1") is not base
+    assert registry.openai_client("sk-one", "https://other.example.com/v1") is not base
+    azure = registry.openai_client("sk-one", "https://x.openai.azure.com", "2025-01-01-preview", azure=True)
+    assert azure is not base
+    assert registry.openai_client("sk-one", "https://x.openai.azure.com", "2024-06-01", azure=True) is not azure
+    assert len(registry) == 5
+
+def test_async_clients_are_shared_per_loop(registry):
+    async def get_pair():
+        return (
+            registry.openai_client("sk-one", "https://api.example.com/v1", asynchronous=True),
+            registry.openai_client("sk-one", "https://api.example.com/v1", asynchronous=True),
+        )
+
+    first, second = asyncio.run(get_pair())
+    assert first is second
+    assert first is not registry.openai_client("sk-one", "https://api.example.com/v1")
+
+def test_close_forgets_clients(registry):
+    first = registry.openai_client("sk-one", "https://api.example.com/v1")
+    registry.close()
+    assert len(registry) == 0
+    assert registry.openai_client("sk-one", "https://api.example.com/v1") is not first
+
+def test_async_clients_of_a_finished_loop_are_released(registry):
+    async def get_clients():
+        registry.http_client("http://localhost:11434", asynchronous=True)
+        registry.openai_client("sk-one", "https://api.example.com/v1", asynchronous=True)
+
+    asyncio.run(get_clients())
+    gc.collect()
+    assert len(registry) == 0
+
+def test_aclose_closes_async_clients(registry):
+    async def use_and_close():
+        client = registry.http_client("http://localhost:11434", asynchronous=True)
+        openai_client = registry.openai_client("sk-one", "https://api.example.com/v1", asynchronous=True)
+        sync_client = registry.http_client("http://localhost:11434")
+        await registry.aclose()
+        assert client.is_closed
+        assert openai_client.is_closed()
+        assert sync_client.is_closed
+        assert len(registry) == 0
+
+    asyncio.run(use_and_close())
@@ -20,6 +20,7 @@ try:
 except ImportError:
     pass
 
+import asyncio
 import os
 import pytest
 
@@ -81,3 +82,120 @@ def test_empty_conversation():
         assert False, "Should have raised InvalidConversationError"
     except InvalidConversationError:
         assert True
+
+def test_aexecute_uses_acompletion(monkeypatch):
+    """Test that aexecute awaits litellm.acompletion with the converted messages."""
+    import litellm
+
+    captured = {}
+
+    async def fake_acompletion(**kwargs):
+        captured.update(kwargs)
+        return {"choices": [{"message": {"content": "async reply"}}]}
+
+    monkeypatch.setattr(litellm, "acompletion", fake_acompletion)
+    executor = LiteLLMExecutor(LlmModels.From({"provider": "openai", "model": "gpt-4.1", "api_key": None}))
+    conversation = Conversation().add_message(Role.CLIENT, "Hello")
+
+    response = asyncio.run(executor.aexecute(conversation))
+
+    assert response.content == "async reply"
+    assert response.role == Role.AGENT
+    assert captured["model"] == "gpt-4.1"
+    assert captured["messages"] == [{"role": "user", "content": "Hello"}]
+
+def test_stream_yields_deltas(monkeypatch):
+    """Test that stream requests stream=True and yields non-empty deltas."""
+    import litellm
+
+    captured = {}
+
+    def fake_completion(**kwargs):
+        captured.update(kwargs)
+        return iter([
+            {"choices": [{"delta": {"content": "Hel"}}]},
+            {"choices": [{"delta": {"content": None}}]},
+            {"choices": [{"delta": {"content": "lo"}}]},
+        ])
+
+    monkeypatch.setattr(litellm, "completion", fake_completion)
+    executor = LiteLLMExecutor(LlmModels.From({"provider": "openai", "model": "gpt-4.1", "api_key": None}))
+    conversation = Conversation().add_message(Role.CLIENT, "Hello")
+
+    assert list(executor.stream(conversation)) == ["Hel", "lo"]
+    assert captured["stream"] is True
+
+def test_identity_fingerprints_api_key():
+    """Test that request identity never contains the raw API key."""
+    executor = LiteLLMExecutor({
+        "provider": "azure",
+        "model": "azure/my-deployment",
+        "api_key": "azure-secret",
+        "api_base": "https://example.openai.azure.com",
+    })
+    identity = executor.identity()
+    assert identity["model"] == "azure/my-deployment"
+    assert identity["kwargs"]["api_base"] == "https://example.openai.azure.com"
+    assert "azure-secret" not in repr(identity)
+
+def test_api_key_is_passed_per_call(monkeypatch):
+    """Test that OpenAI keys travel with each call instead of litellm globals."""
+    import litellm
+
+    calls = []
+
+    def fake_completion(**kwargs):
+        calls.append(kwargs)
+        return {"choices": [{"message": {"content": "ok"}}]}
+
+    monkeypatch.setattr(litellm, "completion", fake_completion)
+    monkeypatch.setattr(litellm, "api_key", None)
+    first = LiteLLMExecutor({"provider": "openai", "model": "gpt-4.1", "api_key": "sk-first"})
+    second = LiteLLMExecutor({"provider": "openai", "model": "gpt-4.1", "api_key": "sk-second"})
+    conversation = Conversation().add_message(Role.CLIENT, "Hello")
+
+    first.execute(conversation)
+    second.execute(conversation)
+
+    assert litellm.api_key is None
+    assert [call["api_key"] for call in calls] == ["sk-first", "sk-second"]
+
+def test_executor_factory_memoizes_by_config():
+    """Test that LlmModels.Executor shares one executor per normalized config."""
+    LlmModels.ClearExecutors()
+    config = {"provider": "ollama", "model": "ollama/mistral"}
+
+    first = LlmModels.Executor(config)
+    assert LlmModels.Executor({"model": "ollama/mistral", "provider": "Ollama"}) is first
+    assert LlmModels.Executor({"provider": "ollama", "model": "ollama/phi3"}) is not first
+    assert LlmModels.Executor({"provider": "openai", "model": "gpt-4.1", "api_key": "sk-a"}) is not \
+        LlmModels.Executor({"provider": "openai", "model": "gpt-4.1", "api_key": "sk-b"})
+
+    LlmModels.ClearExecutors()
+    assert LlmModels.Executor(config) is not first
+
+def test_response_metadata_captures_usage(monkeypatch):
+    """Test that token usage, model id and latencies land in the message metadata."""
+    import litellm
+
+    def fake_completion(**kwargs):
+        return {
+            "model": "gpt-4.1-2025-04-14",
+            "choices": [{"message": {"content": "ok"}}],
+            "usage": {
+                "prompt_tokens": 12,
+                "completion_tokens": 3,
+                "total_tokens": 15,
+                "prompt_tokens_details": {"cached_tokens": 8},
+            },
+        }
+
+    monkeypatch.setattr(litellm, "completion", fake_completion)
+    executor = LiteLLMExecutor({"provider": "openai", "model": "gpt-4.1"})
+    response = executor.execute(Conversation().add_message(Role.CLIENT, "Hello"))
+
+    assert response.metadata["model"] == "gpt-4.1-2025-04-14"
+    assert response.metadata["prompt_tokens"] == 12
+    assert response.metadata["completion_tokens"] == 3
+    assert response.metadata["cached_tokens"] == 8
+    assert 0 <= response.metadata["network_latency"] <= response.metadata["total_latency"]
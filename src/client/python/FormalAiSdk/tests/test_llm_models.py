@@ -82,3 +82,23 @@ def test_from_litellm_env_fallback(monkeypatch):
     result = LlmModels.From()
     assert result["api_key"] == "fallback-key"
     assert result["deployment"] == "fallback-deployment"
+
+def test_from_ollama_ignores_hosted_api_base(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_BASE", "https://example.openai.azure.com")
+    monkeypatch.setenv("LITELLM_API_BASE", "https://env.azure.com")
+    monkeypatch.delenv("OLLAMA_API_BASE", raising=False)
+    assert LlmModels.From({"provider": "ollama", "model": "ollama/llama3.1"})["api_base"] is None
+
+    monkeypatch.setenv("OLLAMA_API_BASE", "http://gpu-box:11434")
+    assert LlmModels.From({"provider": "ollama", "model": "ollama/llama3.1"})["api_base"] == "http://gpu-box:11434"
+    explicit = {"provider": "ollama", "model": "ollama/llama3.1", "api_base": "http://other:11434"}
+    assert LlmModels.From(explicit)["api_base"] == "http://other:11434"
+
+def test_key_is_normalized_and_secret_free():
+    a = LlmModels.Key({"provider": "OpenAI", "model": "gpt-4.1", "api_key": "sk-secret", "api_base": None})
+    b = LlmModels.Key({"api_key": "sk-secret", "model": "gpt-4.1", "provider": "openai"})
+    c = LlmModels.Key({"provider": "openai", "model": "gpt-4.1", "api_key": "sk-other"})
+    assert a == b
+    assert a != c
+    assert "sk-secret" not in repr(a)
+    hash(a)
@@ -0,0 +1,169 @@
+"""
+Tests for the mock LLM server used for load testing.
+"""
+
+import asyncio
+import json
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+
+from ._util.mock_llm_server import MockLlmServer, MockServerConfig, fixed
+
+def post(url, payload):
+    request = urllib.request.Request(url, data=json.dumps(payload).encode(), headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(request) as response:
+        return response.read().decode()
+
+def chat(*contents):
+    return {"model": "mock-model", "messages": [{"role": "user", "content": c} for c in contents]}
+
+@pytest.fixture
+def server():
+    with MockLlmServer(MockServerConfig(seed=1)) as server:
+        yield server
+
+def test_openai_chat_completion(server):
+    data = json.loads(post(server.url + "/v1/chat/completions", chat("Hello")))
+    content = data["choices"][0]["message"]["content"]
+    assert content.endswith("turn 1: echo: Hello")
+    assert data["model"] == "mock-model"
+    assert data["usage"]["total_tokens"] == data["usage"]["prompt_tokens"] + data["usage"]["completion_tokens"]
+
+def test_azure_path_and_sse_stream(server):
+    body = post(server.url + "/openai/deployments/gpt/chat/completions", {**chat("Hi there"), "stream": True})
+    events = [line[len("data: "):] for line in body.splitlines() if line.startswith("data: ")]
+    assert events[-1] == "[DONE]"
+    deltas = [json.loads(event)["choices"][0]["delta"].get("content", "") for event in events[:-1]]
+    assert "".join(deltas).endswith("echo: Hi there")
+    assert server.stats.streamed == 1
+
+def test_ollama_chat_and_stream(server):
+    data = json.loads(post(server.url + "/api/chat", {**chat("Hello"), "stream": False}))
+    assert data["done"] is True
+    assert data["message"]["content"].endswith("echo: Hello")
+
+    lines = [json.loads(line) for line in post(server.url + "/api/chat", chat("Hello")).splitlines()]
+    assert lines[-1]["done"] is True
+    assert "".join(line["message"]["content"] for line in lines).endswith("turn 2: echo: Hello")
+
+def test_conversation_memory_is_scoped_by_id(server):
+    url = server.url + "/v1/chat/completions"
+    post(url, chat("[conversation:a] start", "remember: the sky is green"))
+    post(url, chat("[conversation:b] start", "remember: water is dry"))
+
+    recall = json.loads(post(url, chat("[conversation:a] start", "recall")))
+    assert recall["choices"][0]["message"]["content"] == "[conversation:a] turn 2: the sky is green"
+
+def test_idle_conversations_expire():
+    with MockLlmServer(MockServerConfig(memory_ttl=0.05)) as server:
+        url = server.url + "/v1/chat/completions"
+        post(url, chat("[conversation:a] start", "remember: the sky is green"))
+        time.sleep(0.1)
+        post(url, chat("[conversation:b] start"))
+        assert len(server.conversations) == 1
+        recall = json.loads(post(url, chat("[conversation:a] start", "recall")))
+        assert recall["choices"][0]["message"]["content"] == "[conversation:a] turn 1: nothing remembered"
+
+def test_unknown_model_is_404():
+    with MockLlmServer(MockServerConfig(models=["llama3.1"])) as server:
+        for path in ("/v1/chat/completions", "/api/chat"):
+            with pytest.raises(urllib.error.HTTPError) as error:
+                post(server.url + path, chat("Hello"))
+            assert error.value.code == 404
+            assert "not found" in error.value.read().decode()
+
+def test_rate_limit_returns_429(tmp_path):
+    with MockLlmServer(MockServerConfig(requests_per_second=2)) as server:
+        statuses = []
+        for _ in range(5):
+            try:
+                post(server.url + "/v1/chat/completions", chat("Hello"))
+                statuses.append(200)
+            except urllib.error.HTTPError as e:
+                statuses.append(e.code)
+                assert e.headers["Retry-After"] == "1"
+        assert statuses.count(200) == 2
+        assert server.stats.rate_limited == 3
+
+def test_error_injection():
+    with MockLlmServer(MockServerConfig(error_rate=1.0)) as server:
+        with pytest.raises(urllib.error.HTTPError) as error:
+            post(server.url + "/v1/chat/completions", chat("Hello"))
+        assert error.value.code == 429
+
+def test_handler_errors_return_500(server):
+    for messages in (["not a message"], [{"role": "user", "content": 5}]):
+        with pytest.raises(urllib.error.HTTPError) as error:
+            post(server.url + "/v1/chat/completions", {"model": "mock-model", "messages": messages})
+        assert error.value.code == 500
+        assert "mock server error" in error.value.read().decode()
+    assert json.loads(post(server.url + "/v1/chat/completions", chat("Hello")))["choices"]
+
+def test_unknown_route_is_404(server):
+    with pytest.raises(urllib.error.HTTPError) as error:
+        post(server.url + "/v1/embeddings", {"input": "x"})
+    assert error.value.code == 404
+
+async def _load(port, requests, connections):
+    """Send requests over keep-alive connections, returning the number of 200 responses."""
+    body = json.dumps(chat("Hello")).encode()
+    request = (
+        f"POST /v1/chat/completions HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n"
+    ).encode() + body
+
+    async def worker(count):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        ok = 0
+        for _ in range(count):
+            writer.write(request)
+            status = await reader.readline()
+            length = 0
+            while (line := await reader.readline()) != b"\r\n":
+                if line.lower().startswith(b"content-length"):
+                    length = int(line.split(b":")[1])
+            await reader.readexactly(length)
+            ok += b" 200 " in status
+        writer.close()
+        return ok
+
+    results = await asyncio.gather(*(worker(requests // connections) for _ in range(connections)))
+    return sum(results)
+
+def test_concurrency_limit_and_throughput():
+    config = MockServerConfig(latency=fixed(0.01), max_concurrency=50)
+    with MockLlmServer(config) as server:
+        start = time.perf_counter()
+        ok = asyncio.run(_load(server.port, 2000, 100))
+        elapsed = time.perf_counter() - start
+    assert ok == 2000
+    assert server.stats.max_in_flight == 50
+    # 2000 requests at 10ms each through 50 slots take at least 0.4s
+    assert elapsed >= 0.4
+    assert server.stats.connections == 100
+
+def test_openai_executor_against_mock(server, monkeypatch):
+    pytest.importorskip("openai")
+    from ..core.http_clients import ClientRegistry, HttpPoolSettings
+    from ..core.openai_executor import OpenAIExecutor
+    from ..core.types import Conversation, Role
+
+    monkeypatch.setenv("OPENAI_API_KEY", "mock")
+    monkeypatch.setenv("OPENAI_API_BASE", server.url + "/v1")
+    monkeypatch.setenv("OPENAI_MODEL", "mock-model")
+    registry = ClientRegistry(HttpPoolSettings(http2=False))
+    executor = OpenAIExecutor(registry=registry)
+    conversation = Conversation().add_message(Role.CLIENT, "Hello")
+
+    assert executor.execute(conversation).content.endswith("echo: Hello")
+    assert "".join(executor.stream(conversation)).endswith("turn 2: echo: Hello")
+
+    async def many():
+        return await asyncio.gather(*(executor.aexecute(conversation) for _ in range(50)))
+
+    assert len(asyncio.run(many())) == 50
+    assert "echo: Hello" in executor.complete("Hello")
+    registry.close()
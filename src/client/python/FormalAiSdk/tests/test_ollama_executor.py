@@ -0,0 +1,109 @@
+"""
+Tests for the native Ollama executor, run against the local mock server.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from ..core.http_clients import ClientRegistry, HttpPoolSettings
+from ..core.ollama_executor import OllamaExecutor
+from ..core.types import Conversation, Role
+from ..exceptions import InvalidConversationError, ModelError
+from ..models.llm_models import LlmModels
+from ._util.mock_llm_server import MockLlmServer, MockServerConfig, prompt_tokens
+
+@pytest.fixture
+def server():
+    with MockLlmServer(MockServerConfig(models=["llama3.1"])) as server:
+        yield server
+
+@pytest.fixture
+def registry():
+    registry = ClientRegistry(HttpPoolSettings(http2=False))
+    yield registry
+    registry.close()
+
+@pytest.fixture
+def executor(server, registry):
+    return OllamaExecutor({"model": "ollama/llama3.1", "api_base": server.url}, registry=registry)
+
+def conversation():
+    return (Conversation()
+            .add_message(Role.SYSTEM, "Be brief.")
+            .add_message(Role.CLIENT, "Hello"))
+
+def test_sends_real_roles_and_keep_alive(executor, server):
+    response = executor.execute(conversation())
+
+    assert response.content.endswith("turn 1: echo: Hello")
+    body = server.recent_requests[-1]
+    assert body["model"] == "llama3.1"
+    assert body["stream"] is False
+    assert body["keep_alive"] == "30m"
+    assert body["messages"] == [
+        {"role": "system", "content": "Be brief."},
+        {"role": "user", "content": "Hello"},
+    ]
+
+def test_metadata_reports_usage_and_prefix_reuse(executor, server):
+    first = conversation()
+    response = executor.execute(first)
+    assert response.metadata["prompt_tokens"] == prompt_tokens(server.recent_requests[-1]["messages"])
+    assert response.metadata["completion_tokens"] == len(response.content.split(" "))
+    assert response.metadata["load_latency"] > 0
+
+    follow_up = first.add_message(Role.AGENT, response.content).add_message(Role.CLIENT, "More")
+    response = executor.execute(follow_up)
+    # Only the new turns are evaluated and the model stays loaded
+    assert response.metadata["prompt_tokens"] == prompt_tokens(server.recent_requests[-1]["messages"][2:])
+    assert response.metadata["load_latency"] == 0
+    assert response.metadata["total_latency"] >= response.metadata["network_latency"] > 0
+
+def test_connections_are_reused(executor, server):
+    for _ in range(5):
+        executor.execute(conversation())
+    assert server.stats.connections == 1
+
+def test_stream_yields_deltas(executor, server):
+    deltas = list(executor.stream(conversation()))
+    assert len(deltas) > 1
+    assert "".join(deltas).endswith("echo: Hello")
+    assert server.recent_requests[-1]["stream"] is True
+
+def test_aexecute(executor):
+    response = asyncio.run(executor.aexecute(conversation()))
+    assert response.content.endswith("echo: Hello")
+
+def test_errors_raise_model_error(server, registry):
+    executor = OllamaExecutor({"model": "missing", "api_base": server.url}, registry=registry)
+    with pytest.raises(ModelError, match="not found"):
+        executor.execute(conversation())
+    with pytest.raises(ModelError, match="not found"):
+        list(executor.stream(conversation()))
+    with pytest.raises(InvalidConversationError):
+        executor.execute(Conversation())
+
+def test_malformed_body_raises_model_error():
+    class HtmlRegistry(ClientRegistry):
+        def http_client(self, base_url, asynchronous=False):
+            client_type = httpx.AsyncClient if asynchronous else httpx.Client
+            page = lambda request: httpx.Response(200, text="<html>Bad gateway</html>")
+            return client_type(transport=httpx.MockTransport(page), base_url=base_url)
+
+    executor = OllamaExecutor({"model": "ollama/llama3.1", "api_base": "http://proxy"}, registry=HtmlRegistry())
+    with pytest.raises(ModelError, match="Invalid response"):
+        executor.execute(conversation())
+    with pytest.raises(ModelError, match="Invalid response"):
+        asyncio.run(executor.aexecute(conversation()))
+    with pytest.raises(ModelError, match="Invalid response"):
+        list(executor.stream(conversation()))
+
+def test_factory_uses_native_executor_for_ollama(server):
+    LlmModels.ClearExecutors()
+    try:
+        executor = LlmModels.Executor({"provider": "ollama", "model": "ollama/llama3.1", "api_base": server.url})
+        assert isinstance(executor, OllamaExecutor)
+    finally:
+        LlmModels.ClearExecutors()
@@ -43,7 +43,7 @@ def test_openai_executor_basic():
 
     try:
         executor = OpenAIExecutor()
-        result = executor.execute("Say hello from the OpenAI executor test.")
+        result = executor.complete("Say hello from the OpenAI executor test.")
         assert result
         assert "hello" in result.lower(), f"Response does not contain 'hello': {result}"
         print("OpenAI API response:", result)
@@ -0,0 +1,67 @@
+"""
+Tests for the persistent list backing core conversations.
+"""
+
+import pytest
+from ..core.persistent import PersistentList
+
+def test_append_returns_new_list():
+    base = PersistentList(["a", "b"])
+    extended = base.append("c")
+    assert list(base) == ["a", "b"]
+    assert list(extended) == ["a", "b", "c"]
+    assert len(base) == 2
+    assert len(extended) == 3
+
+def test_derived_lists_share_prefix():
+    base = PersistentList(["a", "b"])
+    left = base.append("c")
+    right = base.append("d").append("e")
+    assert left.shares_prefix(right) == 2
+    assert right.shares_prefix(left) == 2
+    assert left.shares_prefix(left) == 3
+    assert left.shares_prefix(PersistentList(["a", "b", "c"])) == 0
+
+def test_indexing_and_slicing():
+    items = PersistentList(range(5))
+    assert items[0] == 0
+    assert items[-1] == 4
+    assert items[4] == 4
+    assert items[-2] == 3
+    assert items[1:3] == [1, 2]
+    with pytest.raises(IndexError):
+        items[5]
+    with pytest.raises(IndexError):
+        PersistentList()[-1]
+
+def test_reversed_and_equality():
+    items = PersistentList([1, 2, 3])
+    assert list(reversed(items)) == [3, 2, 1]
+    assert items == [1, 2, 3]
+    assert items == (1, 2, 3)
+    assert items == PersistentList([1, 2, 3])
+    assert items != [1, 2]
+    assert PersistentList() == []
+
+def test_extend_and_tail():
+    items = PersistentList([1]).extend([2, 3, 4])
+    assert items == [1, 2, 3, 4]
+    assert items.tail(2) == [3, 4]
+    assert items.tail(0) == []
+    assert items.tail(10) is items
+
+def test_long_chain_of_appends():
+    items = PersistentList()
+    for i in range(10000):
+        items = items.append(i)
+    assert len(items) == 10000
+    assert items[5000] == 5000
+    assert sum(items) == sum(range(10000))
+
+def test_copy_shares_nodes_but_not_cached_items():
+    items = PersistentList(["a", "b"])
+    assert list(items) == ["a", "b"]
+    copy = items.copy()
+    assert copy._items is None
+    assert copy.shares_prefix(items) == 2
+    assert copy == items
@@ -0,0 +1,182 @@
+"""
+Tests for the pooled executors.
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from ..core.pool import ExecutorPool, PoolLimits, TokenBucket
+from ..core.types import Conversation, Role
+from ._util.executors import EchoExecutor, StreamingExecutor
+
+CONFIG = {"provider": "ollama", "model": "ollama/mistral"}
+
+def conversation(text="Hello"):
+    return Conversation().add_message(Role.CLIENT, text)
+
+def test_token_bucket_reports_debt_as_delay():
+    """Test that reservations beyond capacity return the time to repay them."""
+    now = [0.0]
+    bucket = TokenBucket(60, clock=lambda: now[0])  # one token per second
+
+    assert bucket.reserve(60) == 0.0
+    assert bucket.reserve(1) == pytest.approx(1.0)
+    assert bucket.reserve(1) == pytest.approx(2.0)
+    now[0] = 2.0
+    assert bucket.reserve(0) == 0.0
+
+def test_limits_are_validated():
+    """Test that invalid limits are rejected."""
+    with pytest.raises(ValueError):
+        PoolLimits(max_concurrency=0)
+    with pytest.raises(ValueError):
+        PoolLimits(requests_per_minute=0)
+
+def test_concurrency_is_capped_across_executors():
+    """Test that executors for the same config share one concurrency limit."""
+    pool = ExecutorPool(PoolLimits(max_concurrency=2))
+    inner = EchoExecutor(delay=0.02)
+    executors = [pool.executor(dict(CONFIG), executor=inner) for _ in range(3)]
+
+    threads = [
+        threading.Thread(target=executors[i % 3].execute, args=(conversation(str(i)),))
+        for i in range(9)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    metrics = pool.metrics(CONFIG)
+    assert inner.max_in_flight == 2
+    assert metrics.completed == 9
+    assert metrics.in_flight == 0
+    assert metrics.queue_depth == 0
+    assert metrics.max_queue_depth >= 1
+    assert metrics.max_wait > 0
+
+def test_queue_is_fifo():
+    """Test that waiting callers are served in arrival order."""
+    pool = ExecutorPool(PoolLimits(max_concurrency=1))
+    inner = EchoExecutor(delay=0.01)
+    executor = pool.executor(CONFIG, executor=inner)
+
+    threads = []
+    for i in range(6):
+        thread = threading.Thread(target=executor.execute, args=(conversation(str(i)),))
+        thread.start()
+        threads.append(thread)
+        time.sleep(0.002)  # make arrival order deterministic
+    for thread in threads:
+        thread.join()
+
+    assert inner.calls == [str(i) for i in range(6)]
+
+def test_requests_per_minute_limit_delays_calls():
+    """Test that the request bucket spaces out calls beyond its capacity."""
+    pool = ExecutorPool()
+    pool.configure(CONFIG, PoolLimits(max_concurrency=4, requests_per_minute=1200))  # 20 per second
+    executor = pool.executor(CONFIG, executor=EchoExecutor())
+
+    start = time.monotonic()
+    for i in range(1202):
+        executor.execute(conversation())
+    elapsed = time.monotonic() - start
+
+    assert elapsed >= 0.09
+    assert pool.metrics(CONFIG).total_wait > 0
+
+def test_configure_after_use_is_rejected():
+    """Test that limits cannot change once a lane is in use."""
+    pool = ExecutorPool()
+    pool.executor(CONFIG, executor=EchoExecutor())
+    with pytest.raises(ValueError):
+        pool.configure(CONFIG, PoolLimits(max_concurrency=1))
+
+def test_lanes_are_per_model():
+    """Test that different model configs get independent lanes."""
+    pool = ExecutorPool(PoolLimits(max_concurrency=1))
+    other = {"provider": "ollama", "model": "ollama/phi3"}
+    pool.executor(CONFIG, executor=EchoExecutor()).execute(conversation())
+
+    metrics = pool.metrics()
+    assert len(metrics) == 1
+    assert pool.metrics(other).completed == 0
+
+def test_async_calls_share_the_limit():
+    """Test that aexecute waits for lane slots without blocking the loop."""
+    pool = ExecutorPool(PoolLimits(max_concurrency=3))
+    inner = EchoExecutor(delay=0.01)
+    executor = pool.executor(CONFIG, executor=inner)
+
+    async def run_all():
+        await asyncio.gather(*(executor.aexecute(conversation(str(i))) for i in range(20)))
+
+    asyncio.run(run_all())
+
+    assert inner.max_in_flight == 3
+    assert pool.metrics(CONFIG).completed == 20
+
+def test_cancelled_async_waiter_frees_its_place():
+    """Test that cancelling a queued aexecute does not leak a slot."""
+    pool = ExecutorPool(PoolLimits(max_concurrency=1))
+    inner = EchoExecutor(delay=0.02)
+    executor = pool.executor(CONFIG, executor=inner)
+
+    async def run():
+        first = asyncio.ensure_future(executor.aexecute(conversation("first")))
+        queued = asyncio.ensure_future(executor.aexecute(conversation("queued")))
+        await asyncio.sleep(0.005)
+        queued.cancel()
+        await first
+        await executor.aexecute(conversation("after"))
+        with pytest.raises(asyncio.CancelledError):
+            await queued
+
+    asyncio.run(run())
+
+    metrics = pool.metrics(CONFIG)
+    assert inner.calls == ["first", "after"]
+    assert metrics.in_flight == 0
+    assert metrics.queue_depth == 0
+
+def test_pooled_response_reports_queue_latency():
+    """Test that time spent waiting in the lane is added to the response metadata."""
+    pool = ExecutorPool(PoolLimits(max_concurrency=1))
+    executor = pool.executor(CONFIG, executor=EchoExecutor(delay=0.02))
+
+    responses = [None, None]
+
+    def run(i):
+        responses[i] = executor.execute(conversation(str(i)))
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    waits = sorted(response.metadata["queue_latency"] for response in responses)
+    assert waits[1] > 0.01
+    assert all(r.metadata["total_latency"] >= r.metadata["queue_latency"] for r in responses)
+
+def test_stream_holds_slot_until_exhausted():
+    """Test that a pooled stream keeps its slot while deltas are being consumed."""
+    pool = ExecutorPool(PoolLimits(max_concurrency=1))
+    executor = pool.executor(dict(CONFIG), executor=StreamingExecutor(["a", "b"]))
+
+    stream = executor.stream(conversation())
+    assert next(stream) == "a"
+    assert pool.metrics(CONFIG).in_flight == 1
+    assert list(stream) == ["b"]
+    assert pool.metrics(CONFIG).in_flight == 0
+
+    abandoned = executor.stream(conversation())
+    next(abandoned)
+    abandoned.close()
+    metrics = pool.metrics(CONFIG)
+    assert metrics.in_flight == 0
+    assert metrics.completed == 2
@@ -0,0 +1,115 @@
+"""
+Tests for recording and replaying executor responses.
+"""
+
+import asyncio
+import json
+import os
+import time
+
+import pytest
+
+from ..core.replay_executor import ReplayExecutor
+from ..core.types import Conversation, Role
+from ..exceptions import CassetteMissError
+from ._util.executors import CountingExecutor
+
+def live_executor(delay=0.0):
+    """Live stand-in answering with a call counter."""
+    return CountingExecutor(prefix="answer", metadata={"prompt_tokens": 3}, chunks=["part one", ", part two"], delay=delay)
+
+def conversation(text="Hello"):
+    return Conversation().add_message(Role.CLIENT, text)
+
+@pytest.fixture
+def cassette(tmp_path):
+    return str(tmp_path / "cassettes" / "session.json")
+
+def test_record_then_replay_offline(cassette):
+    live = live_executor()
+    recorder = ReplayExecutor(cassette, live, mode="record")
+    assert recorder.execute(conversation()).content == "answer 1"
+
+    player = ReplayExecutor(cassette, mode="replay")
+    response = player.execute(conversation())
+    assert response.content == "answer 1"
+    assert response.metadata == {"prompt_tokens": 3, "replayed": True}
+    assert asyncio.run(player.aexecute(conversation())).content == "answer 1"
+    assert live.calls == 1
+
+def test_repeated_requests_replay_in_order(cassette):
+    recorder = ReplayExecutor(cassette, live_executor(), mode="record")
+    recorder.execute(conversation())
+    recorder.execute(conversation())
+
+    player = ReplayExecutor(cassette, mode="replay")
+    assert [player.execute(conversation()).content for _ in range(3)] == ["answer 1", "answer 2", "answer 1"]
+
+def test_replay_miss_raises(cassette):
+    ReplayExecutor(cassette, live_executor(), mode="record").execute(conversation())
+    player = ReplayExecutor(cassette, mode="replay")
+    with pytest.raises(CassetteMissError):
+        player.execute(conversation("Something else"))
+
+def test_auto_mode_records_only_misses(cassette):
+    live = live_executor()
+    executor = ReplayExecutor(cassette, live)
+    executor.execute(conversation())
+    executor.execute(conversation("Other"))
+    executor = ReplayExecutor(cassette, live)
+    assert executor.execute(conversation()).metadata["replayed"] is True
+    assert live.calls == 2
+    assert len(executor) == 2
+
+def test_stream_records_chunks(cassette):
+    recorder = ReplayExecutor(cassette, live_executor(), mode="record")
+    assert list(recorder.stream(conversation())) == ["part one", ", part two"]
+
+    player = ReplayExecutor(cassette, mode="replay")
+    assert list(player.stream(conversation())) == ["part one", ", part two"]
+    assert player.execute(conversation()).content == "part one, part two"
+
+def test_simulated_latency_is_sampled_from_recording(cassette):
+    ReplayExecutor(cassette, live_executor(delay=0.05), mode="record").execute(conversation())
+
+    player = ReplayExecutor(cassette, mode="replay", simulate_latency=True, seed=7)
+    start = time.perf_counter()
+    player.execute(conversation())
+    assert time.perf_counter() - start >= 0.045
+
+    fast = ReplayExecutor(cassette, mode="replay", simulate_latency=True, latency_scale=0.0)
+    start = time.perf_counter()
+    fast.execute(conversation())
+    assert time.perf_counter() - start < 0.04
+
+def test_cassette_is_plain_json(cassette):
+    ReplayExecutor(cassette, live_executor(), mode="record").execute(conversation())
+    with open(cassette) as f:
+        data = json.load(f)
+    (entries,) = data["interactions"].values()
+    assert entries[0]["request"] == [["CLIENT", "Hello"]]
+    assert entries[0]["response"]["content"] == "answer 1"
+
+def test_recording_appends_to_journal_until_close(cassette):
+    recorder = ReplayExecutor(cassette, live_executor(), mode="record")
+    recorder.execute(conversation())
+    recorder.execute(conversation("Other"))
+    assert not os.path.exists(cassette)
+    with open(f"{cassette}.journal") as f:
+        assert len(f.readlines()) == 2
+
+    # A journal that was never folded in, e.g. after a crash, is still replayed
+    replayed = ReplayExecutor(cassette, mode="replay")
+    assert len(replayed) == 2
+    assert replayed.latencies() == recorder.latencies()
+
+    recorder.close()
+    assert not os.path.exists(f"{cassette}.journal")
+    with open(cassette) as f:
+        assert sum(len(entries) for entries in json.load(f)["interactions"].values()) == 2
+
+def test_invalid_modes():
+    with pytest.raises(ValueError):
+        ReplayExecutor("x.json", mode="rewind")
+    with pytest.raises(ValueError):
+        ReplayExecutor("x.json", mode="record")
@@ -0,0 +1,28 @@
+"""
+Tests for the token counting helpers.
+"""
+
+from ..core import tokens
+
+class OfflineTiktoken:
+    """tiktoken stand-in whose encodings cannot be downloaded."""
+    @staticmethod
+    def encoding_for_model(model):
+        raise KeyError(model)
+
+    @staticmethod
+    def get_encoding(name):
+        raise ConnectionError("cannot download encoding")
+
+def test_tokenizer_falls_back_to_estimate_when_encoding_fails_to_load(monkeypatch):
+    monkeypatch.setattr(tokens, "tiktoken", OfflineTiktoken)
+    tokens.get_tokenizer.cache_clear()
+    try:
+        assert tokens.get_tokenizer("gpt-4.1")("x" * 40) == 10
+        assert tokens.get_tokenizer(None)("x" * 40) == 10
+    finally:
+        tokens.get_tokenizer.cache_clear()
+
+def test_estimate_tokens_counts_message_overhead(estimated_tokens):
+    assert tokens.count_message_tokens("x" * 40) == 10 + tokens.MESSAGE_OVERHEAD
+    assert tokens.estimate_message_tokens("x" * 40) == 10 + tokens.MESSAGE_OVERHEAD